@@ -36,6 +36,20 @@ logger = logging.getLogger(__name__)
 _ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
 
 
+# Typewriter mode redraws once per this many streamed characters.
+_TYPEWRITER_RENDER_CHARS = 10
+
+
+def _typewriter_redraw_due(prev_count: int, char_count: int) -> bool:
+    """
+    True when a streamed chunk carried the running character count past a
+    multiple of _TYPEWRITER_RENDER_CHARS. ChatEngine.stream() coalesces
+    pieces into multi-character chunks, so the count rarely lands exactly
+    on a multiple.
+    """
+    return char_count // _TYPEWRITER_RENDER_CHARS != prev_count // _TYPEWRITER_RENDER_CHARS
+
+
 def _visible_len(text: str) -> int:
     """Length of a string without ANSI escape sequences."""
     return len(_ANSI_RE.sub("", text))
@@ -1014,12 +1028,13 @@ Output the raw {file_type_desc} content now:"""
                         char_count = 0
                         async for ch in engine.stream(live_edit_prompt):
                             chunks.append(ch)
+                            prev_count = char_count
                             char_count += len(ch) if ch else 0
                             # Stream character-by-character to editor in real-time
                             if right_panel.editor_panel and hasattr(right_panel.editor_panel, 'write_stream'):
                                 right_panel.editor_panel.write_stream(ch)
                             # Render UI frequently for smooth streaming effect (every few chars)
-                            if char_count % 10 == 0:  # Render every 10 chars for performance
+                            if _typewriter_redraw_due(prev_count, char_count):
                                 _render_ui(renderer, conversation, engine)
                         
                         # Finish streaming
@@ -1144,9 +1159,10 @@ Output the raw {file_type_desc} content now:"""
                     char_count = 0
                     async for ch in engine.stream(user_input):
                         chunks.append(ch)
+                        prev_count = char_count
                         char_count += len(ch) if ch else 0
                         # Render UI frequently for smooth streaming effect (every few chars)
-                        if char_count % 10 == 0:  # Render every 10 chars for performance
+                        if _typewriter_redraw_due(prev_count, char_count):
                             _render_ui(renderer, conversation, engine)
                     # Final render to show complete result
                     _render_ui(renderer, conversation, engine)
@@ -1307,6 +1323,7 @@ Output the raw {file_type_desc} content now:"""
     # Cleanup
     if fs_watcher:
         fs_watcher.stop()
+    await engine.aclose()
     print(f"\n{ELECTRIC_CYAN}Neural link terminated.{RESET}\n")
 
 
@@ -1402,6 +1419,9 @@ def run_interactive_chat(args):
             github_config=github_config,
             providers=providers_cfg,
             active_provider=cfg.get("active_provider"),
+            summary_cache_path=cfg.get("summary_cache_path"),
+            parallel_tool_calls=cfg.get("parallel_tool_calls", False),
+            evict_pruned_messages=cfg.get("evict_pruned_messages", False),
         )
     except Exception as e:
         print(f"{RED}❌ Fatal Error: Could not initialize ChatEngine: {e}{RESET}")
@@ -1736,6 +1756,8 @@ async def cmd_demo(args) -> int:
         
         print()
     
+    await engine.aclose()
+    
     # Final summary
     print(f"{BRIGHT_MAGENTA}{'=' * 70}{RESET}")
     print(f"{ELECTRIC_CYAN}✅ Demo completed successfully!{RESET}\n")
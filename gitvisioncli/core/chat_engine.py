@@ -11,11 +11,20 @@ Responsibilities:
 """
 
 import asyncio
+import bisect
+import hashlib
+import importlib
 import json
 import logging
+import os
 import re
 import shutil
-from typing import AsyncGenerator, Dict, Any, List, Optional, Tuple, Union
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from typing import AsyncGenerator, Callable, Dict, Any, List, Optional, Tuple, Union
 from pathlib import Path
 
 import requests
@@ -23,7 +32,7 @@ import requests
 from gitvisioncli.core.executor import AIActionExecutor, normalize_action_type
 from gitvisioncli.core.supervisor import ActionContext, GitHubClientConfig, ActionStatus, ActionResult
 from gitvisioncli.core.ai_client import AIClient
-from gitvisioncli.core.context_manager import ContextManager
+from gitvisioncli.core.context_manager import ContextManager, Message
 from gitvisioncli.core.planner import ActionPlanner, PlanStepType
 from gitvisioncli.core.natural_language_mapper import (
     NaturalLanguageEditMapper,
@@ -37,6 +46,218 @@ from gitvisioncli.core.natural_language_action_engine import ActiveFileContext
 
 logger = logging.getLogger(__name__)
 
+# Optional faster JSON codec for tool arguments/results. orjson's
+# JSONDecodeError subclasses json.JSONDecodeError, so existing handlers
+# keep working with either backend.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps_bytes(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # e.g. non-str dict keys, which the stdlib coerces
+            return json.dumps(obj).encode("utf-8")
+
+    def _json_dumps(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            return json.dumps(obj)
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+    def _json_dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+# Piece endings that flush the stream() output buffer immediately:
+# line breaks and sentence punctuation keep live typing responsive.
+_STREAM_FLUSH_ENDINGS = ("\n", ".", "!", "?", ":", ";")
+
+
+@lru_cache(maxsize=256)
+def _resolve_active_path(base_dir: str, path: str) -> str:
+    """
+    Absolute, normalized form of the active file path.
+
+    Pure string work (no pathlib objects, no lstat per component): the
+    same active file is resolved on every turn, and base_dir is already
+    resolved by the executor.
+    """
+    if os.path.isabs(path):
+        return path
+    return os.path.normpath(os.path.join(base_dir, path))
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+def _prune_notice(keep_turns: int) -> str:
+    return f"✓ Auto-prune applied to prevent context overflow (kept last {keep_turns} turns)."
+
+
+# Auto-prune keeps between 2 and 12 turns (see _auto_prune_if_needed), so
+# every notice it can emit is built once here.
+_PRUNE_NOTICES = {k: _prune_notice(k) for k in range(2, 13)}
+
+# Upper-cased role labels for plain-text prompts (see _messages_to_prompt).
+_ROLE_UPPER = {
+    "user": "USER",
+    "assistant": "ASSISTANT",
+    "system": "SYSTEM",
+    "tool": "TOOL",
+}
+
+
+def _role_label(role: str) -> str:
+    return _ROLE_UPPER.get(role) or role.upper()
+
+
+def _prompt_line(role: str, content: str) -> str:
+    """Render one (role, content) pair as a "ROLE: content" line."""
+    return f"{_role_label(role)}: {content}"
+
+
+def _part_text(part: Any) -> Optional[str]:
+    """Text of an SDK content part/block, given as an object or a dict."""
+    text = getattr(part, "text", None)
+    if not text and isinstance(part, dict):
+        text = part.get("text")
+    return text
+
+
+def _extract_gemini_text(resp: Any) -> str:
+    """
+    Joined text of the first Gemini candidate that has any, walking
+    candidates -> content -> parts. Returns "" when nothing is found.
+    """
+    for cand in getattr(resp, "candidates", None) or ():
+        content = getattr(cand, "content", None)
+        # content may be a list of parts or an object with .parts
+        parts = content if isinstance(content, list) else getattr(content, "parts", None)
+        if not parts:
+            continue
+        chunks = [text for text in map(_part_text, parts) if text]
+        if chunks:
+            return "".join(chunks)
+    return ""
+
+
+# Natural-language extraction patterns, compiled once at import.
+_CD_PATTERNS = tuple(
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        # go to demo folder
+        r"go\s+to\s+(?:the\s+)?(?P<name>[^\s/]+)\s+folder",
+        r"go\s+to\s+(?:the\s+)?(?P<name>[^\s/]+)\s+directory",
+        # go inside the demo folder / go into demo directory
+        r"go\s+(?:inside|into)\s+(?:the\s+)?(?P<name>[^\s/]+)\s+folder",
+        r"go\s+(?:inside|into)\s+(?:the\s+)?(?P<name>[^\s/]+)\s+directory",
+        # enter demo folder
+        r"enter\s+(?:the\s+)?(?P<name>[^\s/]+)\s+folder",
+        r"enter\s+(?:the\s+)?(?P<name>[^\s/]+)\s+directory",
+    )
+)
+
+_CD_CONTEXTUAL_PATTERNS = tuple(
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        # "create demo folder and go to it"
+        r"(?:make|create)\s+(?P<name>[^\s/]+)\s+(?:folder|directory)\s+and\s+go\s+to\s+(?:the\s+)?(?:folder|directory|it)",
+        r"(?:make|create)\s+(?P<name>[^\s/]+)\s+(?:folder|directory)\s+and\s+go\s+(?:to\s+)?(?:it|there)",
+        # "create folder demo and go to it" (reversed word order)
+        r"create\s+(?:folder|directory)\s+(?P<name>[^\s/]+)\s+and\s+go\s+to\s+(?:the\s+)?(?:it|there|folder|directory)",
+        # "create demo and go to it"
+        r"create\s+(?P<name>[^\s/]+)\s+and\s+(?:cd|go)\s+(?:to\s+)?(?:it|there)",
+    )
+)
+
+_FOLDER_PATTERNS = tuple(
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        # "called/named X" patterns
+        r"call(?:ed)?\s+it\s+(?P<name>[^\s]+)",
+        r"called\s+(?P<name>[^\s]+)",
+        r"named\s+(?P<name>[^\s]+)",
+
+        # "create X folder" (name before folder)
+        r"(?:create|make)\s+(?P<name>[^\s/]+)\s+(?:folder|directory)",
+
+        # "create folder X" (folder before name)
+        r"(?:create|make)\s+(?:folder|directory)(?:\s+here|\s+in\s+this\s+dir|\s+in\s+this\s+directory)?\s+(?P<name>[^\s/]+)",
+
+        # "create a folder X" / "make a directory X"
+        r"(?:create|make)\s+a\s+(?:folder|directory)\s+(?P<name>[^\s/]+)",
+
+        # "new folder X" / "new directory X"
+        r"new\s+(?:folder|directory)\s+(?P<name>[^\s/]+)",
+    )
+)
+
+def _priority_union(prefix: str, patterns: Tuple["re.Pattern[str]", ...]) -> "re.Pattern[str]":
+    """
+    Fuse `patterns` into one regex whose match reports the first pattern,
+    in list order, that occurs anywhere in the text (the same result as
+    searching each pattern in turn). Pattern i's `name` group becomes
+    `{prefix}{i}`, so `m.lastgroup` identifies the winning branch.
+    """
+    branches = [
+        ".*?(?:%s)" % p.pattern.replace("(?P<name>", f"(?P<{prefix}{i}>")
+        for i, p in enumerate(patterns)
+    ]
+    return re.compile("(?:" + "|".join(branches) + ")", re.IGNORECASE | re.DOTALL)
+
+
+def _priority_matches(union: "re.Pattern[str]", patterns, text: str):
+    """
+    Yield (pattern index, captured name) for each pattern matching `text`,
+    in pattern order. The first hit costs a single scan with `union`;
+    later patterns are only searched if the caller rejects earlier hits.
+    """
+    m = union.match(text)
+    if not m:
+        return
+    group = m.lastgroup
+    idx = int(group.rsplit("_", 1)[1])
+    yield idx, m.group(group)
+    for i in range(idx + 1, len(patterns)):
+        m = patterns[i].search(text)
+        if m:
+            yield i, m.group("name")
+
+
+# Literal keywords every pattern of an extractor requires (lower-cased
+# substrings). Messages without any of them skip the regex pass.
+_CD_TRIGGERS = ("go", "enter", "make", "create")
+_FOLDER_TRIGGERS = ("call", "named", "make", "create", "new")
+
+_CD_ALL_PATTERNS = _CD_PATTERNS + _CD_CONTEXTUAL_PATTERNS
+_CD_RE = _priority_union("cd_", _CD_ALL_PATTERNS)
+_FOLDER_RE = _priority_union("folder_", _FOLDER_PATTERNS)
+
+
+_FILE_EXTS = (
+    "py|js|ts|tsx|jsx|json|yaml|yml|toml|md|txt|ini|cfg|sh|bash|ps1|rb|go|rs|"
+    "java|cs|cpp|c|h|hpp|css|scss|html|htm|xml|sql|r|m|swift|kt|php|pl|lua|vim"
+)
+
+# `\b` stops "config.json" from matching as "config.js".
+_FILE_NAME = rf"[A-Za-z0-9_\-./]+\.(?:{_FILE_EXTS})\b"
+
+# In priority order: a file after an operation verb, then after "file" /
+# "path", then any bare name with a (case-sensitive) known extension.
+_FILE_PATTERNS = (
+    re.compile(
+        rf"(?:open|edit|create|delete|remove|update|modify)\s+(?:file\s+)?(?P<name>{_FILE_NAME})",
+        re.IGNORECASE,
+    ),
+    re.compile(rf"(?:file|path)\s+(?P<name>{_FILE_NAME})", re.IGNORECASE),
+    re.compile(rf"(?P<name>(?-i:{_FILE_NAME}))"),
+)
+_FILE_RE = _priority_union("file_", _FILE_PATTERNS)
+
 
 class ProviderNotConfiguredError(RuntimeError):
     """
@@ -83,6 +304,27 @@ class ChatEngine:
         },
     }
 
+    # Offered alongside execute_action once auto-prune has evicted messages
+    # (see evict_pruned_messages).
+    FETCH_EVICTED_PAGE_TOOL = {
+        "type": "function",
+        "function": {
+            "name": "fetch_evicted_page",
+            "description": (
+                "Read back an earlier conversation message that was moved out "
+                "of context by auto-prune, using the page id from the "
+                "evicted-pages note."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "page_id": {"type": "string"},
+                },
+                "required": ["page_id"],
+            },
+        },
+    }
+
     # Approximate context window limits (prompt + completion) per model.
     # Used for coarse, provider-neutral auto-pruning to avoid hitting
     # provider-specific "context_length_exceeded" errors.
@@ -99,6 +341,58 @@ class ChatEngine:
         "ollama:*": 32768,
     }
 
+    # Upper bound for a coalesced stream() chunk (see stream()).
+    STREAM_FLUSH_CHARS = 4096
+
+    # Maximum number of summaries kept in the summary cache (LRU).
+    SUMMARY_CACHE_SIZE = 64
+
+    # Lower-cased action types that touch exactly one `path` and nothing
+    # else, so calls on unrelated paths may run concurrently.
+    _PARALLEL_SAFE_ACTION_TYPES = frozenset({
+        "createfile", "editfile", "readfile", "deletefile",
+        "createfolder", "deletefolder",
+        "appendtext", "prependtext", "replacetext",
+        "insertbeforeline", "insertafterline", "deletelinerange",
+        "rewriteentirefile", "applypatch",
+        "replacebypattern", "deletebypattern", "replacebyfuzzymatch",
+        "insertattop", "insertatbottom", "insertblockatline",
+        "replaceblock", "removeblock",
+        "updatejsonkey", "updateyamlkey",
+        "insertintofunction", "insertintoclass", "adddecorator", "addimport",
+    })
+
+    # Lower-cased action types that _upgrade_incomplete_edit may rewrite.
+    _EDIT_ACTION_TYPES = frozenset({"editfile", "createfile", "rewriteentirefile"})
+
+    # Auto-prune tiers: usage above _PRUNE_TIER_RATIOS[i] keeps the last
+    # _PRUNE_TIER_KEEP[i] user turns (ratios ascending, strict comparison).
+    _PRUNE_TIER_RATIOS = (0.85, 0.90, 0.95)
+    _PRUNE_TIER_KEEP = (6, 4, 2)
+
+    # Evicted-page store bounds: pages kept in memory, and pages listed in
+    # the note that replaces them in context.
+    EVICTED_PAGE_LIMIT = 256
+    EVICTED_NOTE_ENTRIES = 20
+    _EVICTED_NOTE_NAME = "evicted_pages"
+
+    # Provider -> (SDK module, pip package), imported on first use.
+    _PROVIDER_SDKS = {
+        "gemini": ("google.generativeai", "google-generativeai"),
+        "claude": ("anthropic", "anthropic"),
+    }
+
+    # Completion method per (lower-cased) provider; resolved with getattr so
+    # per-instance overrides are honoured. Plain-text methods take the
+    # flattened prompt, structured ones the OpenAI-style message list.
+    _COMPLETION_METHODS = {
+        "gemini": "_complete_gemini",
+        "ollama": "_complete_ollama",
+    }
+    _STRUCTURED_COMPLETION_METHODS = {
+        "claude": "_complete_claude",
+    }
+
     def __init__(
         self,
         base_dir: Union[str, Path],
@@ -110,11 +404,19 @@ class ChatEngine:
         github_config: Optional[GitHubClientConfig] = None,
         providers: Optional[Dict[str, Any]] = None,
         active_provider: Optional[str] = None,
+        summary_cache_path: Optional[Union[str, Path]] = None,
+        parallel_tool_calls: bool = False,
+        evict_pruned_messages: bool = False,
     ):
         # Base settings
         self.base_dir = Path(base_dir).resolve()
         self.temperature = temperature
         self.max_tokens = max_tokens
+        # Run independent tool calls from one model turn concurrently.
+        self.parallel_tool_calls = parallel_tool_calls
+        # Keep auto-pruned messages in an in-memory page store, reachable
+        # through the fetch_evicted_page tool, instead of dropping them.
+        self.evict_pruned_messages = evict_pruned_messages
         self._github_config = github_config
 
         # Provider-specific configuration (multi-backend routing)
@@ -132,6 +434,23 @@ class ChatEngine:
         self._ollama_config: Dict[str, Any] = (
             self._providers_config.get("ollama") or {}
         )
+        # Reused /api/generate request skeleton (see _complete_ollama).
+        self._ollama_payload: Dict[str, Any] = {
+            "model": None,
+            "prompt": None,
+            "stream": False,
+            "options": {"temperature": 0.0, "num_predict": 0},
+        }
+        # Keep-alive aiohttp session for non-streaming Ollama calls, bound
+        # to the event loop that created it (see _get_http_session).
+        self._http_session: Any = None
+        self._http_session_loop: Optional[asyncio.AbstractEventLoop] = None
+        # (executor, base_dir_version, str(base_dir)); see _base_dir_str.
+        self._base_dir_str_cache: Optional[Tuple[Any, int, str]] = None
+        # Imported provider SDK modules (see _provider_sdk).
+        self._sdk_modules: Dict[str, Any] = {}
+        # SDK clients/models reused across calls (see _provider_client).
+        self._provider_clients: Dict[Tuple[str, str], Tuple[Optional[str], Any]] = {}
 
         # Decide initial provider + normalized model
         if active_provider:
@@ -177,8 +496,10 @@ class ChatEngine:
             dry_run=dry_run,
             github_config=github_config,
         )
-        # Per engine (provider+model) contexts so engine switching keeps history isolated
-        self.context = ContextManager()
+        # Per engine (provider+model) contexts so engine switching keeps history isolated.
+        # The active one lives in a single-item slot, so a switch is one
+        # store and readers never observe a half-applied swap.
+        self._ctx_slot: List[ContextManager] = [ContextManager()]
         self._engine_key: str = self._make_engine_key(self.provider, self.model)
         self._contexts: Dict[str, ContextManager] = {self._engine_key: self.context}
         self._previous_engine_key: Optional[str] = None
@@ -212,7 +533,7 @@ class ChatEngine:
 
         # Track the most recent filesystem-modifying action so the CLI
         # can automatically open the affected file in the right panel.
-        self._last_modified_path: Optional[str] = None
+        self._last_modified_path: Optional[Path] = None
         self._last_opened_file: Optional[str] = None
 
         # Auto-prune bookkeeping
@@ -222,6 +543,29 @@ class ChatEngine:
         self._auto_summary_notice: Optional[str] = None
         self._summary_in_progress: bool = False
 
+        # Exact-match cache of earlier summaries keyed by a hash of the
+        # summarized transcript. Persisted as JSON when a path is given
+        # (e.g. ~/.gitvision/summary_cache.json); in-memory otherwise.
+        self._summary_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._summary_cache_path: Optional[Path] = (
+            Path(summary_cache_path).expanduser() if summary_cache_path else None
+        )
+        self._summary_cache_loaded: bool = False
+        # Latest snapshot still to be written, and whether a writer is
+        # draining it; guarded by the lock (see _save_summary_cache).
+        self._summary_cache_pending: Optional[Dict[str, str]] = None
+        self._summary_cache_writing: bool = False
+        self._summary_cache_lock = threading.Lock()
+        # (committed (role, content) pairs, their rendered prompt lines),
+        # extended in place across turns by _messages_to_prompt.
+        self._prefix_cache: Optional[Tuple[List[Tuple[str, str]], List[str]]] = None
+
+        # Background summarization started ahead of the 75% threshold.
+        self._summary_prefetch_task: Optional["asyncio.Task[Any]"] = None
+
+        # page id -> message evicted by auto-prune, oldest first.
+        self._evicted_pages: "OrderedDict[str, Message]" = OrderedDict()
+
         # System prompt
         self.set_system_prompt(self._default_prompt())
 
@@ -853,8 +1197,7 @@ simple natural language commands may already be handled by the direct engine."""
         - Keep engine/provider/model configuration intact
         """
         old_ctx = self.context
-        new_ctx = ContextManager()
-        new_ctx.system_prompt = old_ctx.system_prompt
+        new_ctx = ContextManager.clone_metadata(old_ctx, ("system_prompt",))
         self.context = new_ctx
         # Ensure per-engine map stays in sync
         self._contexts[self._engine_key] = new_ctx
@@ -871,9 +1214,37 @@ simple natural language commands may already be handled by the direct engine."""
 
     async def stream(
         self, user_input: str, include_context: bool = True
+    ) -> AsyncGenerator[str, None]:
+        """
+        Stream one chat turn.
+
+        Tiny pieces (status lines, single-token deltas) are coalesced into
+        larger chunks that flush at a line/sentence boundary or once
+        STREAM_FLUSH_CHARS is reached, so consumers see fewer event-loop
+        hops per turn. The concatenated output is unchanged.
+        """
+        buf: List[str] = []
+        size = 0
+        async for piece in self._stream_turn(user_input, include_context):
+            if not piece:
+                continue
+            buf.append(piece)
+            size += len(piece)
+            if size >= self.STREAM_FLUSH_CHARS or piece.endswith(_STREAM_FLUSH_ENDINGS):
+                yield "".join(buf)
+                buf.clear()
+                size = 0
+        if buf:
+            yield "".join(buf)
+
+    async def _stream_turn(
+        self, user_input: str, include_context: bool = True
     ) -> AsyncGenerator[str, None]:
         # Normalize provider-specific quirks in the raw user text.
-        user_input = self._provider_normalizer.normalize_fences(user_input)
+        # Only fenced text can need it; plain chat skips the regex pass.
+        user_input = user_input or ""
+        if "`" in user_input:
+            user_input = self._provider_normalizer.normalize_fences(user_input)
         self.context.add_message("user", user_input)
 
         # Opportunistic, provider-neutral auto-prune to keep the
@@ -889,16 +1260,15 @@ simple natural language commands may already be handled by the direct engine."""
         active_file_ctx = None
         if self.context.active_file_path:
             try:
-                base = self.get_base_dir()
-                path = Path(self.context.active_file_path)
-                if not path.is_absolute():
-                    path = (base / path).resolve()
+                path = _resolve_active_path(
+                    self._base_dir_str(), self.context.active_file_path
+                )
                 # Use content from context if available, otherwise read from disk
                 content = self.context.active_file_content
-                if content is None and path.exists():
-                    content = path.read_text(encoding="utf-8", errors="ignore")
+                if content is None and os.path.exists(path):
+                    content = Path(path).read_text(encoding="utf-8", errors="ignore")
                 active_file_ctx = ActiveFileContext(
-                    path=str(path),
+                    path=path,
                     content=content
                 )
             except Exception as e:
@@ -1075,13 +1445,13 @@ simple natural language commands may already be handled by the direct engine."""
         if self.provider == "openai" and self.ai is not None:
             stream = self.ai.stream_with_tools(
                 messages=messages,
-                tools=[self.EXECUTE_ACTION_TOOL],
+                tools=self._tool_schemas(),
                 tool_choice="auto",
                 temperature=self.temperature,
                 max_tokens=self.max_tokens,
             )
 
-            assistant_text = ""
+            text_parts: List[str] = []
             raw_calls = []
 
             # Receive stream
@@ -1092,7 +1462,7 @@ simple natural language commands may already be handled by the direct engine."""
 
                 # Normal text
                 if delta and getattr(delta, "content", None):
-                    assistant_text += delta.content
+                    text_parts.append(delta.content)
                     yield delta.content
 
                 # Tool-call streaming
@@ -1114,6 +1484,8 @@ simple natural language commands may already be handled by the direct engine."""
                             if tdelta.function.arguments:
                                 tc["function"]["arguments"] += tdelta.function.arguments
 
+            assistant_text = "".join(text_parts)
+
             # Parsed tool calls, normalized to a stable schema
             tool_calls = []
             for tc in raw_calls:
@@ -1145,13 +1517,15 @@ simple natural language commands may already be handled by the direct engine."""
             yield "\n\n[Executing actions...]\n\n"
 
             # Execute each tool call
-            for tc in tool_calls:
+            async for tc, outcome in self._iter_tool_results(tool_calls):
                 try:
-                    result_dict = await self._exec_tool(tc)
+                    if isinstance(outcome, BaseException):
+                        raise outcome
+                    result_dict = outcome
 
                     self.context.add_tool_result(
                         tool_call_id=tc["id"],
-                        content=json.dumps(result_dict),
+                        content=_json_dumps(result_dict),
                     )
 
                     # Yield action result messages to chat, but don't stream them to editor
@@ -1165,7 +1539,7 @@ simple natural language commands may already be handled by the direct engine."""
                     logger.error(f"Tool execution failed: {e}")
                     self.context.add_tool_result(
                         tool_call_id=tc["id"],
-                        content=json.dumps(
+                        content=_json_dumps(
                             {"status": "failure", "error": str(e)}
                         ),
                     )
@@ -1236,6 +1610,8 @@ simple natural language commands may already be handled by the direct engine."""
         # surface any OpenAI text back to the user. This ensures that
         # local engines (e.g., Ollama) can still drive filesystem/git
         # actions via the shared execute_action tool.
+        context_before = self.context
+        version_before = context_before.version
         if self.ai is not None:
             async for chunk in self._run_openai_tools_for_messages(messages):
                 yield chunk
@@ -1247,14 +1623,19 @@ simple natural language commands may already be handled by the direct engine."""
 
         # Rebuild messages from the updated context and get the final
         # assistant text from the active provider using NATIVE STREAMING.
-        messages_for_provider = (
-            self.context.get_openai_messages()
-            if include_context
-            else [
-                {"role": "system", "content": self.context.system_prompt},
-                {"role": "user", "content": user_input},
-            ]
-        )
+        # Chat-only turns (no tool calls, no prune) leave the context
+        # untouched, so the list built above is still accurate.
+        if self.context is context_before and self.context.version == version_before:
+            messages_for_provider = messages
+        else:
+            messages_for_provider = (
+                self.context.get_openai_messages()
+                if include_context
+                else [
+                    {"role": "system", "content": self.context.system_prompt},
+                    {"role": "user", "content": user_input},
+                ]
+            )
 
         # Check if we should stream to editor panel
         editor_panel = self._editor_panel_ref
@@ -1263,7 +1644,7 @@ simple natural language commands may already be handled by the direct engine."""
         finish_stream_called = False
         
         # Use native streaming for all providers
-        provider = (self.provider or "openai").lower()
+        provider = self._provider_lc
         assistant_text = ""
         
         try:
@@ -1467,6 +1848,115 @@ simple natural language commands may already be handled by the direct engine."""
     # --------------------------------------------------------------------------------------
 
     async def _exec_tool(self, tc: Dict[str, Any]) -> Dict[str, Any]:
+        return self._exec_tool_sync(tc)
+
+    async def _iter_tool_results(
+        self, tool_calls: List[Dict[str, Any]]
+    ) -> AsyncGenerator[Tuple[Dict[str, Any], Union[Dict[str, Any], BaseException]], None]:
+        """
+        Execute tool calls and yield (tool_call, result_dict_or_exception)
+        in call order.
+
+        With parallel_tool_calls enabled and no path overlap between the
+        calls (see _tool_calls_independent), the actions run concurrently
+        in worker threads. Their UI/doc side effects and last-modified
+        tracking are still applied here on the loop thread, in call order.
+        Otherwise the calls run one after another, each result yielded as
+        soon as it is available.
+        """
+        if (
+            self.parallel_tool_calls
+            and len(tool_calls) > 1
+            and self._tool_calls_independent(tool_calls)
+        ):
+            prepared = [self._prepare_tool_call(tc) for tc in tool_calls]
+            outcomes = await asyncio.gather(
+                *(self._dispatch_prepared(p) for p in prepared),
+                return_exceptions=True,
+            )
+            for tc, prep, outcome in zip(tool_calls, prepared, outcomes):
+                if isinstance(outcome, tuple):
+                    outcome = self._finish_tool_call(prep[0], *outcome)
+                yield tc, outcome
+            return
+
+        for tc in tool_calls:
+            try:
+                outcome: Union[Dict[str, Any], BaseException] = await self._exec_tool(tc)
+            except Exception as e:
+                outcome = e
+            yield tc, outcome
+
+    async def _dispatch_prepared(
+        self, prepared: Union[Dict[str, Any], Tuple[Dict[str, Any], ActionContext]]
+    ) -> Any:
+        """Run a prepared action on a worker thread; failure dicts pass through."""
+        if isinstance(prepared, dict):
+            return prepared
+        return await asyncio.to_thread(self.executor.dispatch_action, *prepared)
+
+    def _tool_calls_independent(self, tool_calls: List[Dict[str, Any]]) -> bool:
+        """
+        True when every call is a single-path file action on its own
+        explicit path and none of the paths nests inside another, so
+        execution order cannot matter. Paths are resolved against the
+        executor's base_dir first, so "a.py", "./a.py" and its absolute
+        form count as the same file. Anything else (cd, moves, git,
+        shell, batch operations) keeps the calls sequential.
+        """
+        base = self._base_dir_str()
+        seen: List[str] = []
+        for tc in tool_calls:
+            if tc["function"]["name"] != "execute_action":
+                return False
+            try:
+                action = _json_loads(tc["function"]["arguments"]).get("action") or {}
+            except (ValueError, AttributeError):
+                return False
+            atype = str(action.get("type") or "").lower()
+            path = (action.get("params") or {}).get("path")
+            if atype not in self._PARALLEL_SAFE_ACTION_TYPES:
+                return False
+            if not isinstance(path, str) or not path.strip():
+                return False
+            norm = _resolve_active_path(base, path.strip()).replace(os.sep, "/")
+            for other in seen:
+                if norm == other or norm.startswith(other + "/") or other.startswith(norm + "/"):
+                    return False
+            seen.append(norm)
+        return True
+
+    def _tool_schemas(self) -> List[Dict[str, Any]]:
+        """Tools offered to the model; paging only once something was evicted."""
+        if self._evicted_pages:
+            return [self.EXECUTE_ACTION_TOOL, self.FETCH_EVICTED_PAGE_TOOL]
+        return [self.EXECUTE_ACTION_TOOL]
+
+    def _exec_tool_sync(self, tc: Dict[str, Any]) -> Dict[str, Any]:
+        prepared = self._prepare_tool_call(tc)
+        if isinstance(prepared, dict):
+            return prepared
+        action, ctx = prepared
+        try:
+            result = self.executor.run_action(action, ctx)
+        except Exception as e:
+            return {
+                "status": "failure",
+                "message": "Execution failed",
+                "error": str(e),
+            }
+        return self._finish_tool_call(action, result)
+
+    def _prepare_tool_call(
+        self, tc: Dict[str, Any]
+    ) -> Union[Dict[str, Any], Tuple[Dict[str, Any], ActionContext]]:
+        """
+        Parse and normalize a tool call into (action, context). Returns the
+        final result dict instead for page fetches, unknown tools and
+        malformed arguments.
+        """
+        if tc["function"]["name"] == "fetch_evicted_page":
+            return self._fetch_evicted_page(tc["function"]["arguments"])
         if tc["function"]["name"] != "execute_action":
             return {"status": "failure", "message": "Unknown tool", "error": "Unknown tool"}
 
@@ -1475,16 +1965,11 @@ simple natural language commands may already be handled by the direct engine."""
             if not args.strip():
                 return {"status": "failure", "message": "Tool failed", "error": "Empty arguments"}
 
-            args = json.loads(args)
+            args = _json_loads(args)
             raw_action = args.get("action", {})
             action = self._normalize_tool_action(raw_action)
 
-            ctx = ActionContext(metadata={"tool_call_id": tc["id"]})
-
-            result = self.executor.run_action(action, ctx)
-            # Track any filesystem modifications for live editor sync
-            self._track_last_modified(action, result)
-            return result.to_dict()
+            return action, ActionContext(metadata={"tool_call_id": tc["id"]})
 
         except json.JSONDecodeError as e:
             return {
@@ -1500,6 +1985,26 @@ simple natural language commands may already be handled by the direct engine."""
                 "error": str(e),
             }
 
+    def _finish_tool_call(
+        self,
+        action: Dict[str, Any],
+        result: ActionResult,
+        apply_side_effects: Optional[Callable[[], None]] = None,
+    ) -> Dict[str, Any]:
+        """Apply deferred side effects, track the modified file, and build the result dict."""
+        try:
+            if apply_side_effects is not None:
+                apply_side_effects()
+            # Track any filesystem modifications for live editor sync
+            self._track_last_modified(action, result)
+            return result.to_dict()
+        except Exception as e:
+            return {
+                "status": "failure",
+                "message": "Execution failed",
+                "error": str(e),
+            }
+
     # --------------------------------------------------------------------------------------
     # INTERNAL HELPERS
     # --------------------------------------------------------------------------------------
@@ -1739,14 +2244,14 @@ simple natural language commands may already be handled by the direct engine."""
         if not last_user_msg:
             return None
 
+        # Only upgrade edit actions with missing content
         action_type = (action.get("type") or "").lower()
+        if action_type not in self._EDIT_ACTION_TYPES:
+            return None
+
         params = action.get("params") or {}
         path = params.get("path")
 
-        # Only upgrade edit actions with missing content
-        if action_type not in {"editfile", "createfile", "rewriteentirefile"}:
-            return None
-
         # Build FileContext for the mapper
         file_ctx = None
         if path and active_file:
@@ -1771,15 +2276,17 @@ simple natural language commands may already be handled by the direct engine."""
 
             # Use the first intent as the upgraded action
             intent = result.intents[0]
+
+            # Ensure the path is preserved. The intent is freshly built by
+            # the mapper, so its params are only copied when a key is added.
+            intent_params = intent.params
+            if path and "path" not in intent_params:
+                intent_params = {**intent_params, "path": path}
             upgraded = {
                 "type": intent.type,
-                "params": dict(intent.params),
+                "params": intent_params,
             }
 
-            # Ensure the path is preserved
-            if path and "path" not in upgraded["params"]:
-                upgraded["params"]["path"] = path
-
             logger.info(
                 f"Upgraded incomplete {action_type} to {intent.type} via NL mapper"
             )
@@ -1887,7 +2394,7 @@ Please provide edit instructions."""
                 temperature=0.3,  # Lower temperature for precise edits
             )
             
-            accumulated_text = ""
+            chunks: List[str] = []
             
             async for chunk in stream:
                 if not chunk.choices:
@@ -1897,23 +2404,26 @@ Please provide edit instructions."""
                 
                 # Accumulate text content
                 if delta and getattr(delta, "content", None):
-                    accumulated_text += delta.content
+                    chunks.append(delta.content)
+            
+            accumulated_text = "".join(chunks)
             
             # Parse accumulated text for edit instructions
             if accumulated_text:
                 yield f"📝 AI response: {accumulated_text[:100]}..."
                 
-                # Try to extract and apply edits from the text
-                file_content = editor_panel.get_text()
+                # Try to extract and apply edits from the text. The mapper
+                # reads the editor's line buffer directly (no full-text join).
                 live_intents = self._nl_mapper.map_to_live_edits(
                     accumulated_text,
-                    file_content,
+                    editor_panel.content,
                     attached_block=None
                 )
                 
                 if live_intents:
-                    for intent in live_intents:
-                        result_msg = self._apply_live_edit_intent(intent, editor_panel)
+                    # One buffer update and one change notification for
+                    # the whole set of edits.
+                    for result_msg in editor_panel.apply_batch(live_intents):
                         yield result_msg
                 else:
                     yield "⚠️  Could not parse edit instructions from AI response"
@@ -1940,44 +2450,6 @@ Please provide edit instructions."""
             logger.error(f"Generic live edit failed: {e}")
             yield f"❌ Error: {e}"
 
-    def _apply_live_edit_intent(self, intent: "LiveEditIntent", editor_panel) -> str:
-        """
-        Apply a single live edit intent to the editor panel.
-        
-        Returns a status message describing what was done.
-        """
-        try:
-            if intent.type == "delete_range":
-                editor_panel.delete_range(intent.start_line, intent.end_line)
-                return f"✓ Deleted lines {intent.start_line}-{intent.end_line}"
-            
-            elif intent.type == "replace_range":
-                editor_panel.replace_range(intent.start_line, intent.end_line, intent.new_text)
-                line_count = len(intent.new_text.split("\n"))
-                return f"✓ Replaced lines {intent.start_line}-{intent.end_line} with {line_count} new lines"
-            
-            elif intent.type == "insert_after":
-                lines = intent.new_text.split("\n")
-                editor_panel.insert_after(intent.start_line, lines)
-                return f"✓ Inserted {len(lines)} lines after line {intent.start_line}"
-            
-            elif intent.type == "append":
-                lines = intent.new_text.split("\n")
-                for line in lines:
-                    editor_panel.content.append(line)
-                editor_panel._notify_change()
-                editor_panel._set_modified(True)
-                return f"✓ Appended {len(lines)} lines to end of file"
-            
-            else:
-                return f"✗ Unknown intent type: {intent.type}"
-        
-        except Exception as e:
-            logger.error(f"Failed to apply live edit intent: {e}")
-            return f"✗ Edit failed: {e}"
-
-
-
     def _run_local_instruction_pass(self, assistant_text: str) -> List[str]:
         """
         Local instruction-execution layer for providers that do not have
@@ -1993,7 +2465,13 @@ Please provide edit instructions."""
         execute malformed JSON.
         """
         logs: List[str] = []
-        text = self._provider_normalizer.normalize_fences(assistant_text or "")
+        # Plain prose (the common case) cannot hold an action payload;
+        # skip fence normalization and block extraction entirely.
+        raw = assistant_text or ""
+        if "{" not in raw and "[" not in raw:
+            return logs
+
+        text = self._provider_normalizer.normalize_fences(raw)
 
         if not text.strip():
             return logs
@@ -2004,7 +2482,7 @@ Please provide edit instructions."""
         # Fallback: single top-level JSON object or array without fences.
         if not blocks:
             try:
-                obj = json.loads(text.strip())
+                obj = _json_loads(text.strip())
             except json.JSONDecodeError:
                 return logs
 
@@ -2017,58 +2495,66 @@ Please provide edit instructions."""
 
         actions: List[Dict[str, Any]] = []
         for obj in blocks:
+            # Read each discriminating key once; the shapes below only
+            # branch on these cached values.
+            a = obj.get("action")
+            t = obj.get("type")
+            p = obj.get("params")
+
             # Canonical shape: {"action": {...}} or {"actions": [...]}
-            if "action" in obj and isinstance(obj["action"], dict):
-                actions.append(obj["action"])
+            if isinstance(a, dict):
+                actions.append(a)
                 continue
-            if "actions" in obj and isinstance(obj["actions"], list):
-                actions.extend([a for a in obj["actions"] if isinstance(a, dict)])
+            many = obj.get("actions")
+            if isinstance(many, list):
+                actions.extend([item for item in many if isinstance(item, dict)])
                 continue
 
-            # Gemini-style variant:
-            # {"action": "execute_action", "tool_code": "CreateFolder", "parameters": {...}}
-            if obj.get("action") == "execute_action":
-                type_name = obj.get("tool_code") or obj.get("type")
-                params = obj.get("parameters") or obj.get("params") or {}
-                if isinstance(type_name, str) and isinstance(params, dict):
-                    actions.append({"type": type_name, "params": params})
-                continue
+            if isinstance(a, str):
+                # Gemini-style variant:
+                # {"action": "execute_action", "tool_code": "CreateFolder", "parameters": {...}}
+                if a == "execute_action":
+                    type_name = obj.get("tool_code") or t
+                    params = obj.get("parameters") or p or {}
+                    if isinstance(type_name, str) and isinstance(params, dict):
+                        actions.append({"type": type_name, "params": params})
+                    continue
 
-            # Simple variant:
-            # {"action": "CreateFolder", "path": "demo", ...}
-            if isinstance(obj.get("action"), str):
-                type_name = obj.get("action")
+                # Simple variant:
+                # {"action": "CreateFolder", "path": "demo", ...}
                 params = {k: v for k, v in obj.items() if k != "action"}
-                if isinstance(type_name, str) and isinstance(params, dict):
-                    actions.append({"type": type_name, "params": params})
-                continue
-
-            # Direct tool-style object:
-            # {"type": "CreateFolder", "params": {...}}
-            if isinstance(obj.get("type"), str) and isinstance(obj.get("params"), dict):
-                actions.append({"type": obj["type"], "params": obj["params"]})
+                actions.append({"type": a, "params": params})
                 continue
 
-            # Minimal direct object:
-            # {"type": "CreateFolder", "path": "demo", ...}
-            if isinstance(obj.get("type"), str) and "params" not in obj:
-                type_name = obj.get("type")
-                params = {k: v for k, v in obj.items() if k != "type"}
-                actions.append({"type": type_name, "params": params})
+            if isinstance(t, str):
+                # Direct tool-style object:
+                # {"type": "CreateFolder", "params": {...}}
+                if isinstance(p, dict):
+                    actions.append({"type": t, "params": p})
+                # Minimal direct object:
+                # {"type": "CreateFolder", "path": "demo", ...}
+                elif "params" not in obj:
+                    params = {k: v for k, v in obj.items() if k != "type"}
+                    actions.append({"type": t, "params": params})
 
         if not actions:
             return logs
 
         logs.append("[Executing actions (local)]\n")
 
-        for act in actions:
-            # Reuse the same normalization layer as OpenAI tools so
-            # provider-specific quirks (missing 'path', etc.) are
-            # handled consistently for local JSON execution.
-            normalized = self._normalize_tool_action(act)
-            ctx = ActionContext()
-            result = self.executor.run_action(normalized, ctx)
-            self._track_last_modified(normalized, result)
+        # Reuse the same normalization layer as OpenAI tools so
+        # provider-specific quirks (missing 'path', etc.) are
+        # handled consistently for local JSON execution.
+        normalized_actions = [self._normalize_tool_action(act) for act in actions]
+        # One batched executor call: edits that hit the same file share a
+        # single watcher refresh / doc sync instead of one per action.
+        results = self.executor.run_action_batch(normalized_actions, ActionContext())
+
+        modified_files: List[str] = []
+        for normalized, result in zip(normalized_actions, results):
+            self._track_last_modified(normalized, result, refresh=False)
+            if result.modified_files:
+                modified_files.extend(result.modified_files)
             if result.status == ActionStatus.SUCCESS:
                 logs.append(f"✓ {result.message}\n")
             else:
@@ -2078,6 +2564,9 @@ Please provide edit instructions."""
                 else:
                     logs.append(f"✗ {result.message}\n")
 
+        if modified_files:
+            self.refresh_workspace(modified_files)
+
         return logs
 
     async def _run_openai_tools_for_messages(
@@ -2094,7 +2583,7 @@ Please provide edit instructions."""
             openai_model = "gpt-4o-mini" if self.provider != "openai" else self.model
             resp = await self.ai.complete_with_tools(
                 messages=messages,
-                tools=[self.EXECUTE_ACTION_TOOL],
+                tools=self._tool_schemas(),
                 tool_choice="auto",
                 model=openai_model,  # Explicitly use OpenAI model for tool detection
                 temperature=self.temperature,
@@ -2135,13 +2624,15 @@ Please provide edit instructions."""
 
         yield "\n\n[Executing actions...]\n\n"
 
-        for tc in tool_calls:
+        async for tc, outcome in self._iter_tool_results(tool_calls):
             try:
-                result_dict = await self._exec_tool(tc)
+                if isinstance(outcome, BaseException):
+                    raise outcome
+                result_dict = outcome
 
                 self.context.add_tool_result(
                     tool_call_id=tc["id"],
-                    content=json.dumps(result_dict),
+                    content=_json_dumps(result_dict),
                 )
 
                 if result_dict.get("status") == "success":
@@ -2153,7 +2644,7 @@ Please provide edit instructions."""
                 logger.error(f"Tool execution failed (OpenAI bridge): {e}")
                 self.context.add_tool_result(
                     tool_call_id=tc["id"],
-                    content=json.dumps(
+                    content=_json_dumps(
                         {"status": "failure", "error": str(e)}
                     ),
                 )
@@ -2168,27 +2659,35 @@ Please provide edit instructions."""
         - Ollama uses a shared safe default.
         - Unknown models fall back to a conservative 32k window.
         """
-        provider = (self.provider or "openai").lower()
+        return self._resolve_max_context_tokens(self._provider_lc, self.model or "")
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _resolve_max_context_tokens(provider: str, model_name: str) -> int:
+        """
+        Memoized window lookup keyed on (provider, model); MODEL_LIMITS is
+        static for the session and auto-prune asks on every turn.
+        """
+        limits = ChatEngine.MODEL_LIMITS
         if provider == "ollama":
-            return int(self.MODEL_LIMITS.get("ollama:*", 32768))
+            return int(limits.get("ollama:*", 32768))
 
-        model_name = self.model or ""
         # Direct lookup first
-        if model_name in self.MODEL_LIMITS:
-            return int(self.MODEL_LIMITS[model_name])
+        if model_name in limits:
+            return int(limits[model_name])
 
         # Allow simple normalization for OpenAI/Claude/Gemini aliases
         lower = model_name.lower()
-        if lower.startswith("gpt-4.1") and "gpt-4.1" in self.MODEL_LIMITS:
-            return int(self.MODEL_LIMITS["gpt-4.1"])
-        if lower.startswith("gpt-4o-mini") and "gpt-4o-mini" in self.MODEL_LIMITS:
-            return int(self.MODEL_LIMITS["gpt-4o-mini"])
+        if lower.startswith("gpt-4.1") and "gpt-4.1" in limits:
+            return int(limits["gpt-4.1"])
+        if lower.startswith("gpt-4o-mini") and "gpt-4o-mini" in limits:
+            return int(limits["gpt-4o-mini"])
 
-        if lower.startswith("claude-3.5-sonnet") and "claude-3.5-sonnet" in self.MODEL_LIMITS:
-            return int(self.MODEL_LIMITS["claude-3.5-sonnet"])
+        if lower.startswith("claude-3.5-sonnet") and "claude-3.5-sonnet" in limits:
+            return int(limits["claude-3.5-sonnet"])
 
-        if lower.startswith("gemini-1.5-pro") and "gemini-1.5-pro" in self.MODEL_LIMITS:
-            return int(self.MODEL_LIMITS["gemini-1.5-pro"])
+        if lower.startswith("gemini-1.5-pro") and "gemini-1.5-pro" in limits:
+            return int(limits["gemini-1.5-pro"])
 
         return 32768
 
@@ -2202,49 +2701,22 @@ Please provide edit instructions."""
         """
         if not text:
             return None
+        lower = text.lower()
+        if not any(t in lower for t in _CD_TRIGGERS):
+            return None
 
-        patterns = [
-            # go to demo folder
-            r"go\s+to\s+(?:the\s+)?(?P<name>[^\s/]+)\s+folder",
-            r"go\s+to\s+(?:the\s+)?(?P<name>[^\s/]+)\s+directory",
-            # go inside the demo folder / go into demo directory
-            r"go\s+(?:inside|into)\s+(?:the\s+)?(?P<name>[^\s/]+)\s+folder",
-            r"go\s+(?:inside|into)\s+(?:the\s+)?(?P<name>[^\s/]+)\s+directory",
-            # enter demo folder
-            r"enter\s+(?:the\s+)?(?P<name>[^\s/]+)\s+folder",
-            r"enter\s+(?:the\s+)?(?P<name>[^\s/]+)\s+directory",
-        ]
-
-        for pat in patterns:
-            m = re.search(pat, text, flags=re.IGNORECASE)
-            if not m:
-                continue
-            name = m.group("name") or ""
-            name = name.strip().strip("\"'")
+        # Direct phrasings ("go to demo folder") take priority; after them,
+        # contextual references like "make demo folder and go to it" where
+        # the folder name is mentioned earlier in the same message.
+        n_direct = len(_CD_PATTERNS)
+        for idx, raw in _priority_matches(_CD_RE, _CD_ALL_PATTERNS, text):
+            name = (raw or "").strip().strip("\"'")
             name = name.rstrip(".,;:")
-            if name:
-                return name
-
-        # Handle contextual references like "make demo folder and go to it"
-        # where the folder name is mentioned earlier in the same message
-        contextual_patterns = [
-            # "create demo folder and go to it"
-            r"(?:make|create)\s+(?P<name>[^\s/]+)\s+(?:folder|directory)\s+and\s+go\s+to\s+(?:the\s+)?(?:folder|directory|it)",
-            r"(?:make|create)\s+(?P<name>[^\s/]+)\s+(?:folder|directory)\s+and\s+go\s+(?:to\s+)?(?:it|there)",
-            # "create folder demo and go to it" (reversed word order)
-            r"create\s+(?:folder|directory)\s+(?P<name>[^\s/]+)\s+and\s+go\s+to\s+(?:the\s+)?(?:it|there|folder|directory)",
-            # "create demo and go to it"
-            r"create\s+(?P<name>[^\s/]+)\s+and\s+(?:cd|go)\s+(?:to\s+)?(?:it|there)",
-        ]
-
-        for pat in contextual_patterns:
-            m = re.search(pat, text, flags=re.IGNORECASE)
-            if m:
-                name = m.group("name") or ""
-                name = name.strip().strip("\"'")
-                name = name.rstrip(".,;:")
-                if name and name.lower() not in {"the", "a", "an", "this", "that", "folder", "directory"}:
-                    return name
+            if not name:
+                continue
+            if idx >= n_direct and name.lower() in {"the", "a", "an", "this", "that", "folder", "directory"}:
+                continue
+            return name
 
         return None
 
@@ -2262,32 +2734,12 @@ Please provide edit instructions."""
         """
         if not text:
             return None
+        lower = text.lower()
+        if not any(t in lower for t in _FOLDER_TRIGGERS):
+            return None
 
-        patterns = [
-            # "called/named X" patterns
-            r"call(?:ed)?\s+it\s+(?P<name>[^\s]+)",
-            r"called\s+(?P<name>[^\s]+)",
-            r"named\s+(?P<name>[^\s]+)",
-            
-            # "create X folder" (name before folder)
-            r"(?:create|make)\s+(?P<name>[^\s/]+)\s+(?:folder|directory)",
-            
-            # "create folder X" (folder before name)
-            r"(?:create|make)\s+(?:folder|directory)(?:\s+here|\s+in\s+this\s+dir|\s+in\s+this\s+directory)?\s+(?P<name>[^\s/]+)",
-            
-            # "create a folder X" / "make a directory X"
-            r"(?:create|make)\s+a\s+(?:folder|directory)\s+(?P<name>[^\s/]+)",
-            
-            # "new folder X" / "new directory X"
-            r"new\s+(?:folder|directory)\s+(?P<name>[^\s/]+)",
-        ]
-
-        for pat in patterns:
-            m = re.search(pat, text, flags=re.IGNORECASE)
-            if not m:
-                continue
-            name = m.group("name") or ""
-            name = name.strip().strip("\"'")
+        for _, raw in _priority_matches(_FOLDER_RE, _FOLDER_PATTERNS, text):
+            name = (raw or "").strip().strip("\"'")
             name = name.rstrip(".,;:")
             if name and name.lower() not in {"the", "a", "an", "this", "that", "here", "there"}:
                 return name
@@ -2305,36 +2757,16 @@ Please provide edit instructions."""
           - "delete test.txt"
           - "/Users/me/project/app.py"
         """
-        if not text:
+        # Every candidate needs a "name.ext" dot.
+        if not text or "." not in text:
             return None
 
-        # First try explicit file operation patterns
-        file_operation_patterns = [
-            r"(?:open|edit|create|delete|remove|update|modify)\s+(?:file\s+)?(?P<file>[A-Za-z0-9_\-./]+\.(?:py|js|ts|tsx|jsx|json|yaml|yml|toml|md|txt|ini|cfg|sh|bash|ps1|rb|go|rs|java|cs|cpp|c|h|hpp|css|scss|html|htm|xml|sql|r|m|swift|kt|php|pl|lua|vim))",
-            r"(?:file|path)\s+(?P<file>[A-Za-z0-9_\-./]+\.(?:py|js|ts|tsx|jsx|json|yaml|yml|toml|md|txt|ini|cfg|sh|bash|ps1|rb|go|rs|java|cs|cpp|c|h|hpp|css|scss|html|htm|xml|sql|r|m|swift|kt|php|pl|lua|vim))",
-        ]
-        
-        for pat in file_operation_patterns:
-            m = re.search(pat, text, flags=re.IGNORECASE)
-            if m:
-                candidate = m.group("file") or ""
-                candidate = candidate.strip().strip("\"'")
-                candidate = candidate.rstrip(".,;:")
-                if candidate:
-                    return candidate
-
-        # Fallback: Basic heuristic for common source / config file extensions
-        pattern = re.compile(
-            r"(?P<file>[A-Za-z0-9_\-./]+\."
-            r"(?:py|js|ts|tsx|jsx|json|yaml|yml|toml|md|txt|ini|cfg|sh|bash|ps1|rb|go|rs|java|cs|cpp|c|h|hpp|css|scss|html|htm|xml|sql|r|m|swift|kt|php|pl|lua|vim))"
-        )
-        m = pattern.search(text)
-        if not m:
-            return None
-        candidate = m.group("file") or ""
-        candidate = candidate.strip().strip("\"'")
-        candidate = candidate.rstrip(".,;:")
-        return candidate or None
+        for _, candidate in _priority_matches(_FILE_RE, _FILE_PATTERNS, text):
+            candidate = (candidate or "").strip().strip("\"'")
+            candidate = candidate.rstrip(".,;:")
+            if candidate:
+                return candidate
+        return None
 
     def _estimate_token_usage(self) -> int:
         """
@@ -2390,46 +2822,63 @@ Please provide edit instructions."""
 
             # Render old messages into a plain text transcript without
             # workspace or system context, so we only summarize true
-            # conversational turns.
-            lines: List[str] = []
-            for m in old_messages:
-                try:
-                    role = (getattr(m, "role", None) or "user").upper()
-                    content = getattr(m, "content", "") or ""
-                except Exception:
-                    role = "USER"
-                    content = ""
-                if not content:
-                    continue
-                lines.append(f"{role}: {content}")
+            # conversational turns. ContextManager keeps these lines
+            # prebuilt, so this is a slice + join rather than a re-render.
+            transcript = self.context.build_transcript(end=-tail_keep)
+            if not transcript:
+                return
 
-            if not lines:
+            summary_text = await self._request_summary(transcript)
+            if not summary_text:
                 return
 
-            transcript = "\n".join(lines)
-
-            summary_instructions = (
-                "You are summarizing old conversation turns for an IDE AI engine.\n"
-                "Summarize the following messages into a compact 5–8 line block that preserves:\n"
-                "- file operations the AI performed (create/edit/delete)\n"
-                "- requested code changes\n"
-                "- ongoing tasks / TODOs\n"
-                "- important user goals\n"
-                "- any critical instructions\n"
-                "Remove greetings, small-talk, or irrelevant conversational text.\n"
-                "Respond ONLY with the summary text. No explanations."
-            )
+            # Persist the summary and aggressively prune historical turns
+            # to a compact recent window.
+            self.context.summary_history = summary_text
+            try:
+                self.context.prune_messages(6)
+            except Exception as e:
+                logger.warning(f"Post-summary prune failed: {e}")
 
-            # Prefer the current OpenAI model when provider is OpenAI;
-            # otherwise fall back to a stable default that should exist
-            # when an OpenAI key is configured.
-            summary_model: Optional[str]
-            if (self.provider or "").lower() == "openai":
-                summary_model = self.model
-            else:
-                summary_model = "gpt-4o-mini"
+            # Expose a notice for the CLI to surface in the left panel.
+            self._auto_summary_notice = "✓ Automatic summarization applied."
+
+        finally:
+            self._summary_in_progress = False
 
-            summary_text = ""
+    async def _request_summary(self, transcript: str) -> Optional[str]:
+        """
+        Summarize a conversation transcript into a compact block, using the
+        summary cache when possible. Returns None on failure.
+        """
+        summary_instructions = (
+            "You are summarizing old conversation turns for an IDE AI engine.\n"
+            "Summarize the following messages into a compact 5–8 line block that preserves:\n"
+            "- file operations the AI performed (create/edit/delete)\n"
+            "- requested code changes\n"
+            "- ongoing tasks / TODOs\n"
+            "- important user goals\n"
+            "- any critical instructions\n"
+            "Remove greetings, small-talk, or irrelevant conversational text.\n"
+            "Respond ONLY with the summary text. No explanations."
+        )
+
+        # Prefer the current OpenAI model when provider is OpenAI;
+        # otherwise fall back to a stable default that should exist
+        # when an OpenAI key is configured.
+        summary_model: Optional[str]
+        if (self.provider or "").lower() == "openai":
+            summary_model = self.model
+        else:
+            summary_model = "gpt-4o-mini"
+
+        # The same transcript (e.g. a reopened chat) summarizes to
+        # the same result; skip the model call on a cache hit.
+        cache_key = self._summary_cache_key(summary_model, transcript)
+        if not self._summary_cache_loaded:
+            await asyncio.to_thread(self._load_summary_cache)
+        summary_text = self._summary_cache_get(cache_key) or ""
+        if not summary_text:
             try:
                 summary_text = await self.ai.ask_full(
                     system_prompt=summary_instructions,
@@ -2440,25 +2889,242 @@ Please provide edit instructions."""
                 )
             except Exception as e:
                 logger.warning(f"Summarization call failed: {e}")
-                return
+                return None
 
             summary_text = (summary_text or "").strip()
             if not summary_text:
-                return
+                return None
+            self._summary_cache_put(cache_key, summary_text)
+        return summary_text
 
-            # Persist the summary and aggressively prune historical turns
-            # to a compact recent window.
-            self.context.summary_history = summary_text
+    def _start_summary_prefetch(self) -> None:
+        """
+        Speculatively summarize, in the background, the turns that the 75%
+        summarization would drop (everything before the last 6 user turns),
+        without touching the conversation. The covered messages are
+        snapshotted now so the result can be validated when applied.
+        """
+        ctx = self.context
+        msgs = list(ctx.messages)
+        if len(msgs) <= 12:
+            return
+        user_indices = [i for i, m in enumerate(msgs) if m.role == "user"]
+        if len(user_indices) <= 6:
+            return
+        cut = user_indices[-6]
+        transcript = ctx.build_transcript(end=cut)
+        if not transcript:
+            return
+        self._summary_prefetch_task = asyncio.create_task(
+            self._prefetch_summary(ctx, msgs[:cut], transcript)
+        )
+
+    async def _prefetch_summary(
+        self, ctx: ContextManager, covered: List[Any], transcript: str
+    ) -> Optional[Tuple[ContextManager, List[Any], str]]:
+        summary_text = await self._request_summary(transcript)
+        if not summary_text:
+            return None
+        return ctx, covered, summary_text
+
+    async def _apply_prefetched_summary(self) -> bool:
+        """
+        Apply the result of a summary prefetch if it still describes the
+        start of the live conversation. The summarized messages are dropped
+        and every later turn is kept. Returns False when there is nothing
+        usable, so the caller can summarize normally.
+        """
+        task = self._summary_prefetch_task
+        if task is None:
+            return False
+        self._summary_prefetch_task = None
+        # A task cancelled with, or created on, another event loop is stale.
+        if task.cancelled() or task.get_loop() is not asyncio.get_running_loop():
+            return False
+        try:
+            result = await task
+        except Exception as e:
+            logger.warning(f"Summary prefetch failed: {e}")
+            return False
+        if not result:
+            return False
+
+        ctx, covered, summary_text = result
+        if ctx is not self.context or ctx.summary_history:
+            return False
+        live = ctx.messages
+        if len(live) < len(covered) or any(a is not b for a, b in zip(live, covered)):
+            return False
+
+        ctx.summary_history = summary_text
+        ctx.messages = live[len(covered):]
+        self._auto_summary_notice = "✓ Automatic summarization applied."
+        return True
+
+    @staticmethod
+    def _summary_cache_key(model: Optional[str], transcript: str) -> str:
+        """Stable cache key for a (summary model, transcript) pair."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update((model or "").encode("utf-8"))
+        h.update(b"\0")
+        h.update(transcript.encode("utf-8"))
+        return h.hexdigest()
+
+    def _load_summary_cache(self) -> None:
+        """Load the persisted summary cache once, on first use."""
+        self._summary_cache_loaded = True
+        path = self._summary_cache_path
+        if path is None or not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load summary cache {path}: {e}")
+            return
+        if isinstance(data, dict):
+            for key, value in data.items():
+                if isinstance(key, str) and isinstance(value, str):
+                    self._summary_cache[key] = value
+            while len(self._summary_cache) > self.SUMMARY_CACHE_SIZE:
+                self._summary_cache.popitem(last=False)
+
+    def _save_summary_cache(self) -> None:
+        """
+        Persist the summary cache (when enabled) without blocking the event
+        loop. Writes are serialized: a snapshot is queued as the single
+        pending write, replacing any older one not yet started, and one
+        background writer drains it, so the newest snapshot always lands
+        last. Failures are only logged.
+        """
+        path = self._summary_cache_path
+        if path is None:
+            return
+        snapshot = dict(self._summary_cache)
+        with self._summary_cache_lock:
+            self._summary_cache_pending = snapshot
+            if self._summary_cache_writing:
+                return
+            self._summary_cache_writing = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._drain_summary_cache_writes(path)
+            return
+        # run_in_executor submits immediately, so the write completes even
+        # if the loop shuts down right after this turn.
+        loop.run_in_executor(None, self._drain_summary_cache_writes, path)
+
+    def _drain_summary_cache_writes(self, path: Path) -> None:
+        """Write pending snapshots until none is left, then release the writer."""
+        while True:
+            with self._summary_cache_lock:
+                snapshot = self._summary_cache_pending
+                self._summary_cache_pending = None
+                if snapshot is None:
+                    self._summary_cache_writing = False
+                    return
             try:
-                self.context.prune_messages(6)
-            except Exception as e:
-                logger.warning(f"Post-summary prune failed: {e}")
+                self._write_summary_cache(path, snapshot)
+            except Exception:
+                with self._summary_cache_lock:
+                    self._summary_cache_writing = False
+                raise
 
-            # Expose a notice for the CLI to surface in the left panel.
-            self._auto_summary_notice = "✓ Automatic summarization applied."
+    @staticmethod
+    def _write_summary_cache(path: Path, data: Dict[str, str]) -> None:
+        """Replace the cache file atomically, so readers never see a partial write."""
+        tmp_name = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=path.parent, prefix=path.name + ".",
+                suffix=".tmp", delete=False,
+            ) as fh:
+                tmp_name = fh.name
+                fh.write(_json_dumps(data))
+            os.replace(tmp_name, path)
+        except OSError as e:
+            logger.warning(f"Failed to save summary cache {path}: {e}")
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
 
-        finally:
-            self._summary_in_progress = False
+    def _summary_cache_get(self, key: str) -> Optional[str]:
+        if not self._summary_cache_loaded:
+            self._load_summary_cache()
+        value = self._summary_cache.get(key)
+        if value is not None:
+            self._summary_cache.move_to_end(key)
+        return value
+
+    def _summary_cache_put(self, key: str, value: str) -> None:
+        self._summary_cache[key] = value
+        self._summary_cache.move_to_end(key)
+        while len(self._summary_cache) > self.SUMMARY_CACHE_SIZE:
+            self._summary_cache.popitem(last=False)
+        self._save_summary_cache()
+
+    def _prune_context(self, keep_turns: int) -> int:
+        """
+        Prune the active context to the last `keep_turns` user turns and
+        return how many messages were dropped.
+
+        With evict_pruned_messages enabled, the dropped messages are kept
+        in the evicted-page store and replaced by a single note listing
+        their page ids, so the model can still fetch them on demand. That
+        needs the OpenAI tool paths, the only ones offering
+        fetch_evicted_page; without an OpenAI client this is plain pruning.
+        """
+        ctx = self.context
+        before = list(ctx.messages)
+        ctx.prune_messages(keep_turns)
+        dropped = len(before) - len(ctx.messages)
+        if dropped <= 0 or not self.evict_pruned_messages or self.ai is None:
+            return dropped
+
+        for msg in before[:dropped]:
+            # An earlier note is superseded by the one rebuilt below.
+            if msg.name == self._EVICTED_NOTE_NAME:
+                continue
+            self._evicted_pages[uuid.uuid4().hex[:12]] = msg
+        while len(self._evicted_pages) > self.EVICTED_PAGE_LIMIT:
+            self._evicted_pages.popitem(last=False)
+        if self._evicted_pages:
+            ctx.messages = [self._evicted_pages_note()] + ctx.messages
+        return dropped
+
+    def _evicted_pages_note(self) -> Message:
+        """System message listing the most recent evicted pages."""
+        lines = [
+            "[Evicted pages] Older messages were moved out of context. "
+            "Call fetch_evicted_page with a page id to read one back:"
+        ]
+        recent = list(self._evicted_pages.items())[-self.EVICTED_NOTE_ENTRIES:]
+        for page_id, msg in recent:
+            preview = " ".join((msg.content or "").split())[:60]
+            lines.append(f"- {page_id} ({msg.role}): {preview}")
+        return Message(role="system", content="\n".join(lines), name=self._EVICTED_NOTE_NAME)
+
+    def _fetch_evicted_page(self, arguments: str) -> Dict[str, Any]:
+        """Handle a fetch_evicted_page tool call."""
+        try:
+            page_id = str(_json_loads(arguments or "{}").get("page_id") or "").strip()
+        except (ValueError, AttributeError) as e:
+            return {"status": "failure", "message": "Invalid JSON", "error": str(e)}
+        msg = self._evicted_pages.get(page_id)
+        if msg is None:
+            return {
+                "status": "failure",
+                "message": f"Unknown page id: {page_id}",
+                "error": "Page not found",
+            }
+        return {
+            "status": "success",
+            "message": f"{_role_label(msg.role)}: {msg.content or ''}",
+            "data": {"page_id": page_id, "role": msg.role},
+        }
 
     async def _auto_prune_if_needed(self) -> None:
         """
@@ -2484,17 +3150,28 @@ Please provide edit instructions."""
 
         usage_ratio = approx_tokens / float(max_ctx)
 
-        # First, if we are beyond ~75% of the context window and we have
-        # an OpenAI client with no previous summary, summarize the oldest
-        # portion of the conversation into ContextManager.summary_history.
-        if (
-            usage_ratio > 0.75
-            and self.ai is not None
+        can_summarize = (
+            self.ai is not None
             and not getattr(self.context, "summary_history", None)
             and not self._summary_in_progress
+        )
+
+        # Past ~65%, start summarizing the oldest turns in the background
+        # so the result is (usually) ready by the time it is needed.
+        if (
+            can_summarize
+            and 0.65 < usage_ratio <= 0.75
+            and self._summary_prefetch_task is None
         ):
+            self._start_summary_prefetch()
+
+        # First, if we are beyond ~75% of the context window and we have
+        # an OpenAI client with no previous summary, summarize the oldest
+        # portion of the conversation into ContextManager.summary_history.
+        if usage_ratio > 0.75 and can_summarize:
             try:
-                await self.summarize_old_messages()
+                if not await self._apply_prefetched_summary():
+                    await self.summarize_old_messages()
                 # Recalculate usage after summarization/pruning.
                 approx_tokens = self._estimate_token_usage()
                 usage_ratio = approx_tokens / float(max_ctx)
@@ -2502,15 +3179,11 @@ Please provide edit instructions."""
                 logger.warning(f"Automatic summarization failed, continuing without summary: {e}")
 
         # After optional summarization, apply stricter auto-prune thresholds.
-        if usage_ratio <= 0.85:
+        # bisect_left counts the tiers whose ratio is strictly exceeded.
+        tier = bisect.bisect_left(self._PRUNE_TIER_RATIOS, usage_ratio) - 1
+        if tier < 0:
             return
-
-        if usage_ratio > 0.95:
-            base_keep = 2
-        elif usage_ratio > 0.90:
-            base_keep = 4
-        else:
-            base_keep = 6
+        base_keep = self._PRUNE_TIER_KEEP[tier]
 
         # Adaptive safety: if pruning happens frequently, keep a
         # slightly larger minimum window of user turns so the model
@@ -2526,18 +3199,14 @@ Please provide edit instructions."""
 
         keep_turns = max(base_keep, self._auto_prune_min_kept_turns)
 
-        before_count = self.context.get_message_count()
         try:
-            self.context.prune_messages(keep_turns)
+            dropped = self._prune_context(keep_turns)
         except Exception as e:
             logger.warning(f"Auto-prune failed, continuing without pruning: {e}")
             return
 
-        after_count = self.context.get_message_count()
-        if after_count < before_count:
-            self._auto_prune_notice = (
-                f"✓ Auto-prune applied to prevent context overflow (kept last {keep_turns} turns)."
-            )
+        if dropped > 0:
+            self._auto_prune_notice = _PRUNE_NOTICES.get(keep_turns) or _prune_notice(keep_turns)
 
     def consume_auto_prune_notice(self) -> Optional[str]:
         """
@@ -2579,17 +3248,27 @@ Please provide edit instructions."""
             # Fallback to initial base_dir if executor is unavailable
             return Path(self.base_dir)
 
+    def _base_dir_str(self) -> str:
+        """
+        `str(self.get_base_dir())`, cached against the executor's
+        base_dir_version so repeated callers skip the Path -> str work.
+        """
+        executor = self.executor
+        version = getattr(executor, "base_dir_version", None)
+        if version is None:
+            return str(self.get_base_dir())
+        cached = self._base_dir_str_cache
+        if cached is None or cached[0] is not executor or cached[1] != version:
+            cached = (executor, version, str(self.get_base_dir()))
+            self._base_dir_str_cache = cached
+        return cached[2]
+
     def get_last_modified_path(self) -> Optional[Path]:
         """
         Absolute path of the last file or folder modified via an INTERNAL
         action (CreateFile, EditFile, AppendText, etc.), if any.
         """
-        if not self._last_modified_path:
-            return None
-        try:
-            return Path(self._last_modified_path)
-        except Exception:
-            return None
+        return self._last_modified_path
 
     def get_last_opened_file(self) -> Optional[Path]:
         """
@@ -2611,10 +3290,10 @@ Please provide edit instructions."""
         self._last_opened_file = None
 
     async def chat(self, user_input: str) -> str:
-        out = ""
+        parts: List[str] = []
         async for chunk in self.stream(user_input):
-            out += chunk
-        return out
+            parts.append(chunk)
+        return "".join(parts)
 
     def enable_dry_run(self) -> None:
         self.executor.enable_dry_run()
@@ -2626,12 +3305,51 @@ Please provide edit instructions."""
     def dry_run(self) -> bool:
         return self.executor.is_dry_run()
 
+    @property
+    def context(self) -> ContextManager:
+        """The active engine's ContextManager."""
+        return self._ctx_slot[0]
+
+    @context.setter
+    def context(self, value: ContextManager) -> None:
+        self._ctx_slot[0] = value
+
+    @property
+    def provider(self) -> str:
+        return self._provider
+
+    @provider.setter
+    def provider(self, value: str) -> None:
+        # Normalize once here instead of on every dispatch.
+        self._provider = value
+        self._provider_lc = (value or "openai").lower()
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    @model.setter
+    def model(self, value: str) -> None:
+        self._model = value
+        self._normalized_model: Optional[Tuple[str, str]] = None
+
+    def _model_for_provider(self, provider: str) -> str:
+        """
+        `self.model` normalized for `provider`, cached until the model
+        changes so provider calls skip the normalization string work.
+        """
+        cached = self._normalized_model
+        if cached is None or cached[0] != provider:
+            cached = (provider, self._normalize_model_for_provider(provider, self._model))
+            self._normalized_model = cached
+        return cached[1]
+
     def get_stats(self) -> Dict[str, Any]:
         return {
-            "provider": getattr(self, "provider", "openai"),
+            "provider": self.provider,
             "model": self.model,
             "message_count": self.context.get_message_count(),
-            "base_dir": str(self.get_base_dir()),
+            "base_dir": self._base_dir_str(),
             "dry_run": self.executor.is_dry_run(),
             "github_enabled": bool(self._github_config),
         }
@@ -2645,12 +3363,34 @@ Please provide edit instructions."""
         Convert OpenAI-style messages into a plain text conversation prompt
         suitable for providers that do not support the same message schema.
         """
-        parts: List[str] = []
-        for m in messages:
-            role = (m.get("role") or "user").upper()
-            content = m.get("content") or ""
-            parts.append(f"{role}: {content}")
-        return "\n".join(parts)
+        if len(messages) == 1:
+            # Common in fallback paths: nothing to cache or join.
+            m = messages[0]
+            return _prompt_line(m.get("role") or "user", m.get("content") or "")
+
+        items = [(m.get("role") or "user", m.get("content") or "") for m in messages]
+        if not items:
+            return ""
+
+        # Everything but the newest message is committed history; it only
+        # grows between turns, so append lines for the new messages to the
+        # cached ones and build the prompt with a single join. Any rewrite of
+        # the history (pruning, summaries, engine switch) fails the prefix
+        # check and triggers a full re-render.
+        committed = items[:-1]
+        cached = self._prefix_cache
+        n_cached = len(cached[0]) if cached is not None else -1
+        if 0 <= n_cached <= len(committed) and committed[:n_cached] == cached[0]:
+            lines = cached[1]
+            lines.extend(_prompt_line(role, content) for role, content in committed[n_cached:])
+        else:
+            lines = [_prompt_line(role, content) for role, content in committed]
+        self._prefix_cache = (committed, lines)
+
+        lines.append(_prompt_line(*items[-1]))
+        prompt = "\n".join(lines)
+        lines.pop()
+        return prompt
 
     async def _complete_via_provider(
         self,
@@ -2663,25 +3403,25 @@ Please provide edit instructions."""
 
         For OpenAI, tool-enabled streaming is handled separately in `stream()`,
         but this method still provides a plain-text fallback used in tests and
-        in rare non-tool flows. For Gemini / Claude / Ollama we aggregate
-        messages into a single text prompt and call the respective SDK or
-        HTTP API.
+        in rare non-tool flows. Claude receives the structured messages; for
+        Gemini / Ollama we aggregate messages into a single text prompt and
+        call the respective SDK or HTTP API.
         """
-        provider = (self.provider or "openai").lower()
-        prompt = self._messages_to_prompt(messages)
+        provider = self._provider_lc
 
         raw: str
-        if provider == "gemini":
-            raw = await self._complete_gemini(prompt, temperature, max_tokens)
-        elif provider == "claude":
-            raw = await self._complete_claude(prompt, temperature, max_tokens)
-        elif provider == "ollama":
-            raw = await self._complete_ollama(prompt, temperature, max_tokens)
+        structured = self._STRUCTURED_COMPLETION_METHODS.get(provider)
+        method = self._COMPLETION_METHODS.get(provider)
+        if structured is not None:
+            raw = await getattr(self, structured)(messages, temperature, max_tokens)
+        elif method is not None:
+            prompt = self._messages_to_prompt(messages)
+            raw = await getattr(self, method)(prompt, temperature, max_tokens)
         elif provider == "openai" and self.ai:
             try:
                 raw = await self.ai.ask_full(
                     system_prompt="",
-                    user_prompt=prompt,
+                    user_prompt=self._messages_to_prompt(messages),
                     model=self.model,
                     temperature=temperature,
                     max_tokens=max_tokens,
@@ -2697,6 +3437,97 @@ Please provide edit instructions."""
         # Normalize provider-specific quirks in fences and return.
         return self._provider_normalizer.normalize_fences(raw)
 
+    async def _get_http_session(self) -> Any:
+        """
+        Return the shared keep-alive aiohttp session, creating it on first
+        use or when the running event loop changed (tests and one-shot
+        callers each run their own loop).
+        """
+        import aiohttp  # type: ignore
+
+        loop = asyncio.get_running_loop()
+        session = self._http_session
+        if session is None or session.closed or self._http_session_loop is not loop:
+            self._discard_http_session()
+            session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=60)
+            )
+            self._http_session = session
+            self._http_session_loop = loop
+        return session
+
+    def _discard_http_session(self) -> None:
+        """
+        Release a session left behind by a previous event loop. It cannot
+        be awaited from the current loop, so hand close() to its own loop
+        when that is still running, and otherwise detach it and drop the
+        pooled connections synchronously.
+        """
+        session, old_loop = self._http_session, self._http_session_loop
+        self._http_session = None
+        self._http_session_loop = None
+        if session is None or session.closed:
+            return
+        if old_loop is not None and old_loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), old_loop)
+            return
+        connector = session.connector
+        session.detach()
+        if connector is not None:
+            # BaseConnector.close() would schedule a task on the dead loop;
+            # _close() only closes the transports and marks it closed.
+            connector._close()
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session, if one was opened on this loop."""
+        session = self._http_session
+        self._http_session = None
+        self._http_session_loop = None
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _provider_sdk(self, provider: str) -> Any:
+        """
+        Return the SDK module for `provider`, importing it once. Raises
+        ProviderNotConfiguredError if the package is not installed.
+        """
+        module = self._sdk_modules.get(provider)
+        if module is None:
+            module_name, package = self._PROVIDER_SDKS[provider]
+            try:
+                module = importlib.import_module(module_name)
+            except ImportError:
+                raise ProviderNotConfiguredError(
+                    f"{provider.capitalize()} provider requires the '{package}' package. "
+                    f"Install it with `pip install {package}`."
+                )
+            self._sdk_modules[provider] = module
+        return module
+
+    def _provider_client(
+        self, key: Tuple[str, str], api_key: Optional[str], factory: Callable[[], Any]
+    ) -> Any:
+        """
+        Return the cached SDK object for `key`, building it with `factory`
+        on first use or when the provider's API key has changed since.
+        """
+        entry = self._provider_clients.get(key)
+        if entry is None or entry[0] != api_key:
+            entry = (api_key, factory())
+            self._provider_clients[key] = entry
+        return entry[1]
+
+    def _gemini_model(self, genai: Any, model_name: str) -> Any:
+        """
+        Cached `genai.GenerativeModel` for `model_name`. `genai.configure`
+        is process-global, so it only runs when a model is (re)built.
+        """
+        def _build() -> Any:
+            genai.configure(api_key=self._gemini_api_key)
+            return genai.GenerativeModel(model_name)
+
+        return self._provider_client(("gemini", model_name), self._gemini_api_key, _build)
+
     async def _complete_ollama(
         self, prompt: str, temperature: float, max_tokens: int
     ) -> str:
@@ -2706,41 +3537,50 @@ Please provide edit instructions."""
         base_url = self._ollama_config.get("base_url") or "http://127.0.0.1:11434"
         url = base_url.rstrip("/") + "/api/generate"
 
-        def _call() -> str:
-            try:
-                payload: Dict[str, Any] = {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": temperature,
-                        # Ollama uses `num_predict` as an approximate max-tokens analogue.
-                        "num_predict": max_tokens,
-                    },
-                }
-                resp = requests.post(url, json=payload, timeout=60)
+        try:
+            # Fill the reused payload in place and serialize it before the
+            # first await, so concurrent calls never see each other's fields.
+            payload = self._ollama_payload
+            payload["model"] = self.model
+            payload["prompt"] = prompt
+            options = payload["options"]
+            options["temperature"] = temperature
+            # Ollama uses `num_predict` as an approximate max-tokens analogue.
+            options["num_predict"] = max_tokens
+            body = _json_dumps_bytes(payload)
+            payload["prompt"] = None
+            session = await self._get_http_session()
+            async with session.post(url, data=body, headers=_JSON_HEADERS) as resp:
                 resp.raise_for_status()
-                data = resp.json()
-                # Non-streaming /api/generate responses typically expose "response".
-                text = data.get("response") or ""
-                if isinstance(text, str):
-                    return text
-                return str(text)
-            except Exception as e:
-                # Log full error details for debugging
-                logger.error(f"Ollama completion failed: {e}", exc_info=True)
-                # Return error message instead of empty string so user sees what went wrong
-                error_msg = str(e)
-                if "404" in error_msg or "not found" in error_msg.lower():
-                    return f"Ollama Error: Model '{self.model}' not found. Pull it with: ollama pull {self.model}"
-                elif "connection" in error_msg.lower() or "refused" in error_msg.lower():
-                    return f"Ollama Error: Cannot connect to Ollama at {base_url}. Is the Ollama daemon running?"
-                elif "timeout" in error_msg.lower():
-                    return f"Ollama Error: Request timed out. The model might be too slow or the daemon is overloaded."
-                else:
-                    return f"Ollama Error: {error_msg}"
+                data = _json_loads(await resp.read())
+            # Non-streaming /api/generate responses typically expose "response".
+            text = data.get("response") or ""
+            if isinstance(text, str):
+                return text
+            return str(text)
+        except Exception as e:
+            # Log full error details for debugging
+            logger.error(f"Ollama completion failed: {e}", exc_info=True)
+            # Return error message instead of empty string so user sees what went wrong
+            return self._ollama_error_message(e, base_url)
 
-        return await asyncio.to_thread(_call)
+    def _ollama_error_message(self, e: BaseException, base_url: str) -> str:
+        """
+        Map an aiohttp failure from an Ollama request to the user-facing
+        error text. aiohttp messages never contain "connection"/"refused"
+        (they read "Cannot connect to host ..."), so classify on the
+        exception types rather than on the message.
+        """
+        import aiohttp  # type: ignore
+
+        if isinstance(e, aiohttp.ClientResponseError) and e.status == 404:
+            return f"Ollama Error: Model '{self.model}' not found. Pull it with: ollama pull {self.model}"
+        # aiohttp's timeout errors subclass ClientConnectionError, so test them first.
+        if isinstance(e, asyncio.TimeoutError):
+            return f"Ollama Error: Request timed out. The model might be too slow or the daemon is overloaded."
+        if isinstance(e, (aiohttp.ClientConnectionError, ConnectionError)):
+            return f"Ollama Error: Cannot connect to Ollama at {base_url}. Is the Ollama daemon running?"
+        return f"Ollama Error: {e}"
 
     async def _complete_gemini(
         self, prompt: str, temperature: float, max_tokens: int
@@ -2753,132 +3593,152 @@ Please provide edit instructions."""
                 "Gemini provider selected but no API key is configured."
             )
 
+        genai = self._provider_sdk("gemini")
+
+        # Initialize model_name before try block to ensure it's always defined
+        model_name = self._model_for_provider("gemini")
         try:
-            import google.generativeai as genai  # type: ignore
-        except ImportError:
-            raise ProviderNotConfiguredError(
-                "Gemini provider requires the 'google-generativeai' package. "
-                "Install it with `pip install google-generativeai`."
+            # Remove "models/" prefix if present (SDK expects just the model name)
+            # Use case-insensitive check for consistency with rest of codebase
+            model_lower = model_name.lower()
+            if model_lower.startswith("models/"):
+                model_name = model_name[7:]
+                model_lower = model_name.lower()  # Recalculate after prefix removal
+            # Ensure valid Gemini model name
+            # CRITICAL FIX: Gemini SDK requires lowercase model names
+            # Normalize to lowercase for API compatibility
+            if not model_lower.startswith("gemini-"):
+                model_name = "gemini-1.5-pro"
+            else:
+                # Force lowercase for SDK compatibility (Gemini API expects lowercase)
+                model_name = model_lower
+            # Configure safety settings to be less restrictive for code/technical tasks
+            safety_settings = [
+                {
+                    "category": "HARM_CATEGORY_HARASSMENT",
+                    "threshold": "BLOCK_MEDIUM_AND_ABOVE",
+                },
+                {
+                    "category": "HARM_CATEGORY_HATE_SPEECH",
+                    "threshold": "BLOCK_MEDIUM_AND_ABOVE",
+                },
+                {
+                    "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
+                    "threshold": "BLOCK_MEDIUM_AND_ABOVE",
+                },
+                {
+                    "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
+                    "threshold": "BLOCK_MEDIUM_AND_ABOVE",
+                },
+            ]
+            # CRITICAL FIX: Create GenerativeModel instance before calling generate_content
+            model = self._gemini_model(genai, model_name)
+            resp = await model.generate_content_async(
+                prompt,
+                generation_config={
+                    "temperature": float(temperature),
+                    "max_output_tokens": int(max_tokens),
+                },
+                safety_settings=safety_settings,
             )
-
-        def _call() -> str:
-            # Initialize model_name before try block to ensure it's always defined
-            model_name = self._normalize_model_for_provider("gemini", self.model)
+            # Check for blocked/filtered responses first
+            if hasattr(resp, "prompt_feedback"):
+                feedback = resp.prompt_feedback
+                if hasattr(feedback, "block_reason") and feedback.block_reason:
+                    return f"Gemini Error: Content was blocked. Reason: {feedback.block_reason}. Try rephrasing your request."
+
+            # Primary path: newer google-generativeai exposes .text
+            text = getattr(resp, "text", None)
+            if isinstance(text, str) and text.strip():
+                return text
+
+            # Fallback: inspect candidates/content/parts for text.
+            # This is defensive and avoids provider-version-specific
+            # assumptions as much as possible.
             try:
-                genai.configure(api_key=self._gemini_api_key)
-                # Remove "models/" prefix if present (SDK expects just the model name)
-                # Use case-insensitive check for consistency with rest of codebase
-                model_lower = model_name.lower()
-                if model_lower.startswith("models/"):
-                    model_name = model_name[7:]
-                    model_lower = model_name.lower()  # Recalculate after prefix removal
-                # Ensure valid Gemini model name
-                # CRITICAL FIX: Gemini SDK requires lowercase model names
-                # Normalize to lowercase for API compatibility
-                if not model_lower.startswith("gemini-"):
-                    model_name = "gemini-1.5-pro"
-                else:
-                    # Force lowercase for SDK compatibility (Gemini API expects lowercase)
-                    model_name = model_lower
-                # Configure safety settings to be less restrictive for code/technical tasks
-                safety_settings = [
-                    {
-                        "category": "HARM_CATEGORY_HARASSMENT",
-                        "threshold": "BLOCK_MEDIUM_AND_ABOVE",
-                    },
-                    {
-                        "category": "HARM_CATEGORY_HATE_SPEECH",
-                        "threshold": "BLOCK_MEDIUM_AND_ABOVE",
-                    },
-                    {
-                        "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                        "threshold": "BLOCK_MEDIUM_AND_ABOVE",
-                    },
-                    {
-                        "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
-                        "threshold": "BLOCK_MEDIUM_AND_ABOVE",
-                    },
-                ]
-                # CRITICAL FIX: Create GenerativeModel instance before calling generate_content
-                model = genai.GenerativeModel(model_name)
-                resp = model.generate_content(
-                    prompt,
-                    generation_config={
-                        "temperature": float(temperature),
-                        "max_output_tokens": int(max_tokens),
-                    },
-                    safety_settings=safety_settings,
-                )
-                # Check for blocked/filtered responses first
-                if hasattr(resp, "prompt_feedback"):
-                    feedback = resp.prompt_feedback
-                    if hasattr(feedback, "block_reason") and feedback.block_reason:
-                        return f"Gemini Error: Content was blocked. Reason: {feedback.block_reason}. Try rephrasing your request."
-                
-                # Primary path: newer google-generativeai exposes .text
-                text = getattr(resp, "text", None)
-                if isinstance(text, str) and text.strip():
+                text = _extract_gemini_text(resp)
+                if text:
                     return text
+            except Exception:
+                # If any of the introspection fails, fall through to
+                # the generic fallback below.
+                pass
 
-                # Fallback: inspect candidates/content/parts for text.
-                # This is defensive and avoids provider-version-specific
-                # assumptions as much as possible.
-                try:
-                    candidates = getattr(resp, "candidates", None) or []
-                    for cand in candidates:
-                        content = getattr(cand, "content", None)
-                        # content may be a list of parts or an object with .parts
-                        parts = None
-                        if isinstance(content, list):
-                            parts = content
-                        elif hasattr(content, "parts"):
-                            parts = getattr(content, "parts")
-                        if not parts:
-                            continue
-                        chunks = []
-                        for part in parts:
-                            pt = getattr(part, "text", None)
-                            if not pt and isinstance(part, dict):
-                                pt = part.get("text")
-                            if pt:
-                                chunks.append(pt)
-                        if chunks:
-                            return "".join(chunks)
-                except Exception:
-                    # If any of the introspection fails, fall through to
-                    # the generic fallback below.
-                    pass
-
-                # Last resort: stringify the response so the user sees
-                # something instead of an empty reply.
-                try:
-                    return str(resp)
-                except Exception:
-                    return ""
-            except Exception as e:
-                # Log full error details for debugging
-                logger.error(f"Gemini completion failed: {e}", exc_info=True)
-                # Return error message instead of empty string so user sees what went wrong
-                error_msg = str(e)
-                if "404" in error_msg or "not found" in error_msg.lower():
-                    if "gemini-pro" in model_name.lower() and "gemini-1.5-pro" not in model_name.lower():
-                        # gemini-pro is not found, suggest gemini-1.5-pro instead
-                        return f"Gemini Error: Model 'gemini-pro' not found in v1beta API. Use 'gemini-1.5-pro' instead (type: :set-ai gemini-1.5-pro)."
-                    elif "gemini-1.5-pro" in model_name.lower():
-                        return f"Gemini Error: Model '{model_name}' not found. Possible issues:\n  1. Check API key is valid (get from https://makersuite.google.com/app/apikey)\n  2. Verify API key has access to Gemini models\n  3. Check billing/quota status\n  4. Ensure you're using a valid model name"
-                    else:
-                        return f"Gemini Error: Model '{model_name}' not found. Valid models: 'gemini-1.5-pro'. Try: :set-ai gemini-1.5-pro"
-                elif "403" in error_msg or "permission" in error_msg.lower():
-                    return f"Gemini Error: API key permission denied. Check your API key in config.json."
-                elif "429" in error_msg or "quota" in error_msg.lower():
-                    return f"Gemini Error: API quota exceeded. Try again later or check your billing."
+            # Last resort: stringify the response so the user sees
+            # something instead of an empty reply.
+            try:
+                return str(resp)
+            except Exception:
+                return ""
+        except Exception as e:
+            # Log full error details for debugging
+            logger.error(f"Gemini completion failed: {e}", exc_info=True)
+            # Return error message instead of empty string so user sees what went wrong
+            error_msg = str(e)
+            if "404" in error_msg or "not found" in error_msg.lower():
+                if "gemini-pro" in model_name.lower() and "gemini-1.5-pro" not in model_name.lower():
+                    # gemini-pro is not found, suggest gemini-1.5-pro instead
+                    return f"Gemini Error: Model 'gemini-pro' not found in v1beta API. Use 'gemini-1.5-pro' instead (type: :set-ai gemini-1.5-pro)."
+                elif "gemini-1.5-pro" in model_name.lower():
+                    return f"Gemini Error: Model '{model_name}' not found. Possible issues:\n  1. Check API key is valid (get from https://makersuite.google.com/app/apikey)\n  2. Verify API key has access to Gemini models\n  3. Check billing/quota status\n  4. Ensure you're using a valid model name"
                 else:
-                    return f"Gemini Error: {error_msg}"
+                    return f"Gemini Error: Model '{model_name}' not found. Valid models: 'gemini-1.5-pro'. Try: :set-ai gemini-1.5-pro"
+            elif "403" in error_msg or "permission" in error_msg.lower():
+                return f"Gemini Error: API key permission denied. Check your API key in config.json."
+            elif "429" in error_msg or "quota" in error_msg.lower():
+                return f"Gemini Error: API quota exceeded. Try again later or check your billing."
+            else:
+                return f"Gemini Error: {error_msg}"
 
-        return await asyncio.to_thread(_call)
+
+    @staticmethod
+    def _claude_request(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Map OpenAI-style messages onto Anthropic's `system` + `messages`
+        request fields.
+
+        System messages are joined into `system`; tool results become user
+        text (tools are not declared to Claude); consecutive turns of the
+        same role are merged. Prompt-cache breakpoints mark the system block
+        and the last message before the newest turn, so the stable prefix
+        is served from Anthropic's cache on the next call.
+        """
+        ephemeral = {"type": "ephemeral"}
+        system_parts: List[str] = []
+        turns: List[Dict[str, Any]] = []
+        for m in messages:
+            role = m.get("role") or "user"
+            content = m.get("content") or ""
+            if role == "system":
+                if content:
+                    system_parts.append(content)
+                continue
+            if role == "tool":
+                role, content = "user", f"TOOL: {content}"
+            elif role != "assistant":
+                role = "user"
+            if not content:
+                continue
+            if turns and turns[-1]["role"] == role:
+                turns[-1]["content"][-1]["text"] += "\n" + content
+            else:
+                turns.append({"role": role, "content": [{"type": "text", "text": content}]})
+
+        # The conversation must open with a user turn.
+        if not turns or turns[0]["role"] != "user":
+            turns.insert(0, {"role": "user", "content": [{"type": "text", "text": "(continued)"}]})
+        if len(turns) > 1:
+            turns[-2]["content"][-1]["cache_control"] = ephemeral
+
+        request: Dict[str, Any] = {"messages": turns}
+        if system_parts:
+            request["system"] = [
+                {"type": "text", "text": "\n\n".join(system_parts), "cache_control": ephemeral}
+            ]
+        return request
 
     async def _complete_claude(
-        self, prompt: str, temperature: float, max_tokens: int
+        self, messages: List[Dict[str, Any]], temperature: float, max_tokens: int
     ) -> str:
         """
         Use the Anthropic Claude Python SDK, if installed.
@@ -2888,85 +3748,37 @@ Please provide edit instructions."""
                 "Claude provider selected but no API key is configured."
             )
 
+        anthropic = self._provider_sdk("claude")
+
+        # Initialize model_name before try block to ensure it's always defined
+        model_name = self._model_for_provider("claude")
         try:
-            import anthropic  # type: ignore
-        except ImportError:
-            raise ProviderNotConfiguredError(
-                "Claude provider requires the 'anthropic' package. "
-                "Install it with `pip install anthropic`."
+            client = self._provider_client(
+                ("claude", "async"),
+                self._claude_api_key,
+                lambda: anthropic.AsyncAnthropic(api_key=self._claude_api_key),
             )
-
-        def _call() -> str:
-            # Initialize model_name before try block to ensure it's always defined
-            model_name = self._normalize_model_for_provider("claude", self.model)
-            try:
-                client = anthropic.Anthropic(api_key=self._claude_api_key)
-                # Claude API expects system message separately, extract it from prompt if present
-                system_msg = ""
-                user_content = prompt
-                if prompt.startswith("SYSTEM:"):
-                    parts = prompt.split("\nUSER:", 1)
-                    if len(parts) == 2:
-                        system_msg = parts[0].replace("SYSTEM:", "").strip()
-                        user_content = parts[1].strip()
-                elif prompt.startswith("USER:"):
-                    # Remove USER: prefix if no system message
-                    user_content = prompt.replace("USER:", "", 1).strip()
-                
-                # Parse multiple USER/ASSISTANT messages if present
-                messages = []
-                current_role = "user"
-                current_content = []
-                for line in user_content.split("\n"):
-                    if line.startswith("USER:"):
-                        if current_content:
-                            messages.append({"role": current_role, "content": "\n".join(current_content)})
-                        current_role = "user"
-                        current_content = [line.replace("USER:", "", 1).strip()]
-                    elif line.startswith("ASSISTANT:"):
-                        if current_content:
-                            messages.append({"role": current_role, "content": "\n".join(current_content)})
-                        current_role = "assistant"
-                        current_content = [line.replace("ASSISTANT:", "", 1).strip()]
-                    else:
-                        current_content.append(line)
-                if current_content:
-                    messages.append({"role": current_role, "content": "\n".join(current_content)})
-                
-                # Fallback if no messages parsed
-                if not messages:
-                    messages = [{"role": "user", "content": user_content}]
-                resp = client.messages.create(
-                    model=model_name,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    system=system_msg if system_msg else None,
-                    messages=messages,
-                )
-                parts: List[str] = []
-                for block in getattr(resp, "content", []) or []:
-                    text = getattr(block, "text", None)
-                    if text:
-                        parts.append(text)
-                    elif isinstance(block, dict):
-                        t = block.get("text")
-                        if t:
-                            parts.append(t)
-                return "".join(parts)
-            except Exception as e:
-                # Log full error details for debugging
-                logger.error(f"Claude completion failed: {e}", exc_info=True)
-                # Return error message instead of empty string so user sees what went wrong
-                error_msg = str(e)
-                if "404" in error_msg or "not found" in error_msg.lower():
-                    return f"Claude Error: Model '{model_name}' not found. Try 'claude-3-5-sonnet' or 'claude-3-opus'."
-                elif "403" in error_msg or "permission" in error_msg.lower() or "authentication" in error_msg.lower():
-                    return f"Claude Error: API key permission denied. Check your API key in config.json."
-                elif "429" in error_msg or "quota" in error_msg.lower() or "rate limit" in error_msg.lower():
-                    return f"Claude Error: API quota/rate limit exceeded. Try again later or check your billing."
-                else:
-                    return f"Claude Error: {error_msg}"
-        return await asyncio.to_thread(_call)
+            resp = await client.messages.create(
+                model=model_name,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **self._claude_request(messages),
+            )
+            blocks = getattr(resp, "content", None) or ()
+            return "".join([text for text in map(_part_text, blocks) if text])
+        except Exception as e:
+            # Log full error details for debugging
+            logger.error(f"Claude completion failed: {e}", exc_info=True)
+            # Return error message instead of empty string so user sees what went wrong
+            error_msg = str(e)
+            if "404" in error_msg or "not found" in error_msg.lower():
+                return f"Claude Error: Model '{model_name}' not found. Try 'claude-3-5-sonnet' or 'claude-3-opus'."
+            elif "403" in error_msg or "permission" in error_msg.lower() or "authentication" in error_msg.lower():
+                return f"Claude Error: API key permission denied. Check your API key in config.json."
+            elif "429" in error_msg or "quota" in error_msg.lower() or "rate limit" in error_msg.lower():
+                return f"Claude Error: API quota/rate limit exceeded. Try again later or check your billing."
+            else:
+                return f"Claude Error: {error_msg}"
 
     # --------------------------------------------------------------------------------------
     # NATIVE STREAMING METHODS FOR ALL PROVIDERS
@@ -2986,18 +3798,11 @@ Please provide edit instructions."""
                 "Gemini provider selected but no API key is configured."
             )
 
-        try:
-            import google.generativeai as genai  # type: ignore
-        except ImportError:
-            raise ProviderNotConfiguredError(
-                "Gemini provider requires the 'google-generativeai' package. "
-                "Install it with `pip install google-generativeai`."
-            )
+        genai = self._provider_sdk("gemini")
 
         # CRITICAL FIX: Initialize model_name before try block to prevent NameError in exception handler
-        model_name = self._normalize_model_for_provider("gemini", self.model)
+        model_name = self._model_for_provider("gemini")
         try:
-            genai.configure(api_key=self._gemini_api_key)
             # Remove "models/" prefix if present
             model_lower = model_name.lower()
             if model_lower.startswith("models/"):
@@ -3012,7 +3817,7 @@ Please provide edit instructions."""
                 # Force lowercase for SDK compatibility (Gemini API expects lowercase)
                 model_name = model_lower
             
-            model = genai.GenerativeModel(model_name)
+            model = self._gemini_model(genai, model_name)
             safety_settings = [
                 {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
                 {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
@@ -3096,60 +3901,22 @@ Please provide edit instructions."""
                 "Claude provider selected but no API key is configured."
             )
 
-        try:
-            import anthropic  # type: ignore
-        except ImportError:
-            raise ProviderNotConfiguredError(
-                "Claude provider requires the 'anthropic' package. "
-                "Install it with `pip install anthropic`."
-            )
+        anthropic = self._provider_sdk("claude")
 
         try:
-            client = anthropic.Anthropic(api_key=self._claude_api_key)
-            model_name = self._normalize_model_for_provider("claude", self.model)
-            
-            # Parse messages and extract system message
-            prompt = self._messages_to_prompt(messages)
-            system_msg = ""
-            user_content = prompt
-            if prompt.startswith("SYSTEM:"):
-                parts = prompt.split("\nUSER:", 1)
-                if len(parts) == 2:
-                    system_msg = parts[0].replace("SYSTEM:", "").strip()
-                    user_content = parts[1].strip()
-            elif prompt.startswith("USER:"):
-                user_content = prompt.replace("USER:", "", 1).strip()
-            
-            # Parse multiple USER/ASSISTANT messages
-            parsed_messages = []
-            current_role = "user"
-            current_content = []
-            for line in user_content.split("\n"):
-                if line.startswith("USER:"):
-                    if current_content:
-                        parsed_messages.append({"role": current_role, "content": "\n".join(current_content)})
-                    current_role = "user"
-                    current_content = [line.replace("USER:", "", 1).strip()]
-                elif line.startswith("ASSISTANT:"):
-                    if current_content:
-                        parsed_messages.append({"role": current_role, "content": "\n".join(current_content)})
-                    current_role = "assistant"
-                    current_content = [line.replace("ASSISTANT:", "", 1).strip()]
-                else:
-                    current_content.append(line)
-            if current_content:
-                parsed_messages.append({"role": current_role, "content": "\n".join(current_content)})
-            
-            if not parsed_messages:
-                parsed_messages = [{"role": "user", "content": user_content}]
+            client = self._provider_client(
+                ("claude", "sync"),
+                self._claude_api_key,
+                lambda: anthropic.Anthropic(api_key=self._claude_api_key),
+            )
+            model_name = self._model_for_provider("claude")
             
             # Stream from Claude
             with client.messages.stream(
                 model=model_name,
                 max_tokens=max_tokens,
                 temperature=temperature,
-                system=system_msg if system_msg else None,
-                messages=parsed_messages,
+                **self._claude_request(messages),
             ) as stream:
                 for text_event in stream.text_stream:
                     if text_event:
@@ -3194,12 +3961,15 @@ Please provide edit instructions."""
                         "num_predict": max_tokens,
                     },
                 }
-                resp = requests.post(url, json=payload, timeout=60, stream=True)
+                resp = requests.post(
+                    url, data=_json_dumps_bytes(payload), headers=_JSON_HEADERS,
+                    timeout=60, stream=True,
+                )
                 resp.raise_for_status()
                 for line in resp.iter_lines():
                     if line:
                         try:
-                            data = json.loads(line)
+                            data = _json_loads(line)
                             if "response" in data:
                                 yield data["response"]
                             if data.get("done", False):
@@ -3231,7 +4001,12 @@ Please provide edit instructions."""
                         "num_predict": max_tokens,
                     },
                 }
-                async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=60)) as resp:
+                async with session.post(
+                    url,
+                    data=_json_dumps_bytes(payload),
+                    headers=_JSON_HEADERS,
+                    timeout=aiohttp.ClientTimeout(total=60),
+                ) as resp:
                     resp.raise_for_status()
                     # CRITICAL: Ollama sends newline-delimited JSON, so we need to read line by line
                     # resp.content yields byte chunks, not complete lines. We need to buffer and split by newlines.
@@ -3244,7 +4019,7 @@ Please provide edit instructions."""
                                 line, buffer = buffer.split(b"\n", 1)
                                 if line.strip():  # Skip empty lines
                                     try:
-                                        data = json.loads(line.decode('utf-8'))
+                                        data = _json_loads(line)
                                         if "response" in data:
                                             yield data["response"]
                                         if data.get("done", False):
@@ -3256,26 +4031,36 @@ Please provide edit instructions."""
                     # Process any remaining data in buffer
                     if buffer.strip():
                         try:
-                            data = json.loads(buffer.decode('utf-8'))
+                            data = _json_loads(buffer)
                             if "response" in data:
                                 yield data["response"]
                         except (json.JSONDecodeError, UnicodeDecodeError):
                             pass  # Ignore final partial data
         except Exception as e:
             logger.error(f"Ollama streaming failed: {e}", exc_info=True)
-            error_msg = str(e)
-            if "404" in error_msg or "not found" in error_msg.lower():
-                yield f"Ollama Error: Model '{self.model}' not found. Pull it with: ollama pull {self.model}"
-            elif "connection" in error_msg.lower() or "refused" in error_msg.lower():
-                yield f"Ollama Error: Cannot connect to Ollama at {base_url}. Is the Ollama daemon running?"
-            elif "timeout" in error_msg.lower():
-                yield f"Ollama Error: Request timed out. The model might be too slow or the daemon is overloaded."
-            else:
-                yield f"Ollama Error: {error_msg}"
+            yield self._ollama_error_message(e, base_url)
 
-    def _track_last_modified(self, action: Dict[str, Any], result: ActionResult) -> None:
+    @staticmethod
+    def _as_path(value: Any) -> Optional[Path]:
+        """Coerce a tracked path once, at write time (None if unusable)."""
+        if not value:
+            return None
+        try:
+            return Path(value)
+        except TypeError:
+            return None
+
+    def _track_last_modified(
+        self,
+        action: Dict[str, Any],
+        result: ActionResult,
+        refresh: bool = True,
+    ) -> None:
         """
         Updates internal tracking of the last modified file and triggers UI refresh.
+
+        Batch callers pass refresh=False and call refresh_workspace() once
+        for the whole batch.
         """
         action_type = (action.get("type") or "").lower()
         
@@ -3289,13 +4074,13 @@ Please provide edit instructions."""
         # Prefer path from result.data, fallback to first modified file
         if result.status == ActionStatus.SUCCESS:
             if result.data and "path" in result.data:
-                self._last_modified_path = result.data["path"]
+                self._last_modified_path = self._as_path(result.data["path"])
             elif result.modified_files and len(result.modified_files) > 0:
                 # Use first modified file as fallback
-                self._last_modified_path = result.modified_files[0]
+                self._last_modified_path = self._as_path(result.modified_files[0])
 
         # 2. Trigger UI Refresh if files were modified
-        if result.modified_files:
+        if refresh and result.modified_files:
             self.refresh_workspace(result.modified_files)
 
     def refresh_workspace(self, modified_files: List[str]) -> None:
@@ -3305,28 +4090,30 @@ Please provide edit instructions."""
         if not self.fs_watcher:
             return
 
-        # Use manual_trigger to notify all registered callbacks
-        for file_path in modified_files:
+        # Imported here: the workspace package imports this module.
+        from gitvisioncli.workspace.fs_watcher import FileChange
+        from datetime import datetime
+
+        # One event per distinct path (actions often touch a file repeatedly),
+        # all sharing a single timestamp.
+        timestamp = datetime.now()
+        changes = []
+        for file_path in dict.fromkeys(modified_files):
             try:
-                # Create FileChange event for each modified file
-                from gitvisioncli.workspace.fs_watcher import FileChange
-                from datetime import datetime
-                
-                change = FileChange(
-                    path=Path(file_path),
-                    change_type="ai_modify",
-                    timestamp=datetime.now()
+                changes.append(
+                    FileChange(path=Path(file_path), change_type="ai_modify", timestamp=timestamp)
                 )
-                
-                # Trigger all registered callbacks
-                for callback in self.fs_watcher.on_change_callbacks:
-                    try:
-                        callback(change)
-                    except Exception as e:
-                        logger.warning(f"UI Refresh callback failed: {e}")
             except Exception as e:
                 logger.warning(f"Failed to refresh workspace for {file_path}: {e}")
 
+        # Trigger all registered callbacks
+        for callback in self.fs_watcher.on_change_callbacks:
+            for change in changes:
+                try:
+                    callback(change)
+                except Exception as e:
+                    logger.warning(f"UI Refresh callback failed: {e}")
+
 
     # --------------------------------------------------------------------------------------
     # MODEL / ENGINE SWITCHING
@@ -3387,17 +4174,14 @@ Please provide edit instructions."""
 
         # Look up or create context for the new engine
         new_key = self._make_engine_key(provider, normalized)
-        if new_key in self._contexts:
-            self.context = self._contexts[new_key]
-        else:
-            new_ctx = ContextManager()
-            new_ctx.system_prompt = self.context.system_prompt
-            new_ctx.workspace_summary = self.context.workspace_summary
-            # Carry over any existing conversation summary so the
-            # new engine still has access to compressed history.
-            new_ctx.summary_history = getattr(self.context, "summary_history", None)
+        new_ctx = self._contexts.get(new_key)
+        if new_ctx is None:
+            # Carries over the system prompt, workspace summary and any
+            # conversation summary so the new engine still has access to
+            # compressed history.
+            new_ctx = ContextManager.clone_metadata(self.context)
             self._contexts[new_key] = new_ctx
-            self.context = new_ctx
+        self._ctx_slot[0] = new_ctx
 
         # Activate new engine
         self.provider = provider
@@ -3443,14 +4227,13 @@ Please provide edit instructions."""
         self._contexts[self._engine_key] = self.context
 
         # Restore previous context if we have one; otherwise create a fresh one.
-        if target_key in self._contexts:
-            self.context = self._contexts[target_key]
-        else:
-            ctx = ContextManager()
-            ctx.system_prompt = self.context.system_prompt
-            ctx.workspace_summary = self.context.workspace_summary
+        ctx = self._contexts.get(target_key)
+        if ctx is None:
+            ctx = ContextManager.clone_metadata(
+                self.context, ("system_prompt", "workspace_summary")
+            )
             self._contexts[target_key] = ctx
-            self.context = ctx
+        self._ctx_slot[0] = ctx
 
         self.provider = provider
         self.model = model_name
@@ -6,6 +6,56 @@ from pathlib import Path
 from typing import Optional, Dict, Any, Union
 
 
+# Host platform, looked up once (platform.system() is not free per call).
+_PLATFORM_NAME = platform.system()
+_IS_WINDOWS = _PLATFORM_NAME == "Windows"
+
+# Commands treated as destructive by CommandNormalizer.is_destructive.
+_DESTRUCTIVE_KEYWORDS = frozenset({
+    "rm",
+    "del",
+    "erase",
+    "mv",
+    "move",
+    "cp",
+    "copy",
+})
+
+# Command translation tables for _translate_for_platform.
+_POSIX_TO_CMD = {
+    "ls": "dir",
+    "rm": "del",
+    "cp": "copy",
+    "mv": "move",
+    "cat": "type",
+    "grep": "findstr",
+    "pwd": "cd",
+    "touch": "type nul >",
+    "clear": "cls",
+}
+
+_POSIX_TO_PS = {
+    "ls": "Get-ChildItem",
+    "rm": "Remove-Item",
+    "cp": "Copy-Item",
+    "mv": "Move-Item",
+    "cat": "Get-Content",
+    "grep": "Select-String",
+    "pwd": "Get-Location",
+    "touch": "New-Item -ItemType File -Force",
+    "clear": "Clear-Host",
+}
+
+_WIN_TO_POSIX = {
+    "dir": "ls",
+    "del": "rm",
+    "erase": "rm",
+    "copy": "cp",
+    "move": "mv",
+    "type": "cat",
+    "ren": "mv",
+}
+
 class CommandNormalizer:
     """
     Universal Command Engine.
@@ -24,8 +74,12 @@ class CommandNormalizer:
 
     def __init__(self, project_root: Union[str, Path]):
         self.project_root = Path(project_root).resolve()
+        # String forms for the containment check in _is_under_root; joining
+        # with "" adds exactly one trailing separator (even for "/").
+        self._root_str = str(self.project_root)
+        self._root_prefix = os.path.join(self._root_str, "")
 
-        self.blocked_commands = {
+        self.blocked_commands = frozenset({
             "format",
             "mkfs",
             "fdisk",
@@ -33,7 +87,7 @@ class CommandNormalizer:
             "shutdown",
             "reboot",
             ":(){ :|:& };:",
-        }
+        })
 
         self.dangerous_patterns = [
             re.compile(r"rm\s+-rf\s+/$"),      # root nuke
@@ -41,6 +95,14 @@ class CommandNormalizer:
             re.compile(r"rm\s+-rf\s+\.\."),    # parent directory nuke
             re.compile(r">\s*/dev/sd[a-z]"),   # device write
         ]
+        # All of the above as one alternation, so a command is scanned once.
+        self._danger_re = re.compile(
+            "|".join(f"(?:{p.pattern})" for p in self.dangerous_patterns)
+        )
+
+        # Edit-intent pattern (see _detect_edit_intent), checked on every
+        # command. Group 2 is the redirect: ">" rewrites, ">>" appends.
+        self._echo_re = re.compile(r'^echo\s+[\'"](.*)[\'"]\s*(>>?)\s*(.+)$', re.DOTALL)
 
     # ---------------------------------------------------------- #
     #   PUBLIC API
@@ -65,7 +127,7 @@ class CommandNormalizer:
             return ""
 
         if target_platform == "auto":
-            target_platform = platform.system()
+            target_platform = _PLATFORM_NAME
 
         if cwd is None:
             cwd_path = self.project_root
@@ -78,7 +140,7 @@ class CommandNormalizer:
             return edit_intent
 
         # 2) Security checks always active
-        self._check_safety(command)
+        self._check_safety(command, self._base_command(command))
 
         # 3) Path normalization
         safe_command = self._normalize_paths(
@@ -94,23 +156,11 @@ class CommandNormalizer:
         return final_command
 
     def is_destructive(self, command: str) -> bool:
-        cmd_parts = command.split()
-        if not cmd_parts:
+        base_cmd = self._base_command(command)
+        if not base_cmd:
             return False
 
-        base_cmd = cmd_parts[0].lower()
-
-        destructive_keywords = {
-            "rm",
-            "del",
-            "erase",
-            "mv",
-            "move",
-            "cp",
-            "copy",
-        }
-
-        if base_cmd in destructive_keywords:
+        if base_cmd in _DESTRUCTIVE_KEYWORDS:
             return True
 
         if ">" in command and ">>" not in command:
@@ -122,23 +172,27 @@ class CommandNormalizer:
     #   SAFETY
     # ---------------------------------------------------------- #
 
-    def _check_safety(self, command: str):
-        parts = command.split()
-        if not parts:
-            return
+    @staticmethod
+    def _base_command(command: str) -> str:
+        """Lower-cased first token of `command` ("" if there is none)."""
+        head = command.split(None, 1)
+        return head[0].lower() if head else ""
 
-        base_cmd = parts[0].lower()
+    def _check_safety(self, command: str, base_cmd: Optional[str] = None):
+        if base_cmd is None:
+            base_cmd = self._base_command(command)
+        if not base_cmd:
+            return
 
         if base_cmd in self.blocked_commands:
             raise ValueError(
                 f"Security Violation: Command '{base_cmd}' is strictly blocked."
             )
 
-        for pattern in self.dangerous_patterns:
-            if pattern.search(command):
-                raise ValueError(
-                    f"Security Violation: Dangerous pattern detected in '{command}'"
-                )
+        if self._danger_re.search(command):
+            raise ValueError(
+                f"Security Violation: Dangerous pattern detected in '{command}'"
+            )
 
     # ---------------------------------------------------------- #
     #   EDIT INTENT DETECTION (AI only)
@@ -156,32 +210,18 @@ class CommandNormalizer:
         If file is outside project_root → intent = None (let the shell handle it)
         """
 
-        # echo "..." > file
-        write_match = re.match(
-            r'^echo\s+[\'"](.*)[\'"]\s*>\s*(.+)$', command, re.DOTALL
-        )
-        if write_match:
-            content, filepath = write_match.groups()
-            filepath = filepath.strip()
-            if self._is_path_safe(filepath, cwd):
-                rel_path = self._rel_to_root(filepath, cwd)
-                return {
-                    "type": "intent_rewrite_file",
-                    "path": rel_path,
-                    "content": content,
-                }
+        # Cheap gate: almost every command is not an echo redirect.
+        if not command.startswith("echo") or ">" not in command:
+            return None
 
-        # echo "..." >> file
-        append_match = re.match(
-            r'^echo\s+[\'"](.*)[\'"]\s*>>\s*(.+)$', command, re.DOTALL
-        )
-        if append_match:
-            content, filepath = append_match.groups()
-            filepath = filepath.strip()
-            if self._is_path_safe(filepath, cwd):
-                rel_path = self._rel_to_root(filepath, cwd)
+        match = self._echo_re.match(command)
+        if match:
+            content, redirect, filepath = match.groups()
+            target = self._sandboxed_target(filepath.strip(), cwd)
+            if target is not None:
+                rel_path = self._root_relative(target)
                 return {
-                    "type": "intent_append_file",
+                    "type": "intent_append_file" if redirect == ">>" else "intent_rewrite_file",
                     "path": rel_path,
                     "content": content,
                 }
@@ -205,9 +245,7 @@ class CommandNormalizer:
             Any path that resolves outside project_root → error
         """
 
-        is_windows = platform.system() == "Windows"
-
-        if is_windows:
+        if _IS_WINDOWS:
             parts = command.split()
         else:
             parts = shlex.split(command, posix=True)
@@ -218,38 +256,65 @@ class CommandNormalizer:
 
         new_parts = []
         for part in parts:
-            if "/" in part or "\\" in part or part.startswith("."):
-                try:
-                    potential_path = (cwd / part).resolve()
-
-                    if not self._is_under_root(potential_path):
-                        raise ValueError(
-                            f"Path Sandbox Violation: {part} resolves to {potential_path}"
-                        )
-
-                    new_parts.append(part)
-                except OSError:
-                    new_parts.append(part)
-            else:
-                new_parts.append(part)
+            if "://" in part:
+                # URLs are not paths; skip the resolve() stat walk.
+                pass
+            elif part.startswith("-"):
+                # Bare flags (no separators, no "..") skip the stat walk;
+                # otherwise check the token as before, plus the value of
+                # --opt=value / -Xvalue, which is where a path would be.
+                if "/" in part or "\\" in part or ".." in part:
+                    self._check_sandboxed(part, part, cwd)
+                    value = (
+                        part.partition("=")[2]
+                        if part.startswith("--")
+                        else part[2:]
+                    )
+                    if value:
+                        self._check_sandboxed(value, part, cwd)
+            elif "/" in part or "\\" in part or part.startswith("."):
+                self._check_sandboxed(part, part, cwd)
+            new_parts.append(part)
 
         return " ".join(new_parts)
 
-    def _is_under_root(self, path: Path) -> bool:
+    def _check_sandboxed(self, candidate: str, part: str, cwd: Path) -> None:
+        """Raise if `candidate` (from token `part`) resolves outside project_root."""
         try:
-            path = path.resolve()
-        except Exception:
-            return False
+            potential_path = (cwd / candidate).resolve()
+        except OSError:
+            return
+        if not self._is_under_root(potential_path):
+            raise ValueError(
+                f"Path Sandbox Violation: {part} resolves to {potential_path}"
+            )
 
-        root = self.project_root
-        return root == path or root in path.parents
+    def _is_under_root(self, path: Path) -> bool:
+        """`path` must already be resolved (every caller resolves it)."""
+        s = str(path)
+        return s == self._root_str or s.startswith(self._root_prefix)
 
-    def _is_path_safe(self, filepath: str, cwd: Path) -> bool:
+    def _root_relative(self, path: Path) -> str:
+        """
+        POSIX-style path of `path` relative to project_root, by slicing off
+        the cached root prefix (`path` must be resolved and under the root).
+        """
+        s = str(path)
+        if s == self._root_str:
+            return "."
+        rel = s[len(self._root_prefix):]
+        return rel if os.sep == "/" else rel.replace(os.sep, "/")
+
+    def _sandboxed_target(self, filepath: str, cwd: Path) -> Optional[Path]:
+        """Resolve `filepath` once; None if it fails or leaves project_root."""
         try:
             target = (cwd / filepath).resolve()
-            return self._is_under_root(target)
         except Exception:
-            return False
+            return None
+        return target if self._is_under_root(target) else None
+
+    def _is_path_safe(self, filepath: str, cwd: Path) -> bool:
+        return self._sandboxed_target(filepath, cwd) is not None
 
     def _rel_to_root(self, filepath: str, cwd: Path) -> str:
         target = (cwd / filepath).resolve()
@@ -257,7 +322,7 @@ class CommandNormalizer:
             raise ValueError(
                 f"Path Sandbox Violation: {filepath} -> {target} outside project root"
             )
-        return target.relative_to(self.project_root).as_posix()
+        return self._root_relative(target)
 
     # ---------------------------------------------------------- #
     #   OS TRANSLATION
@@ -276,34 +341,10 @@ class CommandNormalizer:
         cmd = parts[0]
         args = parts[1:]
 
-        is_windows = target_platform == "Windows"
-
-        posix_to_win = {
-            "ls": "dir" if shell == "cmd" else "Get-ChildItem",
-            "rm": "del" if shell == "cmd" else "Remove-Item",
-            "cp": "copy" if shell == "cmd" else "Copy-Item",
-            "mv": "move" if shell == "cmd" else "Move-Item",
-            "cat": "type" if shell == "cmd" else "Get-Content",
-            "grep": "findstr" if shell == "cmd" else "Select-String",
-            "pwd": "cd" if shell == "cmd" else "Get-Location",
-            "touch": "type nul >" if shell == "cmd" else "New-Item -ItemType File -Force",
-            "clear": "cls" if shell == "cmd" else "Clear-Host",
-        }
-
-        win_to_posix = {
-            "dir": "ls",
-            "del": "rm",
-            "erase": "rm",
-            "copy": "cp",
-            "move": "mv",
-            "type": "cat",
-            "ren": "mv",
-        }
-
-        if is_windows:
-            if cmd in posix_to_win:
-                translated = posix_to_win[cmd]
-
+        if target_platform == "Windows":
+            table = _POSIX_TO_CMD if shell == "cmd" else _POSIX_TO_PS
+            translated = table.get(cmd)
+            if translated is not None:
                 # rm -rf
                 if cmd == "rm" and ("-rf" in args or "-r" in args):
                     if shell == "cmd":
@@ -315,14 +356,11 @@ class CommandNormalizer:
                             [a for a in args if not a.startswith("-")]
                         )
 
-                if cmd == "touch" and shell == "cmd":
-                    return f"{translated} {' '.join(args)}"
-
                 return f"{translated} {' '.join(args)}"
 
         else:
-            if cmd.lower() in win_to_posix:
-                translated = win_to_posix[cmd.lower()]
+            translated = _WIN_TO_POSIX.get(cmd.lower())
+            if translated is not None:
                 return f"{translated} {' '.join(args)}"
 
         return command
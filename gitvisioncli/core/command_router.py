@@ -47,20 +47,9 @@ class CommandRouter:
             ShellHandlerCategory(),
         ]
         
-        category_names = {
-            FileHandlerCategory: "file",
-            GitHandlerCategory: "git",
-            GitHubHandlerCategory: "github",
-            FolderHandlerCategory: "folder",
-            SearchHandlerCategory: "search",
-            ShellHandlerCategory: "shell",
-        }
-        
         for category in categories:
-            category_name = category_names.get(type(category), "unknown")
-            handlers = category.get_handlers()
-            for handler in handlers:
-                self.registry.register(handler, category_name)
+            for handler in category.get_handlers():
+                self.registry.register(handler, category.CATEGORY_NAME)
     
     def route(
         self,
@@ -85,18 +74,11 @@ class CommandRouter:
         if active_file:
             context["active_file"] = active_file.path if isinstance(active_file, str) else active_file.path
         
-        # Try to find best handler
-        # Pass full_message to handlers for multiline content extraction
+        # Try to find best handler. The manager already hands the full
+        # message to each handler for multiline content extraction, so a
+        # second pass with the same inputs could not change the result.
         result = self.manager.find_best_handler(user_message, context)
         
-        if result and result.success:
-            # If handler didn't get full_message, try parsing again with it
-            if "\n" in user_message and result.params and not any(
-                result.params.get(k) for k in ["content", "text", "block"] if result.params.get(k)
-            ):
-                # Retry with full message for content extraction
-                result = self.manager.find_best_handler(user_message, context)
-        
         if result and result.success:
             return ActionJSON(
                 type=result.action_type,
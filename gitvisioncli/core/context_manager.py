@@ -5,7 +5,8 @@ and dynamic workspace context.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+import sys
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
@@ -14,7 +15,13 @@ logger = logging.getLogger(__name__)
 # Internal message model
 # ----------------------------------------------------------------------
 
-@dataclass
+# Long chats hold thousands of messages; slots drop the per-instance
+# __dict__. dataclass(slots=...) needs 3.10+, and a hand-written __slots__
+# would clash with the field defaults, so older interpreters go without.
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class Message:
     """
     Internal representation of a chat message.
@@ -45,11 +52,84 @@ class ContextManager:
     active_file_path: Optional[str] = None
     active_file_content: Optional[str] = None
 
+    # Monotonic counter bumped on every mutation, so callers can cheaply
+    # tell whether anything changed between two points in a turn.
+    version: int = field(default=0, init=False, repr=False, compare=False)
+
+    # "ROLE: content" rendering of each message, kept index-aligned with
+    # `messages` and extended as messages arrive (used for summaries).
+    _transcript_lines: List[str] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+
+    # Running character count of message contents, valid for the first
+    # `_chars_counted` messages (-1 forces a recount).
+    _total_chars: int = field(default=0, init=False, repr=False, compare=False)
+    _chars_counted: int = field(default=0, init=False, repr=False, compare=False)
+
+    # Rendered system content, dropped whenever one of _SYSTEM_FIELDS is set.
+    _system_content: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # (version, len(messages), dicts) from the last get_openai_messages();
+    # any mutation bumps `version` or changes the length, invalidating it.
+    _openai_cache: Optional[Tuple[int, int, List[Dict[str, Any]]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # Engine-independent state carried over when a new engine context is
+    # derived from the current one (see clone_metadata).
+    _CLONE_KEYS = ("system_prompt", "workspace_summary", "summary_history")
+
+    # Fields that feed _build_system_content.
+    _SYSTEM_FIELDS = frozenset({
+        "system_prompt",
+        "workspace_summary",
+        "summary_history",
+        "active_file_path",
+        "active_file_content",
+    })
+
+    @classmethod
+    def clone_metadata(
+        cls, src: "ContextManager", keys: Sequence[str] = _CLONE_KEYS
+    ) -> "ContextManager":
+        """
+        Create an empty context that shares `src`'s prompt/workspace metadata
+        (by default everything in _CLONE_KEYS) but none of its messages.
+        """
+        dst = cls()
+        dst.__dict__.update({k: getattr(src, k, None) for k in keys})
+        return dst
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "messages":
+            super().__setattr__("_transcript_lines", [])
+            super().__setattr__("_chars_counted", -1)
+        elif name in self._SYSTEM_FIELDS:
+            super().__setattr__("_system_content", None)
+        # Private attributes are derived caches, not state changes.
+        if name != "version" and not name.startswith("_"):
+            super().__setattr__("version", self.__dict__.get("version", 0) + 1)
+
+    def _bump_version(self) -> None:
+        """Record an in-place mutation (e.g. messages.append)."""
+        self.version += 1
+
     def add_message(self, role: str, content: str, **kwargs) -> None:
         """
         Append a new message (user, assistant) to the conversation.
         """
-        self.messages.append(Message(role=role, content=content, **kwargs))
+        msg = Message(role=role, content=content, **kwargs)
+        self.messages.append(msg)
+        if len(self._transcript_lines) == len(self.messages) - 1:
+            self._transcript_lines.append(self._transcript_line(msg))
+        if self._chars_counted == len(self.messages) - 1:
+            self._total_chars += self._content_len(msg)
+            self._chars_counted += 1
+        self._bump_version()
         logger.debug(f"Added message: role={role}, content_len={len(content)}")
 
     def add_tool_result(self, tool_call_id: str, content: str) -> None:
@@ -83,51 +163,109 @@ class ContextManager:
         """
         Convert internal Message objects into OpenAI-style dicts
         for sending to the API.
+
+        The converted dicts are reused until the context changes; callers
+        get a fresh list each time, so appending to it is safe.
         """
+        cached = self._openai_cache
+        if (
+            cached is not None
+            and cached[0] == self.version
+            and cached[1] == len(self.messages)
+        ):
+            return list(cached[2])
+
         msgs: List[Dict[str, Any]] = []
 
         # --- 1. Build the System Prompt ---
-        # Combine the static system prompt with the dynamic workspace context,
-        # active file view, and any summarized history.
-        system_content = self.system_prompt or ""
+        system_content = self._build_system_content()
+        if system_content:
+            msgs.append({"role": "system", "content": system_content})
+
+        # --- 2. Add all other messages (user, assistant, tool) ---
+        for msg in self.messages:
+            m: Dict[str, Any] = {"role": msg.role, "content": msg.content}
+            # Add optional fields only if they exist
+            if msg.name:
+                m["name"] = msg.name
+            if msg.tool_calls:
+                m["tool_calls"] = msg.tool_calls
+            if msg.tool_call_id:
+                m["tool_call_id"] = msg.tool_call_id
+            msgs.append(m)
+
+        self._openai_cache = (self.version, len(self.messages), msgs)
+        return list(msgs)
+
+    def _build_system_content(self) -> str:
+        """
+        Combine the static system prompt with the dynamic workspace context,
+        active file view, and any summarized history.
+
+        The result is cached until one of its source fields is reassigned.
+        """
+        if self._system_content is not None:
+            return self._system_content
+
+        parts: List[str] = [self.system_prompt or ""]
 
         if self.workspace_summary:
-            system_content += (
+            parts.append(
                 "\n\n--- DYNAMIC WORKSPACE CONTEXT ---\n"
                 f"{self.workspace_summary}"
                 "\n--- END WORKSPACE CONTEXT ---"
             )
 
         if self.active_file_path and self.active_file_content:
-            system_content += (
+            parts.append(
                 f"\n\n# ACTIVE FILE\n"
                 f"path: {self.active_file_path}\n"
                 f"content:\n{self.active_file_content}\n"
             )
 
         if self.summary_history:
-            system_content += (
+            parts.append(
                 "\n\n--- SUMMARY OF PREVIOUS CONVERSATION ---\n"
                 f"{self.summary_history}\n"
                 "--- END SUMMARY ---"
             )
 
-        if system_content:
-            msgs.append({"role": "system", "content": system_content})
+        # One join instead of re-copying the growing prompt per section.
+        self._system_content = "".join(parts)
+        return self._system_content
 
-        # --- 2. Add all other messages (user, assistant, tool) ---
-        for msg in self.messages:
-            m: Dict[str, Any] = {"role": msg.role, "content": msg.content}
-            # Add optional fields only if they exist
-            if msg.name:
-                m["name"] = msg.name
-            if msg.tool_calls:
-                m["tool_calls"] = msg.tool_calls
-            if msg.tool_call_id:
-                m["tool_call_id"] = msg.tool_call_id
-            msgs.append(m)
+    @staticmethod
+    def _content_len(msg: Message) -> int:
+        """Character count of a message's content, as sent to providers."""
+        content = getattr(msg, "content", None) or ""
+        return len(str(content))
+
+    @staticmethod
+    def _transcript_line(msg: Message) -> str:
+        """Render one message as a transcript line ("" when it has no content)."""
+        content = getattr(msg, "content", "") or ""
+        if not content:
+            return ""
+        role = (getattr(msg, "role", None) or "user").upper()
+        return f"{role}: {content}"
+
+    def get_transcript_lines(self) -> List[str]:
+        """
+        Return the transcript line for every message, index-aligned with
+        `messages`. Lines are cached as messages are added; the cache is
+        rebuilt only if `messages` was modified directly.
+        """
+        if len(self._transcript_lines) != len(self.messages):
+            self._transcript_lines = [self._transcript_line(m) for m in self.messages]
+        return self._transcript_lines
 
-        return msgs
+    def build_transcript(self, start: int = 0, end: Optional[int] = None) -> str:
+        """
+        Join the non-empty transcript lines for messages[start:end] into a
+        plain "ROLE: content" transcript (no system/workspace context).
+        """
+        lines = self.get_transcript_lines()[start:end]
+        return "\n".join(filter(None, lines))
 
     def estimate_token_usage(self) -> int:
         """
@@ -138,19 +276,15 @@ class ContextManager:
 
         This intentionally ignores provider-specific tokenization
         details and is only used for approximate context budgeting.
+
+        Message characters are kept as a running total, so this does not
+        walk the history unless `messages` was modified directly.
         """
-        messages = self.get_openai_messages()
-        if not messages:
-            return 0
+        if self._chars_counted != len(self.messages):
+            self._total_chars = sum(self._content_len(m) for m in self.messages)
+            self._chars_counted = len(self.messages)
 
-        total_chars = 0
-        for m in messages:
-            try:
-                content = m.get("content") or ""
-            except AttributeError:
-                # Defensive: tolerate non-dict entries, though we do not expect them.
-                content = ""
-            total_chars += len(str(content))
+        total_chars = len(self._build_system_content()) + self._total_chars
 
         # Integer rounding is fine for an approximate budget.
         return int(total_chars / 3.5) if total_chars > 0 else 0
@@ -169,6 +303,10 @@ class ContextManager:
         System prompt, workspace summary, and active file context are preserved.
         """
         self.messages.clear()
+        self._transcript_lines.clear()
+        self._total_chars = 0
+        self._chars_counted = 0
+        self._bump_version()
         logger.info("Conversation message history cleared (clear_messages).")
 
     def prune_messages(self, n: int) -> None:
@@ -183,13 +321,34 @@ class ContextManager:
         if not self.messages:
             return
 
-        user_indices = [i for i, m in enumerate(self.messages) if m.role == "user"]
-        if len(user_indices) <= n:
+        # Walk back from the newest message to the Nth-from-last user turn
+        # (the first one we keep) instead of indexing every user message.
+        keep_from = -1
+        seen = 0
+        for i in range(len(self.messages) - 1, -1, -1):
+            if self.messages[i].role == "user":
+                seen += 1
+                if seen == n:
+                    keep_from = i
+                    break
+
+        # Nothing to prune unless an older user turn exists; any() stops at
+        # the first one, normally near the start of the history.
+        if keep_from <= 0 or not any(
+            m.role == "user" for m in self.messages[:keep_from]
+        ):
             return
 
-        # Index of the first user message we want to keep
-        keep_from = user_indices[-n]
+        counted = self._chars_counted == len(self.messages)
+        removed_chars = (
+            sum(self._content_len(m) for m in self.messages[:keep_from])
+            if counted
+            else 0
+        )
         self.messages = self.messages[keep_from:]
+        if counted:
+            self._total_chars -= removed_chars
+            self._chars_counted = len(self.messages)
         logger.info(f"Pruned conversation history to last {n} user turns.")
 
     def get_message_count(self) -> int:
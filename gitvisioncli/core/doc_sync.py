@@ -8,12 +8,203 @@ Updates README.md, COMMANDS.md, QUICKSTART.md, FEATURES.md with new behavior.
 from __future__ import annotations
 
 import logging
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Dict, Any, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+_MARKER_PREFIX = "<!-- Auto-synced on "
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as "YYYY-MM-DDTHH:MM:SSZ" (no datetime import needed)."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+# A whole auto-sync marker line, wherever it sits in the file; group 1 is
+# the timestamp.
+_MARKER_RE = re.compile(
+    r"^[ \t]*" + re.escape(_MARKER_PREFIX) + r"([^\n]*?)(?: -->)?[ \t\r]*(?:\n|\Z)",
+    re.MULTILINE,
+)
+
+# Changes to these files may affect documented behaviour.
+_SOURCE_EXTS = frozenset({".py", ".js", ".ts", ".java", ".go", ".rs", ".cpp", ".c"})
+_CONFIG_FILES = frozenset({"config.json", "pyproject.toml", "package.json", "Cargo.toml"})
+
+# Every suffix a syncing path must end with, packed into one tuple so a
+# single C-level str.endswith rejects most other paths before any
+# basename/splitext work. Necessary, not sufficient (e.g. "myconfig.json").
+_SYNC_TAILS = tuple(_SOURCE_EXTS | _CONFIG_FILES)
+
+@lru_cache(maxsize=4096)
+def _should_sync_path(
+    path: str, doc_suffixes: Tuple[str, ...], doc_basenames: frozenset
+) -> bool:
+    """
+    DocumentationSyncer.should_sync on a path string. The doc tables are
+    part of the key, so classes with different tables never share answers.
+    """
+    if not path.endswith(_SYNC_TAILS):
+        return False
+    # Plain string ops (no PurePath property churn), and cheap set lookups
+    # first; the doc-path check only runs for files that would otherwise
+    # trigger a sync.
+    name = os.path.basename(path)
+    if os.path.splitext(name)[1] in _SOURCE_EXTS or name in _CONFIG_FILES:
+        # Don't sync if we're modifying documentation itself
+        return not (name in doc_basenames and path.endswith(doc_suffixes))
+    return False
+
+
+def _mtime_ns(path: Path) -> int:
+    """st_mtime_ns of `path`, or -1 if it cannot be stat'ed."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return -1
+
+
+# Top-level "## " section headers of a markdown doc.
+_SECTION_RE = re.compile(r"^## +(.+?)[ \t]*$", re.MULTILINE)
+
+
+def _section_key(title: str) -> str:
+    """Normalize a header or category: "📁 **File Operations**" -> "file operations"."""
+    return " ".join(re.findall(r"[a-z0-9]+", title.lower()))
+
+
+def _render_entry(entry: Dict[str, Any]) -> str:
+    """Render a command/feature dict as a "### " markdown block."""
+    lines = [f"### **{entry.get('name', 'Untitled')}**", ""]
+    if entry.get("description"):
+        lines += [str(entry["description"]), ""]
+    examples = entry.get("examples") or entry.get("example") or []
+    if isinstance(examples, str):
+        examples = [examples]
+    if examples:
+        lines += ["```bash", *map(str, examples), "```", ""]
+    return "\n".join(lines)
+
+
+# dataclass(slots=...) needs 3.10+; older interpreters go without.
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
+class SectionNode:
+    """
+    One "## " section of a doc. Re-indexing reuses the existing node for
+    every section whose text did not change, so consumers can skip
+    unchanged sections with an `is` check instead of a deep diff.
+    """
+    key: str
+    title: str
+    text: str
+
+
+class _DocIndex:
+    """
+    Section index of one markdown doc: "## " header key -> (start, end)
+    offsets into `content`, where `end` is the end of the section body
+    (before any trailing `---` rule), plus a SectionNode per section.
+
+    Built with one scan, then kept in step with `content` as blocks are
+    spliced in, so adding an entry does not re-parse the whole file.
+    """
+
+    def __init__(self, content: str, previous: Optional[_DocIndex] = None):
+        self._build(content, previous.nodes if previous is not None else {})
+
+    def _build(self, content: str, previous_nodes: Dict[str, SectionNode]) -> None:
+        self.content = content
+        self.sections: Dict[str, Tuple[int, int]] = {}
+        self.nodes: Dict[str, SectionNode] = {}
+        headers = [(m.start(), m.group(1)) for m in _SECTION_RE.finditer(content)]
+        for i, (start, title) in enumerate(headers):
+            key = _section_key(title)
+            if key in self.sections:
+                continue
+            stop = headers[i + 1][0] if i + 1 < len(headers) else len(content)
+            body = self._body(content, start, stop)
+            self.sections[key] = (start, start + len(body))
+            node = previous_nodes.get(key)
+            if node is None or node.title != title or node.text != body:
+                node = SectionNode(key, title, body)
+            self.nodes[key] = node
+
+    @staticmethod
+    def _body(content: str, start: int, stop: int) -> str:
+        """Section text in content[start:stop], minus trailing space and `---` rule."""
+        body = content[start:stop].rstrip()
+        if body.endswith("\n---"):
+            body = body[:-4].rstrip()
+        return body
+
+    def find(self, category: str) -> Optional[str]:
+        """Key of the section matching `category` exactly, else the first containing it."""
+        key = _section_key(category)
+        if not key:
+            return None
+        if key in self.sections:
+            return key
+        return next((k for k in self.sections if key in k), None)
+
+    def insertion_point(self, key: Optional[str]) -> int:
+        """Offset where splice() inserts into section `key` (None: end of file)."""
+        if key is not None:
+            return self.sections[key][1]
+        return len(self.content.rstrip())
+
+    def splice(self, key: Optional[str], block: str) -> str:
+        """
+        Insert `block` at the end of section `key` (end of file if None),
+        update the offsets, and return the new content.
+        """
+        content = self.content
+        at = self.insertion_point(key)
+        text = ("\n\n" if at else "") + block.rstrip("\n")
+        new_content = content[:at] + text + content[at:]
+
+        if _SECTION_RE.search(text):
+            # The block brings its own "## " header: re-index from scratch.
+            self._build(new_content, self.nodes)
+            return new_content
+
+        n = len(text)
+        self.sections = {
+            k: (s + n if s >= at else s, e + n if (e > at or k == key) else e)
+            for k, (s, e) in self.sections.items()
+        }
+        self.content = new_content
+        if key is None and self.sections:
+            # An end-of-file block joins the section running to EOF (also
+            # past a trailing `---` rule), unless a later duplicate header,
+            # which is not indexed, owns the tail.
+            tail = max(self.sections, key=lambda k: self.sections[k][0])
+            start = self.sections[tail][0]
+            if _SECTION_RE.search(content, start + 1) is None:
+                body = self._body(new_content, start, len(new_content))
+                self.sections[tail] = (start, start + len(body))
+                key = tail
+        if key is not None:
+            # Only the spliced section changed; every other node is kept.
+            s, e = self.sections[key]
+            old = self.nodes[key]
+            self.nodes[key] = SectionNode(key, old.title, new_content[s:e])
+        return new_content
+
 
 class DocumentationSyncer:
     """
@@ -29,9 +220,196 @@ class DocumentationSyncer:
         "docs/QUICKSTART.md",
         "docs/FEATURES.md",
     ]
+
+    # Passed straight to str.endswith, which accepts a tuple of suffixes.
+    _DOC_SUFFIXES = tuple(DOC_FILES)
+    # Final components of DOC_FILES: one hash probe rules out almost every
+    # path before the suffix check is needed.
+    _DOC_BASENAMES = frozenset(os.path.basename(doc) for doc in DOC_FILES)
+
+    # Quiet period before a scheduled sync runs (see schedule_sync).
+    SYNC_DEBOUNCE_SECONDS = 0.5
+
+    __slots__ = (
+        "base_dir",
+        "_commands_path",
+        "_features_path",
+        "_changelog_path",
+        "_resolved_docs",
+        "_docs_stamp",
+        "_doc_cache",
+        "_doc_index",
+        "_pending",
+        "_pending_action",
+        "_timer",
+        "_pending_lock",
+        "_flush_lock",
+        "_pool",
+    )
     
     def __init__(self, base_dir: Path):
         self.base_dir = Path(base_dir).resolve()
+        docs_dir = self.base_dir / "docs"
+        self._commands_path = docs_dir / "COMMANDS.md"
+        self._features_path = docs_dir / "FEATURES.md"
+        # One "timestamp|doc|section" line per entry update (see _append_changelog).
+        self._changelog_path = docs_dir / ".sync_changelog"
+        # Resolved DOC_FILES that exist, and the directory mtimes they were
+        # found under (see _get_doc_paths).
+        self._resolved_docs: Optional[List[Path]] = None
+        self._docs_stamp: Tuple[int, int] = (-1, -1)
+        # path -> (st_mtime_ns, st_size, content) from the last _read_doc().
+        self._doc_cache: Dict[Path, Tuple[int, int, str]] = {}
+        # path -> section index of the content last read from it.
+        self._doc_index: Dict[Path, _DocIndex] = {}
+
+        # Files gathered by schedule_sync() until the debounce timer fires.
+        self._pending: Dict[Path, None] = {}
+        self._pending_action: Optional[str] = None
+        self._timer: Optional[threading.Timer] = None
+        self._pending_lock = threading.Lock()
+        # Held while a gathered batch is synced, so close() waits for it.
+        self._flush_lock = threading.Lock()
+
+        # Thread pool for reading the docs concurrently, started on first use.
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _get_doc_paths(self) -> List[Path]:
+        """
+        Return the resolved paths of the DOC_FILES that exist.
+
+        Resolved and stat'ed once, then reused while the mtimes of base_dir
+        and docs/ are unchanged: creating, deleting or renaming a doc
+        changes its directory's mtime, so two stats revalidate the list.
+        It is also dropped when a doc is modified or cannot be read.
+        """
+        stamp = (_mtime_ns(self.base_dir), _mtime_ns(self._commands_path.parent))
+        if self._resolved_docs is None or stamp != self._docs_stamp:
+            docs = (self.base_dir / rel for rel in self.DOC_FILES)
+            self._resolved_docs = [p.resolve() for p in docs if p.is_file()]
+            self._docs_stamp = stamp
+        return self._resolved_docs
+    
+    def _read_doc(self, path: Path) -> str:
+        """
+        Read a doc file as UTF-8, reusing the previous read while its mtime
+        and size are unchanged. OSError/UnicodeDecodeError propagate.
+        """
+        st = path.stat()
+        cached = self._doc_cache.get(path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        content = path.read_text(encoding="utf-8")
+        self._doc_cache[path] = (st.st_mtime_ns, st.st_size, content)
+        return content
+    
+    def _remember(self, path: Path, content: str) -> None:
+        """Record `content` as just written to `path`, so _read_doc reuses it."""
+        st = path.stat()
+        self._doc_cache[path] = (st.st_mtime_ns, st.st_size, content)
+
+    def _read_for_sync(self, path: Path) -> Optional[str]:
+        """_read_doc() that logs and returns None on failure (pool worker)."""
+        try:
+            return self._read_doc(path)
+        except (OSError, UnicodeDecodeError) as e:
+            logger.debug("Doc sync: failed to read %s: %s", path, e)
+            return None
+
+    def _read_all_docs(self) -> List[Tuple[Path, Optional[str]]]:
+        """
+        Read every existing doc file, overlapping the I/O on a thread pool.
+        Content is None for files that could not be read.
+        """
+        paths = self._get_doc_paths()
+        if len(paths) < 2:
+            return [(p, self._read_for_sync(p)) for p in paths]
+        if self._pool is None:
+            # Imported here: most syncers never need a pool.
+            from concurrent.futures import ThreadPoolExecutor
+            self._pool = ThreadPoolExecutor(
+                max_workers=len(self.DOC_FILES), thread_name_prefix="doc-sync"
+            )
+        return list(zip(paths, self._pool.map(self._read_for_sync, paths)))
+
+    def close(self) -> None:
+        """
+        Run any sync still waiting on the debounce timer (after one already
+        in progress), then shut down the read pool; a later sync starts a
+        new one.
+        """
+        with self._pending_lock:
+            timer = self._timer
+            self._timer = None
+        if timer is not None:
+            timer.cancel()
+        self._flush()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+    
+    def _get_index(self, path: Path) -> _DocIndex:
+        """Section index for `path`, rebuilt only when its content changed."""
+        content = self._read_doc(path)
+        index = self._doc_index.get(path)
+        # _read_doc hands back the same str while the file is unchanged.
+        if index is None or index.content is not content:
+            index = self._doc_index[path] = _DocIndex(content, previous=index)
+        return index
+
+    def get_sections(self, path: Path) -> Mapping[str, SectionNode]:
+        """
+        "## " sections of the doc at `path`, keyed by normalized header.
+        Sections unchanged since the previous call are the same objects.
+        """
+        return MappingProxyType(self._get_index(path).nodes)
+
+    def _insert_entry(self, path: Path, entry: Dict[str, Any]) -> None:
+        """
+        Splice a rendered entry into the section named by its 'category'
+        (or 'section') key, falling back to the end of the file.
+        """
+        index = self._get_index(path)
+        old_content = index.content
+        size = self._doc_cache[path][1]
+        category = str(entry.get("category") or entry.get("section") or "")
+        section = index.find(category)
+        at = index.insertion_point(section)
+        new_content = index.splice(section, _render_entry(entry))
+
+        if len(old_content.encode("utf-8")) == size:
+            # The text maps byte-for-byte onto the file (no newline
+            # translation), so only rewrite from the insertion point on:
+            # for the usual append to the last section, just the new block.
+            with open(path, "r+b") as fh:
+                fh.seek(size - len(old_content[at:].encode("utf-8")))
+                fh.write(new_content[at:].encode("utf-8"))
+        else:
+            path.write_text(new_content, encoding="utf-8")
+        # The index already matches what we wrote; keep it valid.
+        self._remember(path, new_content)
+        self._append_changelog(path.relative_to(self.base_dir).as_posix(), section or "")
+
+    def _append_changelog(self, doc: str, section: str) -> None:
+        """
+        Append "timestamp|doc|section" to docs/.sync_changelog, so tools
+        can tail what changed instead of diffing every doc. Best effort.
+        """
+        timestamp = _utc_timestamp()
+        line = f"{timestamp}|{doc}|{section}\n".encode("utf-8")
+        try:
+            with open(self._changelog_path, "ab", buffering=0) as fh:
+                fh.write(line)
+        except OSError as e:
+            logger.debug("Doc sync: failed to append changelog: %s", e)
+    
+    def _is_doc_file(self, modified_file: Path) -> bool:
+        """True if `modified_file` is one of DOC_FILES."""
+        path = os.fspath(modified_file)
+        return (
+            os.path.basename(path) in self._DOC_BASENAMES
+            and path.endswith(self._DOC_SUFFIXES)
+        )
     
     def should_sync(self, modified_file: Path) -> bool:
         """
@@ -41,21 +419,11 @@ class DocumentationSyncer:
         - A source code file was modified (not a doc file itself)
         - The change might affect documented behavior
         """
-        # Don't sync if we're modifying documentation itself
-        if any(str(modified_file).endswith(doc) for doc in self.DOC_FILES):
-            return False
-        
-        # Sync if it's a source code file
-        source_extensions = {".py", ".js", ".ts", ".java", ".go", ".rs", ".cpp", ".c"}
-        if modified_file.suffix in source_extensions:
-            return True
-        
-        # Sync if it's a config file that might change behavior
-        config_files = {"config.json", "pyproject.toml", "package.json", "Cargo.toml"}
-        if modified_file.name in config_files:
-            return True
-        
-        return False
+        # The same paths recur across events (repeated saves), so the
+        # decision is memoized on the path string.
+        return _should_sync_path(
+            os.fspath(modified_file), self._DOC_SUFFIXES, self._DOC_BASENAMES
+        )
     
     def sync_documentation(
         self,
@@ -78,105 +446,143 @@ class DocumentationSyncer:
         Returns:
             True if sync was attempted, False if skipped.
         """
-        # Check if any file warrants a sync
-        should_sync = any(self.should_sync(f) for f in modified_files)
-        if not should_sync:
+        # One pass: keep the files that warrant a sync, and note docs being
+        # created or deleted (that changes which doc paths exist).
+        relevant: List[Path] = []
+        for f in modified_files:
+            if self.should_sync(f):
+                relevant.append(f)
+            elif self._is_doc_file(f):
+                self._resolved_docs = None
+        if not relevant:
             return False
 
         try:
             # Log sync trigger with a concise summary for debugging.
             logger.info(
                 "Documentation sync triggered for %d file(s), action=%s",
-                len(modified_files),
+                len(relevant),
                 action_type or "unknown",
             )
 
             # Lightweight, non-destructive auto-sync:
             # append or update a one-line marker in each doc file so that
             # users can see that documentation keeps pace with code changes.
-            timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
-            marker_prefix = "<!-- Auto-synced on "
+            timestamp = _utc_timestamp()
+            marker = f"{_MARKER_PREFIX}{timestamp} -->\n"
 
-            for rel in self.DOC_FILES:
-                doc_path = (self.base_dir / rel).resolve()
-                if not doc_path.exists() or not doc_path.is_file():
+            for doc_path, content in self._read_all_docs():
+                if content is None:
+                    self._resolved_docs = None
                     continue
 
-                try:
-                    content = doc_path.read_text(encoding="utf-8")
-                except Exception as e:
-                    logger.debug(f"Doc sync: failed to read {doc_path}: {e}")
-                    continue
+                # Remove any previous auto-sync marker, then append a fresh one
+                body = _MARKER_RE.sub("", content)
+                if body and not body.endswith("\n"):
+                    body += "\n"
+                new_content = body + marker
 
-                lines = content.splitlines()
-                # Remove any previous auto-sync marker
-                lines = [ln for ln in lines if not ln.strip().startswith(marker_prefix)]
-                # Append fresh marker
-                lines.append(f"{marker_prefix}{timestamp} -->")
+                # Back-to-back syncs within the same second leave the file
+                # unchanged; skip the write (and keep its mtime). `content`
+                # is usually what the last sync wrote, so this costs no read.
+                if new_content == content:
+                    continue
 
                 try:
-                    doc_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
-                    logger.debug(f"Doc sync: updated marker in {doc_path}")
-                except Exception as e:
-                    logger.debug(f"Doc sync: failed to write {doc_path}: {e}")
+                    doc_path.write_text(new_content, encoding="utf-8")
+                    self._remember(doc_path, new_content)
+                    logger.debug("Doc sync: updated marker in %s", doc_path)
+                except OSError as e:
+                    logger.debug("Doc sync: failed to write %s: %s", doc_path, e)
 
             return True
         except Exception as e:
             logger.warning(f"Documentation sync failed: {e}")
             return False
     
+    def schedule_sync(
+        self,
+        modified_files: List[Path],
+        action_type: Optional[str] = None,
+    ) -> None:
+        """
+        Debounced sync_documentation(): gather `modified_files` and run one
+        sync once no new changes have arrived for SYNC_DEBOUNCE_SECONDS.
+
+        A burst of file changes (one call per action or watcher event)
+        therefore costs a single pass; the last action_type wins.
+        """
+        with self._pending_lock:
+            self._pending.update(dict.fromkeys(modified_files))
+            self._pending_action = action_type
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.SYNC_DEBOUNCE_SECONDS, self._flush)
+            self._timer.start()
+
+    def _flush(self) -> bool:
+        """Run the sync for everything gathered by schedule_sync()."""
+        with self._flush_lock:
+            with self._pending_lock:
+                pending = list(self._pending)
+                action_type = self._pending_action
+                self._pending = {}
+                # Leave a newer timer armed by schedule_sync() in place.
+                if self._timer is threading.current_thread():
+                    self._timer = None
+            if not pending:
+                return False
+            return self.sync_documentation(pending, action_type=action_type)
+    
     def update_commands_doc(self, new_command: Dict[str, Any]) -> bool:
         """
         Update COMMANDS.md with a new command.
         
         Args:
-            new_command: Dict with 'name', 'description', 'example', etc.
+            new_command: Dict with 'name', 'description', 'example', etc.;
+                'category' picks the "## " section it is added to.
         
         Returns:
             True if update succeeded
         """
-        commands_path = self.base_dir / "docs" / "COMMANDS.md"
-        if not commands_path.exists():
+        commands_path = self._commands_path
+        # No separate exists() check: _read_doc's stat() doubles as one and
+        # also keys the read cache.
+        try:
+            self._insert_entry(commands_path, new_command)
+        except FileNotFoundError:
             logger.warning(f"COMMANDS.md not found at {commands_path}")
             return False
-        
-        try:
-            # Read current content
-            content = commands_path.read_text(encoding="utf-8")
-            
-            # TODO: Parse and insert new command in appropriate section
-            # This would require parsing the markdown structure
-            
-            logger.debug(f"Would update COMMANDS.md with: {new_command}")
-            return True
-        except Exception as e:
+        except (OSError, UnicodeDecodeError) as e:
             logger.warning(f"Failed to update COMMANDS.md: {e}")
             return False
+
+        logger.debug("Updated COMMANDS.md with: %s", new_command)
+        return True
     
     def update_features_doc(self, new_feature: Dict[str, Any]) -> bool:
         """
         Update FEATURES.md with a new feature.
         
         Args:
-            new_feature: Dict with 'name', 'description', 'examples', etc.
+            new_feature: Dict with 'name', 'description', 'examples', etc.;
+                'category' picks the "## " section it is added to.
         
         Returns:
             True if update succeeded
         """
-        features_path = self.base_dir / "docs" / "FEATURES.md"
-        if not features_path.exists():
+        features_path = self._features_path
+        # No separate exists() check: _read_doc's stat() doubles as one and
+        # also keys the read cache.
+        try:
+            self._insert_entry(features_path, new_feature)
+        except FileNotFoundError:
             logger.warning(f"FEATURES.md not found at {features_path}")
             return False
-        
-        try:
-            # Read current content
-            content = features_path.read_text(encoding="utf-8")
-            
-            # TODO: Parse and insert new feature in appropriate section
-            
-            logger.debug(f"Would update FEATURES.md with: {new_feature}")
-            return True
-        except Exception as e:
+        except (OSError, UnicodeDecodeError) as e:
             logger.warning(f"Failed to update FEATURES.md: {e}")
             return False
 
+        logger.debug("Updated FEATURES.md with: %s", new_feature)
+        return True
+
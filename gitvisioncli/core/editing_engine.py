@@ -21,13 +21,50 @@ import logging
 import re
 from dataclasses import dataclass, field
 from difflib import SequenceMatcher
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+try:
+    # Optional (the "fast" extra): C++ similarity kernels for fuzzy matching.
+    from rapidfuzz import fuzz as _rf_fuzz, process as _rf_process
+except ImportError:
+    _rf_fuzz = _rf_process = None
+
 
 logger = logging.getLogger(__name__)
 
 
+# Header lines for insert_after_import_section. _IMPORT_RE matches exactly
+# the lines whose strip() starts with "import " or "from ".
+_SHEBANG_OR_CODING_RE = re.compile(r"^#!|coding", re.IGNORECASE)
+_IMPORT_RE = re.compile(r"\s*(?:import|from) \s*\S")
+
+# Compiled patterns are cached so editing ops called in a loop (or with the
+# same pattern/name repeatedly) skip re-formatting and compiling them.
+_compile_pattern = lru_cache(maxsize=512)(re.compile)
+
+
+@lru_cache(maxsize=512)
+def _function_def_res(name: str) -> Tuple[re.Pattern[str], re.Pattern[str]]:
+    """(Python 'def name(', JS 'function name(') line patterns."""
+    escaped = re.escape(name)
+    return (
+        re.compile(rf"^\s*def\s+{escaped}\s*\("),
+        re.compile(rf"^\s*(async\s+)?function\s+{escaped}\s*\(", re.IGNORECASE),
+    )
+
+
+@lru_cache(maxsize=512)
+def _class_def_res(name: str) -> Tuple[re.Pattern[str], re.Pattern[str]]:
+    """(Python, case-insensitive JS) 'class name' line patterns."""
+    escaped = re.escape(name)
+    return (
+        re.compile(rf"^\s*class\s+{escaped}\b"),
+        re.compile(rf"^\s*class\s+{escaped}\b", re.IGNORECASE),
+    )
+
+
 class EditingError(Exception):
     """Base error for editing failures (invalid ranges, missing patterns, etc.)."""
 
@@ -502,7 +539,7 @@ class EditingEngine:
         Raises EditingError if the pattern does not match the content.
         """
         try:
-            regex = re.compile(pattern, flags)
+            regex = _compile_pattern(pattern, flags)
         except re.error as e:
             raise EditingError(f"Invalid regex pattern: {e}") from e
 
@@ -557,11 +594,57 @@ class EditingEngine:
 
         best_idx = -1
         best_score = 0.0
-        for idx, line in enumerate(lines):
-            score = SequenceMatcher(None, line, target).ratio()
-            if score > best_score:
-                best_score = score
-                best_idx = idx
+        # One matcher for the whole scan: `target` (seq2) is indexed
+        # once, and each line only swaps in seq1.
+        matcher = SequenceMatcher(None)
+        matcher.set_seq2(target)
+        if _rf_process is not None:
+            # rapidfuzz's ratio is the Indel similarity 2*LCS/(a+b), an upper
+            # bound on difflib's ratio() (scores on a 0-100 scale). Use it
+            # only to drop lines that cannot reach the threshold; survivors
+            # come back best bound first and are scored with difflib, so the
+            # chosen line matches the pure-Python path.
+            candidates = _rf_process.extract(
+                target,
+                lines,
+                scorer=_rf_fuzz.ratio,
+                processor=None,
+                score_cutoff=threshold * 100,
+                limit=None,
+            )
+            for _, bound, idx in candidates:
+                # Small slack for float rounding of the 0-100 scale.
+                if bound / 100 + 1e-9 < best_score:
+                    break
+                matcher.set_seq1(lines[idx])
+                score = matcher.ratio()
+                # Ties keep the earlier line, as in the scan below.
+                if score > best_score or (score == best_score and idx < best_idx):
+                    best_score = score
+                    best_idx = idx
+        else:
+            target_len = len(target)
+            for idx, line in enumerate(lines):
+                # ratio() can never exceed 2*min/(a+b); skip lines whose
+                # length alone keeps them under the threshold.
+                line_len = len(line)
+                if 2 * min(line_len, target_len) < threshold * (line_len + target_len):
+                    continue
+                matcher.set_seq1(line)
+                # Only run the full ratio() when the cheap upper bounds say
+                # this line could still reach the threshold and beat the
+                # best so far (ties keep the earlier line).
+                if matcher.real_quick_ratio() <= best_score:
+                    continue
+                bound = matcher.quick_ratio()
+                if bound < threshold or bound <= best_score:
+                    continue
+                score = matcher.ratio()
+                if score > best_score:
+                    best_score = score
+                    best_idx = idx
+                    if score == 1.0:
+                        break
 
         if best_idx == -1 or best_score < threshold:
             raise EditingError(
@@ -594,14 +677,12 @@ class EditingEngine:
         insert_idx = 0
         i = 0
         # Skip shebang / encoding
-        while i < len(lines) and (
-            lines[i].startswith("#!") or "coding" in lines[i].lower()
-        ):
+        while i < len(lines) and _SHEBANG_OR_CODING_RE.search(lines[i]):
             i += 1
 
         # Collect import block
         last_import_idx = -1
-        while i < len(lines) and lines[i].strip().startswith(("import ", "from ")):
+        while i < len(lines) and _IMPORT_RE.match(lines[i]):
             last_import_idx = i
             i += 1
 
@@ -647,10 +728,7 @@ class EditingEngine:
         if not function_name:
             raise EditingError("Function name is required for InsertIntoFunction")
 
-        py_def = re.compile(rf"^\s*def\s+{re.escape(function_name)}\s*\(")
-        js_def = re.compile(
-            rf"^\s*(async\s+)?function\s+{re.escape(function_name)}\s*\(", re.IGNORECASE
-        )
+        py_def, js_def = _function_def_res(function_name)
 
         matches = [i for i, ln in enumerate(lines) if py_def.search(ln) or js_def.search(ln)]
         if not matches:
@@ -797,8 +875,7 @@ class EditingEngine:
         if not class_name:
             raise EditingError("Class name is required for InsertIntoClass")
 
-        py_cls = re.compile(rf"^\s*class\s+{re.escape(class_name)}\b")
-        js_cls = re.compile(rf"^\s*class\s+{re.escape(class_name)}\b", re.IGNORECASE)
+        py_cls, js_cls = _class_def_res(class_name)
 
         matches = [i for i, ln in enumerate(lines) if py_cls.search(ln) or js_cls.search(ln)]
         if not matches:
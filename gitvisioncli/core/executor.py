@@ -11,10 +11,11 @@ types of actions:
     'GitHubCreateRepo') which are passed directly to the ActionSupervisor.
 """
 
+import functools
 import logging
 import shutil
 import subprocess
-from typing import Dict, Any, List, Optional, Tuple, Set, Union
+from typing import Callable, Dict, Any, List, Optional, Tuple, Set, Union
 from pathlib import Path
 
 from gitvisioncli.core.supervisor import (
@@ -118,6 +119,10 @@ def normalize_action_content(action: Dict[str, Any]) -> str:
     )
 
 
+def _no_side_effects() -> None:
+    """Side-effect callable for actions that changed nothing (see dispatch_action)."""
+
+
 # ---------------------------
 # Executor
 # ---------------------------
@@ -136,10 +141,18 @@ class AIActionExecutor:
     ):
         # base_dir here starts as the Project Root.
         # It will update as we 'cd' around, representing the USER'S CURRENT VIEW.
+        # base_dir_version is bumped on every change so callers can cache
+        # values derived from it.
+        self.base_dir_version = 0
         self.base_dir = Path(base_dir).resolve()
         self.dry_run = dry_run
         self.fs_watcher = None
 
+        # DocumentationSyncer for the current base_dir (rebuilt on cd), so
+        # its cached doc paths survive across actions.
+        self._doc_syncer = None
+        self._doc_syncer_version = -1
+
         # --- PHASE 1 UPDATE: Initialize Central Terminal Engine ---
         # NOTE: patch_engine will be wired after Supervisor is created.
         self.terminal = TerminalEngine(self.base_dir)
@@ -360,6 +373,111 @@ class AIActionExecutor:
         It checks for special executor actions first, then passes
         all other actions to the ActionSupervisor.
         """
+        result, atype = self._dispatch_action(action, context)
+        if atype is not None:
+            self._notify_changes("ai_modify", result.modified_files, atype.value)
+        return result
+
+    def dispatch_action(
+        self,
+        action: Dict[str, Any],
+        context: Optional[ActionContext] = None,
+    ) -> Tuple[ActionResult, Callable[[], None]]:
+        """
+        Run a single action without its UI/doc side effects and return the
+        result plus a callable that applies them. Callers running actions
+        on worker threads apply the side effects on their own thread, in
+        call order (see ChatEngine._iter_tool_results).
+        """
+        result, atype = self._dispatch_action(action, context)
+        if atype is None:
+            return result, _no_side_effects
+        return result, functools.partial(
+            self._notify_changes, "ai_modify", result.modified_files, atype.value
+        )
+
+    # ---------------------------------------------------------------
+    # RUN SEVERAL ACTIONS (per-action results, shared side effects)
+    # ---------------------------------------------------------------
+    def run_action_batch(
+        self,
+        actions: List[Dict[str, Any]],
+        context: Optional[ActionContext] = None,
+    ) -> List[ActionResult]:
+        """
+        Run several actions in order and return one ActionResult per action.
+
+        Unlike run_plan(), a failing action does not stop the batch and every
+        action keeps its own result. Adjacent actions that target the same
+        path share a single FSWatcher refresh and documentation sync, so a
+        multi-edit reply ("insert X on line 3 and line 10") pays for those
+        side effects once per file instead of once per edit.
+        """
+        if context is None:
+            context = ActionContext(dry_run=self.dry_run)
+
+        results: List[ActionResult] = []
+        group_path: Optional[str] = None
+        group_type: Optional[str] = None
+        group_files: List[str] = []
+
+        for action in actions:
+            path = (action.get("params") or {}).get("path")
+            if group_type is not None and path != group_path:
+                self._notify_changes("ai_batch_modify", group_files, group_type)
+                group_type = None
+                group_files = []
+
+            result, atype = self._dispatch_action(action, context)
+            results.append(result)
+
+            if atype is not None:
+                group_path = path
+                group_type = atype.value
+                group_files.extend(result.modified_files or [])
+
+        if group_type is not None:
+            self._notify_changes("ai_batch_modify", group_files, group_type)
+
+        return results
+
+    def _notify_changes(
+        self,
+        trigger: str,
+        modified_files: Optional[List[str]],
+        action_type: Optional[str],
+    ) -> None:
+        """Refresh the UI and sync documentation after supervisor actions."""
+        # ---- NEW: Force FSWatcher to refresh Editor panel ----
+        if self.fs_watcher:
+            self.fs_watcher.manual_trigger(trigger)
+
+        # ---- NEW: Sync documentation after file changes ----
+        if modified_files:
+            try:
+                if self._doc_syncer_version != self.base_dir_version:
+                    from gitvisioncli.core.doc_sync import DocumentationSyncer
+                    if self._doc_syncer is not None:
+                        self._doc_syncer.close()
+                    self._doc_syncer = DocumentationSyncer(self.base_dir)
+                    self._doc_syncer_version = self.base_dir_version
+                doc_syncer = self._doc_syncer
+                modified_paths = [Path(f) for f in modified_files]
+                doc_syncer.schedule_sync(modified_paths, action_type=action_type)
+            except Exception as e:
+                logger.debug(f"Documentation sync failed (non-fatal): {e}")
+
+    def _dispatch_action(
+        self,
+        action: Dict[str, Any],
+        context: Optional[ActionContext] = None,
+    ) -> Tuple[ActionResult, Optional[ActionType]]:
+        """
+        Execute a single action without UI/doc side effects.
+
+        Returns the result plus the canonical ActionType when the action
+        reached the supervisor (None for special or rejected actions).
+        """
         if context is None:
             context = ActionContext(dry_run=self.dry_run)
         else:
@@ -378,7 +496,7 @@ class AIActionExecutor:
             return ActionResult(
                 status=ActionStatus.FAILURE,
                 message="Action 'type' is missing",
-            )
+            ), None
 
         raw_type = action.get("type", "").lower()
         params = action.get("params", {}) or {}
@@ -414,22 +532,22 @@ class AIActionExecutor:
                 return ActionResult(
                     status=ActionStatus.FAILURE,
                     message="Missing 'path' for ChangeDirectory",
-                )
-            return self._change_directory(params["path"])
+                ), None
+            return self._change_directory(params["path"]), None
 
         if raw_type == "navigateback":
-            return self._navigate_back()
+            return self._navigate_back(), None
 
         if raw_type == "openeditor":
             if "path" not in params:
                 return ActionResult(
                     status=ActionStatus.FAILURE,
                     message="Missing 'path' for OpenEditor",
-                )
+                ), None
             return self._open_editor(
                 file_path=params["path"],
                 editor=params.get("editor", "nano"),
-            )
+            ), None
 
         if raw_type == "openfile":
             # OpenFile is handled by the CLI to open in internal editor panel
@@ -438,7 +556,7 @@ class AIActionExecutor:
                 return ActionResult(
                     status=ActionStatus.FAILURE,
                     message="Missing 'path' for OpenFile",
-                )
+                ), None
             
             # Resolve path relative to current view (self.base_dir)
             full_path = (self.base_dir / params["path"]).resolve()
@@ -450,7 +568,7 @@ class AIActionExecutor:
                     status=ActionStatus.FAILURE,
                     message="Invalid file path",
                     error=error,
-                )
+                ), None
             
             # Check if file exists
             if not full_path.exists():
@@ -458,7 +576,7 @@ class AIActionExecutor:
                     status=ActionStatus.FAILURE,
                     message=f"File not found: {params['path']}",
                     error="File does not exist",
-                )
+                ), None
             
             # Check if it's actually a file (not a directory)
             if not full_path.is_file():
@@ -466,14 +584,14 @@ class AIActionExecutor:
                     status=ActionStatus.FAILURE,
                     message=f"Path is a directory, not a file: {params['path']}",
                     error="Cannot open a directory",
-                )
+                ), None
             
             # Return success with file path for CLI to handle
             return ActionResult(
                 status=ActionStatus.SUCCESS,
                 message=f"File ready to open: {params['path']}",
                 data={"path": str(full_path), "relative_path": params["path"]},
-            )
+            ), None
 
         # --- 2. Normalize type and perform path resolution for Supervisor actions ---
 
@@ -482,7 +600,7 @@ class AIActionExecutor:
             return ActionResult(
                 status=ActionStatus.FAILURE,
                 message=f"Unknown or unhandled action type: {action.get('type')}",
-            )
+            ), None
 
         # For create-like actions, paths MUST be resolved relative to the
         # user's current working directory (Executor.base_dir / TerminalEngine.cwd)
@@ -530,23 +648,7 @@ class AIActionExecutor:
         action["type"] = atype.value
 
         # Pass the validated, normalized action to the supervisor
-        result = self.supervisor.handle_ai_action(action, context)
-
-        # ---- NEW: Force FSWatcher to refresh Editor panel ----
-        if self.fs_watcher:
-            self.fs_watcher.manual_trigger("ai_modify")
-
-        # ---- NEW: Sync documentation after file changes ----
-        if result.modified_files:
-            try:
-                from gitvisioncli.core.doc_sync import DocumentationSyncer
-                doc_syncer = DocumentationSyncer(self.base_dir)
-                modified_paths = [Path(f) for f in result.modified_files]
-                doc_syncer.sync_documentation(modified_paths, action_type=atype.value if atype else None)
-            except Exception as e:
-                logger.debug(f"Documentation sync failed (non-fatal): {e}")
-
-        return result
+        return self.supervisor.handle_ai_action(action, context), atype
 
     # ---------------------------------------------------------------
     # MULTI-ACTION PLAN (atomic/batch)
@@ -613,6 +715,15 @@ class AIActionExecutor:
     def is_dry_run(self) -> bool:
         return self.dry_run
 
+    @property
+    def base_dir(self) -> Path:
+        return self._base_dir
+
+    @base_dir.setter
+    def base_dir(self, value: Path) -> None:
+        self._base_dir = value
+        self.base_dir_version += 1
+
     def get_base_dir(self) -> Path:
         return self.base_dir
 
@@ -25,6 +25,8 @@ class FileHandlerCategory:
     Organizes and manages file-related handlers.
     """
     
+    CATEGORY_NAME = "file"
+
     def __init__(self):
         """Initialize the file handler category."""
         self.handlers = [
@@ -12,6 +12,8 @@ from gitvisioncli.core.handlers.base import BaseHandler, HandlerResult, HandlerP
 class GitHandlerCategory:
     """Category manager for all Git operation handlers."""
     
+    CATEGORY_NAME = "git"
+
     def __init__(self):
         """Initialize the Git handler category."""
         self.handlers = [
@@ -12,6 +12,8 @@ from gitvisioncli.core.handlers.base import BaseHandler, HandlerResult, HandlerP
 class GitHubHandlerCategory:
     """Category manager for all GitHub operation handlers."""
     
+    CATEGORY_NAME = "github"
+
     def __init__(self):
         """Initialize the GitHub handler category."""
         self.handlers = [
@@ -294,6 +296,8 @@ class GitHubCreatePRHandler(BaseHandler):
 class FolderHandlerCategory:
     """Category manager for folder operation handlers."""
     
+    CATEGORY_NAME = "folder"
+
     def __init__(self):
         self.handlers = []
     
@@ -304,6 +308,8 @@ class FolderHandlerCategory:
 class SearchHandlerCategory:
     """Category manager for search operation handlers."""
     
+    CATEGORY_NAME = "search"
+
     def __init__(self):
         self.handlers = []
     
@@ -314,6 +320,8 @@ class SearchHandlerCategory:
 class ShellHandlerCategory:
     """Category manager for shell operation handlers."""
     
+    CATEGORY_NAME = "shell"
+
     def __init__(self):
         self.handlers = []
     
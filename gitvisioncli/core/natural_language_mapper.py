@@ -12,7 +12,7 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 
 @dataclass
@@ -46,10 +46,25 @@ class FileContext:
 
     - path: absolute or workspace-relative path
     - content: raw text
+    - lines: optional line buffer (e.g. the live editor's list); when set,
+      it is used directly and the text is only joined if a handler needs it
     """
 
     path: str
     content: str
+    lines: Optional[Sequence[str]] = None
+
+    def get_lines(self) -> Sequence[str]:
+        """Return the file as lines, reusing `lines` when provided."""
+        if self.lines is not None:
+            return self.lines
+        return self.content.splitlines()
+
+    def get_text(self) -> str:
+        """Return the file as a single string."""
+        if self.lines is not None and not self.content:
+            return "\n".join(self.lines)
+        return self.content
 
 
 @dataclass
@@ -604,7 +619,7 @@ class NaturalLanguageEditMapper:
         unambiguously, we will ask for a clarification instead of
         emitting a destructive edit.
         """
-        lines = file_ctx.content.splitlines()
+        lines = file_ctx.get_lines()
         start_idx = None
         end_idx = None
 
@@ -657,7 +672,7 @@ class NaturalLanguageEditMapper:
         markers themselves. If either marker is missing or ambiguous,
         ask for clarification.
         """
-        content = file_ctx.content
+        content = file_ctx.get_text()
         start_idx = content.find(start_marker)
         end_idx = content.find(end_marker)
 
@@ -873,7 +888,7 @@ class NaturalLanguageEditMapper:
     def map_to_live_edits(
         self,
         instruction: str,
-        file_content: str,
+        file_content: Union[str, Sequence[str]],
         attached_block: Optional[str] = None,
     ) -> List[LiveEditIntent]:
         """
@@ -886,7 +901,8 @@ class NaturalLanguageEditMapper:
         
         Args:
             instruction: Natural language edit instruction
-            file_content: Current file content as string
+            file_content: Current file content, as a string or as a sequence
+                of lines (e.g. EditorPanel.content, used without copying)
             attached_block: Optional code block attached to instruction
         
         Returns:
@@ -902,7 +918,10 @@ class NaturalLanguageEditMapper:
             return []
 
         # Build FileContext for existing pattern matching
-        file_ctx = FileContext(path="<live_edit>", content=file_content)
+        if isinstance(file_content, str):
+            file_ctx = FileContext(path="<live_edit>", content=file_content)
+        else:
+            file_ctx = FileContext(path="<live_edit>", content="", lines=file_content)
 
         # Use existing map_instruction to leverage all pattern matching
         result = self.map_instruction(text, active_file=file_ctx, attached_block=attached_block)
@@ -43,6 +43,9 @@ class ProviderNormalizer:
         """
         if not text:
             return ""
+        # Most replies carry no fences at all; skip the regex passes.
+        if "```" not in text:
+            return text
 
         # Collapse ```jsonc or ```JSON into ```json
         text = re.sub(r"```jsonc", "```json", text, flags=re.IGNORECASE)
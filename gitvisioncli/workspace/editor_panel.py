@@ -14,7 +14,7 @@ Advanced version:
 
 import logging
 from pathlib import Path
-from typing import List, Optional, Callable, Dict
+from typing import Any, List, Optional, Callable, Dict
 import re
 
 from gitvisioncli.ui.colors import (
@@ -143,6 +143,9 @@ class EditorPanel(PanelComponent):
         # External hooks (for UI + panel manager sync)
         self._on_change_callback = on_change_callback
         self._on_modified_callback = on_modified_callback
+        # Set while apply_batch() runs so per-edit notifications collapse
+        # into a single one at the end of the batch.
+        self._notify_suppressed: bool = False
 
         # Simple syntax patterns for colorized render
         self.syntax_patterns: Dict[str, List] = {
@@ -196,6 +199,8 @@ class EditorPanel(PanelComponent):
         Notify owner (e.g., RightPanel) that the buffer content changed.
         This allows the UI to re-render the editor panel on next frame.
         """
+        if self._notify_suppressed:
+            return
         if self._on_change_callback:
             try:
                 self._on_change_callback()
@@ -781,6 +786,55 @@ class EditorPanel(PanelComponent):
         self.apply_line_edit(start_line, end_line, new_lines)
         logger.debug(f"Live edit: replaced range {start_line}-{end_line} with text block")
 
+    def apply_batch(self, intents: List[Any]) -> List[str]:
+        """
+        Apply a sequence of LiveEditIntent objects as one buffer update.
+
+        Each intent goes through the regular live edit methods, but the
+        change listener fires once after the whole batch instead of once
+        per intent. Returns one status message per intent.
+        """
+        results: List[str] = []
+        self._notify_suppressed = True
+        try:
+            for intent in intents:
+                try:
+                    results.append(self._apply_live_intent(intent))
+                except Exception as e:
+                    logger.error(f"Failed to apply live edit intent: {e}")
+                    results.append(f"✗ Edit failed: {e}")
+        finally:
+            self._notify_suppressed = False
+
+        if results:
+            self._notify_change()
+        return results
+
+    def _apply_live_intent(self, intent: Any) -> str:
+        """Apply a single LiveEditIntent and describe what was done."""
+        if intent.type == "delete_range":
+            self.delete_range(intent.start_line, intent.end_line)
+            return f"✓ Deleted lines {intent.start_line}-{intent.end_line}"
+
+        if intent.type == "replace_range":
+            self.replace_range(intent.start_line, intent.end_line, intent.new_text)
+            line_count = intent.new_text.count("\n") + 1
+            return f"✓ Replaced lines {intent.start_line}-{intent.end_line} with {line_count} new lines"
+
+        if intent.type == "insert_after":
+            lines = intent.new_text.split("\n")
+            self.insert_after(intent.start_line, lines)
+            return f"✓ Inserted {len(lines)} lines after line {intent.start_line}"
+
+        if intent.type == "append":
+            lines = intent.new_text.split("\n")
+            self.content.extend(lines)
+            self._set_modified(True)
+            self._notify_change()
+            return f"✓ Appended {len(lines)} lines to end of file"
+
+        return f"✗ Unknown intent type: {intent.type}"
+
     # ------------------------------------------------------------------
     # STREAMING API (FOR LIVE TYPING DURING AI GENERATION)
     # ------------------------------------------------------------------
@@ -14,6 +14,7 @@ These tests mock external providers, network calls, and filesystem effects.
 
 import asyncio
 import json
+import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -64,6 +65,7 @@ class FakeExecutor:
         self.actions: List[Dict[str, Any]] = []
         self.contexts: List[ActionContext] = []
         self.results = list(results) if results is not None else []
+        self.notified: List[str] = []
         self.base_dir = Path("/tmp/gitvision-tests")
         self._dry_run = False
         # Terminal stub used in planning path, but not heavily in these tests.
@@ -81,6 +83,15 @@ class FakeExecutor:
             data={"path": action.get("params", {}).get("path", "test-path")},
         )
 
+    def dispatch_action(self, action: Dict[str, Any], context: Optional[ActionContext] = None):
+        result = self.run_action(action, context)
+        return result, lambda: self.notified.append(action["type"])
+
+    def run_action_batch(
+        self, actions: List[Dict[str, Any]], context: Optional[ActionContext] = None
+    ) -> List[ActionResult]:
+        return [self.run_action(action, context) for action in actions]
+
     def get_base_dir(self) -> Path:
         return self.base_dir
 
@@ -210,6 +221,18 @@ def test_context_manager_prune_messages_when_n_exceeds_user_turns_keeps_all():
     assert ctx.messages == original
 
 
+def test_context_manager_prune_messages_with_exactly_n_user_turns_keeps_leading_messages():
+    ctx = ContextManager()
+    ctx.messages.append(Message(role="assistant", content="welcome"))
+    for i in range(2):
+        ctx.messages.append(Message(role="user", content=f"u{i}"))
+        ctx.messages.append(Message(role="assistant", content=f"a{i}"))
+
+    original = list(ctx.messages)
+    ctx.prune_messages(2)
+    assert ctx.messages == original
+
+
 def test_context_manager_clear_resets_messages_and_summary_but_preserves_system_and_workspace():
     ctx = ContextManager()
     ctx.system_prompt = "SYSTEM"
@@ -236,6 +259,59 @@ def test_estimate_token_usage_uses_character_count_heuristic():
     assert approx <= 10  # sanity upper bound
 
 
+def test_context_manager_version_bumps_on_every_mutation():
+    ctx = ContextManager()
+    v = ctx.version
+
+    ctx.add_message("user", "hi")
+    assert ctx.version > v
+    v = ctx.version
+
+    ctx.set_active_file("a.py", "1: x")
+    assert ctx.version > v
+    v = ctx.version
+
+    ctx.summary_history = "S"
+    assert ctx.version > v
+    v = ctx.version
+
+    ctx.get_openai_messages()
+    ctx.estimate_token_usage()
+    assert ctx.version == v
+
+
+def test_estimate_token_usage_running_total_matches_full_recount():
+    def recount(ctx: ContextManager) -> int:
+        chars = sum(len(str(m.get("content") or "")) for m in ctx.get_openai_messages())
+        return int(chars / 3.5) if chars else 0
+
+    ctx = ContextManager(system_prompt="SYS")
+    for i in range(5):
+        ctx.add_message("user", "u" * (10 * i + 1))
+        ctx.add_message("assistant", "a" * 7)
+    assert ctx.estimate_token_usage() == recount(ctx)
+
+    ctx.prune_messages(2)
+    assert ctx.estimate_token_usage() == recount(ctx)
+
+    ctx.messages.append(Message(role="user", content="x" * 100))
+    assert ctx.estimate_token_usage() == recount(ctx)
+
+
+def test_context_manager_transcript_lines_track_messages():
+    ctx = ContextManager()
+    ctx.add_message("user", "hello")
+    ctx.add_message("assistant", "")
+    assert ctx.get_transcript_lines() == ["USER: hello", ""]
+
+    # Direct list mutation bypasses add_message; the cache must catch up.
+    ctx.messages.append(Message(role="tool", content="ok"))
+    assert ctx.get_transcript_lines() == ["USER: hello", "", "TOOL: ok"]
+
+    ctx.prune_messages(0)
+    assert ctx.get_transcript_lines() == []
+
+
 # ---------------------------------------------------------------------------
 # Summarization tests
 # ---------------------------------------------------------------------------
@@ -265,6 +341,48 @@ def test_summarize_old_messages_creates_summary_and_prunes_history():
     assert engine._summary_in_progress is False
 
 
+def test_summarize_old_messages_reuses_persisted_summary_for_same_transcript(tmp_path):
+    cache_file = tmp_path / "summary_cache.json"
+
+    def summarize_once(summary_text: str) -> FakeAI:
+        engine = make_engine()
+        engine._summary_cache_path = cache_file
+        engine.ai = FakeAI(summary_text=summary_text)
+        for i in range(15):
+            engine.context.messages.append(Message(role="user", content=f"u{i}"))
+        run_async(engine.summarize_old_messages())
+        assert engine.context.summary_history == "FIRST"
+        return engine.ai
+
+    assert len(summarize_once("FIRST").ask_full_calls) == 1
+    assert cache_file.exists()
+
+    # A new engine with the same transcript hits the on-disk cache.
+    assert summarize_once("SECOND").ask_full_calls == []
+
+
+def test_summary_cache_writes_are_serialized_and_latest_snapshot_wins(tmp_path):
+    cache_file = tmp_path / "cache" / "summary_cache.json"
+    engine = make_engine()
+    engine._summary_cache_path = cache_file
+    engine._summary_cache_loaded = True
+
+    # While a writer is active, saves only replace the single pending snapshot.
+    engine._summary_cache_writing = True
+    engine._summary_cache_put("k1", "one")
+    engine._summary_cache_put("k2", "two")
+    assert not cache_file.exists()
+    assert engine._summary_cache_pending == {"k1": "one", "k2": "two"}
+
+    engine._drain_summary_cache_writes(cache_file)
+    assert json.loads(cache_file.read_text(encoding="utf-8")) == {"k1": "one", "k2": "two"}
+    assert engine._summary_cache_writing is False
+
+    engine._summary_cache_put("k3", "three")
+    assert json.loads(cache_file.read_text(encoding="utf-8"))["k3"] == "three"
+    assert [p.name for p in cache_file.parent.iterdir()] == ["summary_cache.json"]
+
+
 def test_summarize_old_messages_noop_when_ai_missing():
     engine = make_engine()
     engine.ai = None
@@ -352,6 +470,46 @@ def test_auto_prune_if_needed_triggers_summarization_when_usage_above_75(monkeyp
     assert called["summary"] is True
 
 
+def test_auto_prune_prefetches_summary_and_applies_it_at_threshold(monkeypatch):
+    engine = make_engine()
+    engine.ai = FakeAI(summary_text="PREFETCHED")
+    ctx = engine.context
+
+    for i in range(10):
+        ctx.messages.append(Message(role="user", content=f"u{i}"))
+        ctx.messages.append(Message(role="assistant", content=f"a{i}"))
+
+    usage = {"ratio": 0.7}
+    monkeypatch.setattr(
+        engine,
+        "_estimate_token_usage",
+        lambda: int(engine._get_model_max_context_tokens() * usage["ratio"]),
+    )
+
+    async def fail_summarize():
+        raise AssertionError("prefetched summary should have been used")
+
+    monkeypatch.setattr(engine, "summarize_old_messages", fail_summarize)
+
+    async def scenario():
+        await engine._auto_prune_if_needed()
+        assert engine._summary_prefetch_task is not None
+        assert ctx.summary_history is None  # prefetch never applies early
+
+        ctx.add_message("user", "late question")
+        usage["ratio"] = 0.8
+        await engine._auto_prune_if_needed()
+
+    run_async(scenario())
+
+    assert ctx.summary_history == "PREFETCHED"
+    assert len(engine.ai.ask_full_calls) == 1
+    # Messages before the last 6 user turns (at prefetch time) were dropped;
+    # everything after them, including the late turn, is kept.
+    assert ctx.messages[0].content == "u4"
+    assert ctx.messages[-1].content == "late question"
+
+
 def test_auto_prune_if_needed_does_not_prune_below_85_percent(monkeypatch):
     engine = make_engine()
     ctx = engine.context
@@ -628,6 +786,56 @@ def test_stream_with_offline_provider_and_openai_client_skips_local_instruction(
     assert "".join(chunks) == reply
 
 
+def test_stream_coalesces_small_pieces_until_boundary(monkeypatch):
+    engine = make_engine()
+    pieces = ["Hel", "lo", " world.", "✓ ", "Done", "\n", "tail"]
+
+    async def fake_turn(user_input: str, include_context: bool = True):
+        for p in pieces:
+            yield p
+
+    monkeypatch.setattr(engine, "_stream_turn", fake_turn)
+
+    chunks: List[str] = []
+
+    async def run():
+        async for ch in engine.stream("hi"):
+            chunks.append(ch)
+
+    run_async(run())
+
+    assert chunks == ["Hello world.", "✓ Done\n", "tail"]
+
+
+def test_coalesced_stream_still_triggers_typewriter_redraws(monkeypatch):
+    engine = make_engine()
+    pieces = ["Line one.", " Two", " three!!", "\n", "Four fives", " and more", ".", " end"]
+
+    async def fake_turn(user_input: str, include_context: bool = True):
+        for p in pieces:
+            yield p
+
+    monkeypatch.setattr(engine, "_stream_turn", fake_turn)
+
+    redraws: List[int] = []
+
+    async def run():
+        char_count = 0
+        async for ch in engine.stream("hi"):
+            prev_count = char_count
+            char_count += len(ch)
+            if cli_mod._typewriter_redraw_due(prev_count, char_count):
+                redraws.append(char_count)
+        return char_count
+
+    total = run_async(run())
+
+    # Running totals are 9, 21, 22, 42, 46: never a multiple of 10, yet the
+    # display still refreshes twice before the stream ends.
+    assert total == 46
+    assert redraws == [21, 42]
+
+
 # ---------------------------------------------------------------------------
 # Model switching / reversion tests
 # ---------------------------------------------------------------------------
@@ -882,6 +1090,32 @@ def test_run_action_resolves_demo_project_src_single_step(monkeypatch):
     assert target_path == (exec_.base_dir / "demo-project/src").resolve()
 
 
+def test_run_action_batch_returns_per_action_results_and_groups_notifications(monkeypatch):
+    """
+    run_action_batch must keep one result per action while refreshing the
+    watcher only once per run of adjacent actions on the same path.
+    """
+    exec_ = AIActionExecutor(base_dir=".", dry_run=True, github_config=None)
+
+    def fake_handle(action: Dict[str, Any], context: ActionContext) -> ActionResult:  # type: ignore[override]
+        return ActionResult(status=ActionStatus.SUCCESS, message=action["type"])
+
+    monkeypatch.setattr(exec_.supervisor, "handle_ai_action", fake_handle)
+
+    triggers: List[str] = []
+    exec_.fs_watcher = type("W", (), {"manual_trigger": lambda self, t: triggers.append(t)})()
+
+    actions = [
+        {"type": "InsertAfterLine", "params": {"path": "a.py", "line_number": 3, "text": "x"}},
+        {"type": "InsertAfterLine", "params": {"path": "a.py", "line_number": 10, "text": "y"}},
+        {"type": "AppendText", "params": {"path": "b.py", "text": "z"}},
+    ]
+    results = exec_.run_action_batch(actions)
+
+    assert [r.message for r in results] == ["InsertAfterLine", "InsertAfterLine", "AppendText"]
+    assert triggers == ["ai_batch_modify", "ai_batch_modify"]
+
+
 def test_create_folder_rejects_sandbox_unsafe_path(monkeypatch):
     """
     Sandbox must reject CreateFolder paths that escape the project root
@@ -1080,13 +1314,14 @@ def test_messages_to_prompt_and_complete_via_provider_dispatch(monkeypatch):
     engine.provider = "claude"
     called = {"claude": False}
 
-    async def fake_claude(prompt: str, temperature: float, max_tokens: int) -> str:  # type: ignore[override]
-        called["claude"] = True
+    async def fake_claude(msgs: List[Dict[str, Any]], temperature: float, max_tokens: int) -> str:  # type: ignore[override]
+        called["claude"] = msgs
         return "CLAUDE-OUT"
 
     monkeypatch.setattr(engine, "_complete_claude", fake_claude)
     out = run_async(engine._complete_via_provider(messages, 0.1, 100))
-    assert called["claude"] is True
+    # Claude gets the structured messages rather than a flattened prompt.
+    assert called["claude"] is messages
     assert out == "CLAUDE-OUT"
 
     # Ollama dispatch
@@ -1288,3 +1523,288 @@ def test_line_actions_accept_common_alias_fields(monkeypatch, tmp_path):
     assert len(content_final) <= len(content_after)
     # We don't assert the exact layout, only that the operation succeeded
     # and aliases did not cause a crash or mis-routing.
+
+
+def test_live_edit_batch_applies_all_intents_with_single_notification():
+    from gitvisioncli.core.natural_language_mapper import LiveEditIntent
+    from gitvisioncli.workspace.editor_panel import EditorPanel
+
+    changes: List[int] = []
+    panel = EditorPanel(on_change_callback=lambda: changes.append(1))
+    panel.content = ["a", "b", "c", "d"]
+
+    results = panel.apply_batch(
+        [
+            LiveEditIntent(type="delete_range", start_line=2, end_line=2),
+            LiveEditIntent(type="insert_after", start_line=1, new_text="x\ny"),
+            LiveEditIntent(type="append", new_text="z"),
+        ]
+    )
+
+    assert panel.content == ["a", "x", "y", "c", "d", "z"]
+    assert results == [
+        "✓ Deleted lines 2-2",
+        "✓ Inserted 2 lines after line 1",
+        "✓ Appended 1 lines to end of file",
+    ]
+    assert len(changes) == 1
+    assert panel.is_modified is True
+
+
+def test_tool_calls_run_concurrently_only_when_paths_are_independent():
+    engine = make_engine()
+    engine.parallel_tool_calls = True
+
+    def call(idx: int, atype: str, path: str) -> Dict[str, Any]:
+        args = {"action": {"type": atype, "params": {"path": path}}}
+        return {
+            "id": f"call_{idx}",
+            "type": "function",
+            "function": {"name": "execute_action", "arguments": json.dumps(args)},
+        }
+
+    independent = [call(0, "CreateFile", "a.py"), call(1, "EditFile", "b/c.py")]
+    nested = [call(0, "CreateFolder", "demo"), call(1, "CreateFile", "demo/a.py")]
+    ordered = [call(0, "CreateFile", "a.py"), call(1, "GitAdd", "a.py")]
+    aliased = [
+        call(0, "CreateFile", "a.py"),
+        call(1, "EditFile", "./b/../a.py"),
+        call(2, "EditFile", str(engine.get_base_dir() / "a.py")),
+    ]
+
+    assert engine._tool_calls_independent(independent) is True
+    assert engine._tool_calls_independent(nested) is False
+    assert engine._tool_calls_independent(ordered) is False
+    assert engine._tool_calls_independent(aliased[:2]) is False
+    assert engine._tool_calls_independent([aliased[0], aliased[2]]) is False
+
+    import threading
+
+    loop_thread: List[Any] = []
+    tracked: List[Any] = []
+    engine._track_last_modified = lambda action, result: tracked.append(
+        (action["params"]["path"], threading.current_thread())
+    )
+
+    async def collect(calls):
+        loop_thread.append(threading.current_thread())
+        return [(tc["id"], out["message"]) async for tc, out in engine._iter_tool_results(calls)]
+
+    assert run_async(collect(independent)) == [("call_0", "CreateFile"), ("call_1", "EditFile")]
+    # Side effects of the concurrent run are applied on the loop thread, in call order.
+    assert engine.executor.notified == ["CreateFile", "EditFile"]
+    assert tracked == [("a.py", loop_thread[0]), ("b/c.py", loop_thread[0])]
+
+    engine._exec_tool_sync = lambda tc: {"status": "success", "message": tc["id"]}
+    assert run_async(collect(nested)) == [("call_0", "call_0"), ("call_1", "call_1")]
+
+
+def test_provider_client_is_reused_until_api_key_changes():
+    engine = make_engine()
+    built: List[str] = []
+
+    def factory() -> object:
+        built.append(engine._claude_api_key)
+        return object()
+
+    engine._claude_api_key = "key-1"
+    first = engine._provider_client(("claude", "async"), engine._claude_api_key, factory)
+    again = engine._provider_client(("claude", "async"), engine._claude_api_key, factory)
+    engine._claude_api_key = "key-2"
+    rotated = engine._provider_client(("claude", "async"), engine._claude_api_key, factory)
+
+    assert first is again
+    assert rotated is not first
+    assert built == ["key-1", "key-2"]
+
+
+def test_context_manager_clone_metadata_copies_only_engine_independent_state():
+    src = ContextManager()
+    src.system_prompt = "SYS"
+    src.workspace_summary = "WS"
+    src.summary_history = "SUM"
+    src.set_active_file("a.py", "x = 1")
+    src.add_message("user", "hi")
+
+    full = ContextManager.clone_metadata(src)
+    assert (full.system_prompt, full.workspace_summary, full.summary_history) == ("SYS", "WS", "SUM")
+    assert full.active_file_path is None
+    assert full.messages == []
+
+    partial = ContextManager.clone_metadata(src, ("system_prompt",))
+    assert partial.system_prompt == "SYS"
+    assert partial.workspace_summary is None
+    assert partial.summary_history is None
+
+
+def test_base_dir_string_cache_follows_executor_directory_changes(tmp_path):
+    engine = make_engine()
+    exec_ = AIActionExecutor(base_dir=str(tmp_path), dry_run=True, github_config=None)
+    engine.executor = exec_
+    (tmp_path / "sub").mkdir()
+
+    assert engine.get_stats()["base_dir"] == str(tmp_path.resolve())
+    version = exec_.base_dir_version
+
+    exec_._on_terminal_directory_change(tmp_path / "sub")
+
+    assert exec_.base_dir_version == version + 1
+    assert engine.get_stats()["base_dir"] == str((tmp_path / "sub").resolve())
+
+
+def test_auto_prune_eviction_keeps_dropped_messages_fetchable():
+    engine = make_engine()
+    engine.evict_pruned_messages = True
+    ctx = engine.context
+    for i in range(4):
+        ctx.add_message("user", f"u{i}")
+        ctx.add_message("assistant", f"a{i}")
+
+    assert engine._tool_schemas() == [engine.EXECUTE_ACTION_TOOL]
+    assert engine._prune_context(2) == 4
+
+    note = ctx.messages[0]
+    assert note.role == "system" and note.name == "evicted_pages"
+    assert [m.content for m in ctx.messages[1:]] == ["u2", "a2", "u3", "a3"]
+    assert engine.FETCH_EVICTED_PAGE_TOOL in engine._tool_schemas()
+
+    page_id = next(iter(engine._evicted_pages))
+    assert page_id in note.content
+    tc = {
+        "id": "call_0",
+        "type": "function",
+        "function": {"name": "fetch_evicted_page", "arguments": json.dumps({"page_id": page_id})},
+    }
+    assert engine._exec_tool_sync(tc)["message"] == "USER: u0"
+
+    # A second prune folds the old note into a fresh one instead of paging it.
+    engine._prune_context(1)
+    assert len(engine._evicted_pages) == 6
+    assert [m.name for m in ctx.messages].count("evicted_pages") == 1
+
+
+def test_auto_prune_without_openai_tools_does_not_page_messages():
+    engine = make_engine()
+    engine.evict_pruned_messages = True
+    # Providers without an OpenAI client are never offered fetch_evicted_page.
+    engine.ai = None
+    ctx = engine.context
+    for i in range(4):
+        ctx.add_message("user", f"u{i}")
+        ctx.add_message("assistant", f"a{i}")
+
+    assert engine._prune_context(2) == 4
+    assert [m.content for m in ctx.messages] == ["u2", "a2", "u3", "a3"]
+    assert not engine._evicted_pages
+    assert engine._tool_schemas() == [engine.EXECUTE_ACTION_TOOL]
+
+
+def test_claude_request_splits_system_and_marks_cache_breakpoints():
+    request = ChatEngine._claude_request(
+        [
+            {"role": "system", "content": "SYS"},
+            {"role": "user", "content": "U1"},
+            {"role": "assistant", "content": "A1"},
+            {"role": "tool", "content": "done"},
+            {"role": "user", "content": "U2"},
+        ]
+    )
+
+    assert request["system"] == [
+        {"type": "text", "text": "SYS", "cache_control": {"type": "ephemeral"}}
+    ]
+    turns = request["messages"]
+    assert [t["role"] for t in turns] == ["user", "assistant", "user"]
+    # Tool output and the next user message merge into one user turn.
+    assert turns[2]["content"][0]["text"] == "TOOL: done\nU2"
+    # Only the last stable turn carries a breakpoint.
+    assert turns[1]["content"][0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in turns[0]["content"][0]
+    assert "cache_control" not in turns[2]["content"][0]
+
+
+def test_get_openai_messages_cache_tracks_context_changes():
+    ctx = ContextManager()
+    ctx.system_prompt = "SYS"
+    ctx.add_message("user", "hi")
+
+    first = ctx.get_openai_messages()
+    first.append({"role": "user", "content": "caller-owned"})
+    assert ctx.get_openai_messages() == [
+        {"role": "system", "content": "SYS"},
+        {"role": "user", "content": "hi"},
+    ]
+
+    ctx.messages.append(Message(role="assistant", content="direct"))
+    assert ctx.get_openai_messages()[-1] == {"role": "assistant", "content": "direct"}
+
+    ctx.set_active_file("a.py", "x = 1")
+    assert "# ACTIVE FILE" in ctx.get_openai_messages()[0]["content"]
+
+
+def test_system_content_cache_is_dropped_when_a_source_field_changes():
+    ctx = ContextManager()
+    ctx.system_prompt = "S" * 35
+    assert ctx.estimate_token_usage() == 10
+
+    ctx.update_workspace_context("W" * 70)
+    assert ctx.estimate_token_usage() == int(
+        len(ctx.get_openai_messages()[0]["content"]) / 3.5
+    )
+    assert "W" * 70 in ctx.get_openai_messages()[0]["content"]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need 3.10+")
+def test_message_uses_slots():
+    msg = Message(role="user", content="hi")
+    assert not hasattr(msg, "__dict__")
+    assert getattr(msg, "name", "missing") is None
+
+
+def test_complete_ollama_reports_unreachable_daemon():
+    engine = make_engine()
+    engine._ollama_config = {"base_url": "http://127.0.0.1:9"}
+
+    async def _go():
+        try:
+            return await engine._complete_ollama("hi", 0.0, 8)
+        finally:
+            await engine.aclose()
+
+    text = run_async(_go())
+    assert text == (
+        "Ollama Error: Cannot connect to Ollama at http://127.0.0.1:9. "
+        "Is the Ollama daemon running?"
+    )
+
+
+def test_http_session_from_a_finished_loop_is_closed_when_replaced():
+    engine = make_engine()
+    first = run_async(engine._get_http_session())
+    connector = first.connector
+
+    async def _second():
+        try:
+            return await engine._get_http_session()
+        finally:
+            await engine.aclose()
+
+    second = run_async(_second())
+    assert second is not first
+    assert first.closed
+    assert connector.closed
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("see notes.txt and edit app.py", "app.py"),
+        ("copy utils.py then open main.py", "main.py"),
+        ("use config.json file path src/x.py", "src/x.py"),
+        ("edit config.json", "config.json"),
+        ("look at README.MD", None),
+        ("look at notes.txt", "notes.txt"),
+    ],
+)
+def test_extract_simple_file_path_prefers_the_file_after_the_verb(text, expected):
+    assert make_engine()._extract_simple_file_path(text) == expected
@@ -0,0 +1,69 @@
+import pytest
+
+from gitvisioncli.core.command_normalizer import CommandNormalizer
+
+
+def test_echo_redirects_map_to_rewrite_and_append_intents(tmp_path):
+    norm = CommandNormalizer(project_root=tmp_path)
+
+    assert norm.normalize('echo "hi" > notes.txt') == {
+        "type": "intent_rewrite_file",
+        "path": "notes.txt",
+        "content": "hi",
+    }
+    assert norm.normalize('echo "more" >> notes.txt') == {
+        "type": "intent_append_file",
+        "path": "notes.txt",
+        "content": "more",
+    }
+
+
+def test_echo_outside_project_root_is_not_an_edit_intent(tmp_path):
+    norm = CommandNormalizer(project_root=tmp_path / "root")
+    outside = tmp_path / "elsewhere.txt"
+
+    assert norm._detect_edit_intent(f'echo "x" >> {outside}', tmp_path / "root") is None
+
+
+def test_sandbox_skips_flags_and_urls_but_not_parent_paths(tmp_path):
+    norm = CommandNormalizer(project_root=tmp_path)
+
+    command = "git clone --depth=1 https://example.com/repo.git ./repo"
+    assert norm._normalize_paths(command, tmp_path) == command
+
+    with pytest.raises(ValueError):
+        norm._normalize_paths("ls ../", tmp_path)
+
+
+def test_root_relative_matches_relative_to(tmp_path):
+    norm = CommandNormalizer(project_root=tmp_path)
+    root = norm.project_root
+
+    for target in (root, root / "a.txt", root / "src" / "pkg" / "m.py"):
+        assert norm._root_relative(target) == target.relative_to(root).as_posix()
+
+
+def test_translate_for_platform_tables(tmp_path):
+    norm = CommandNormalizer(project_root=tmp_path)
+
+    assert norm._translate_for_platform("ls src", "cmd", "Windows") == "dir src"
+    assert norm._translate_for_platform("ls src", "powershell", "Windows") == "Get-ChildItem src"
+    assert norm._translate_for_platform("rm -rf build", "cmd", "Windows") == "rmdir /s /q build"
+    assert norm._translate_for_platform("DIR src", "bash", "Linux") == "ls src"
+    assert norm._translate_for_platform("git status", "bash", "Linux") == "git status"
+
+
+def test_sandbox_checks_path_values_inside_flags(tmp_path):
+    norm = CommandNormalizer(project_root=tmp_path)
+
+    for command in (
+        "cp a --target-directory=../..",
+        "cp a --target-directory=../../..",
+        "ls -C../../../etc",
+    ):
+        with pytest.raises(ValueError):
+            norm._normalize_paths(command, tmp_path)
+
+    assert norm._normalize_paths("cp a --target-directory=build/out", tmp_path) == (
+        "cp a --target-directory=build/out"
+    )
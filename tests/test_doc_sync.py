@@ -0,0 +1,262 @@
+from pathlib import Path
+
+from gitvisioncli.core.doc_sync import DocumentationSyncer
+
+
+def test_should_sync_source_and_config_but_not_docs(tmp_path):
+    syncer = DocumentationSyncer(tmp_path)
+    assert not hasattr(syncer, "__dict__")
+
+    assert syncer.should_sync(Path("pkg/module.py"))
+    assert syncer.should_sync(Path("pyproject.toml"))
+    assert not syncer.should_sync(Path("docs/FEATURES.md"))
+    assert not syncer.should_sync(Path("notes.txt"))
+
+
+def test_sync_replaces_previous_marker(tmp_path):
+    readme = tmp_path / "README.md"
+    readme.write_text(
+        "# Title\n<!-- Auto-synced on 2020-01-01T00:00:00Z -->\n\nBody\n"
+        "<!-- Auto-synced on 2021-01-01T00:00:00Z -->\n",
+        encoding="utf-8",
+    )
+    syncer = DocumentationSyncer(tmp_path)
+
+    assert syncer.sync_documentation([Path("app.py")])
+
+    lines = readme.read_text(encoding="utf-8").split("\n")
+    assert lines[:3] == ["# Title", "", "Body"]
+    assert lines[3].startswith("<!-- Auto-synced on ")
+    assert lines[3].endswith(" -->")
+    assert "2020" not in lines[3] and "2021" not in lines[3]
+    assert lines[4:] == [""]
+
+
+
+def test_sync_skips_write_when_marker_is_current(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "gitvisioncli.core.doc_sync._utc_timestamp", lambda: "2024-01-02T03:04:05Z"
+    )
+    readme = tmp_path / "README.md"
+    readme.write_text("# Title\n", encoding="utf-8")
+    syncer = DocumentationSyncer(tmp_path)
+    syncer.sync_documentation([Path("app.py")])
+
+    writes = []
+    monkeypatch.setattr(Path, "write_text", lambda self, *a, **k: writes.append(self))
+    assert syncer.sync_documentation([Path("app.py")])
+    assert writes == []
+
+
+def test_doc_paths_are_cached_until_a_docs_directory_changes(tmp_path, monkeypatch):
+    syncer = DocumentationSyncer(tmp_path)
+    syncer.sync_documentation([Path("app.py")])
+    assert syncer._get_doc_paths() == []
+
+    # A doc created without going through the syncer is still picked up.
+    features = tmp_path / "docs" / "FEATURES.md"
+    features.parent.mkdir()
+    features.write_text("# Features\n", encoding="utf-8")
+    syncer.sync_documentation([Path("app.py")])
+    assert syncer._get_doc_paths() == [features.resolve()]
+    assert "Auto-synced" in features.read_text(encoding="utf-8")
+
+    # Unchanged directories: the cached list is reused without probing.
+    probes = []
+    real_is_file = Path.is_file
+    monkeypatch.setattr(Path, "is_file", lambda self: probes.append(self) or real_is_file(self))
+    assert syncer._get_doc_paths() == [features.resolve()]
+    assert probes == []
+
+
+def test_read_doc_reuses_content_until_file_changes(tmp_path, monkeypatch):
+    features = tmp_path / "FEATURES.md"
+    features.write_text("one\n", encoding="utf-8")
+    syncer = DocumentationSyncer(tmp_path)
+    assert syncer._read_doc(features) == "one\n"
+
+    reads = []
+    real_read_text = Path.read_text
+    monkeypatch.setattr(
+        Path, "read_text", lambda self, *a, **k: reads.append(self) or real_read_text(self, *a, **k)
+    )
+    assert syncer._read_doc(features) == "one\n"
+    assert reads == []
+
+    features.write_text("two, longer\n", encoding="utf-8")
+    assert syncer._read_doc(features) == "two, longer\n"
+    assert reads == [features]
+
+
+def test_schedule_sync_coalesces_a_burst_into_one_sync(tmp_path, monkeypatch):
+    syncer = DocumentationSyncer(tmp_path)
+    monkeypatch.setattr(DocumentationSyncer, "SYNC_DEBOUNCE_SECONDS", 0.05)
+    calls = []
+    monkeypatch.setattr(
+        DocumentationSyncer,
+        "sync_documentation",
+        lambda self, files, action_type=None: calls.append((files, action_type)),
+    )
+
+    syncer.schedule_sync([Path("a.py")], action_type="CreateFile")
+    syncer.schedule_sync([Path("b.py"), Path("a.py")], action_type="EditFile")
+    timer = syncer._timer
+    timer.join()
+
+    assert calls == [([Path("a.py"), Path("b.py")], "EditFile")]
+
+
+def test_close_runs_the_pending_sync_and_leaves_no_pool(tmp_path, monkeypatch):
+    (tmp_path / "README.md").write_text("# Readme\n", encoding="utf-8")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "QUICKSTART.md").write_text("# Quickstart\n", encoding="utf-8")
+    monkeypatch.setattr(DocumentationSyncer, "SYNC_DEBOUNCE_SECONDS", 60)
+    syncer = DocumentationSyncer(tmp_path)
+
+    syncer.schedule_sync([Path("app.py")], action_type="EditFile")
+    timer = syncer._timer
+    syncer.close()
+
+    assert timer.finished.is_set()
+    assert syncer._timer is None and syncer._pool is None
+    assert "Auto-synced" in (tmp_path / "README.md").read_text(encoding="utf-8")
+
+
+def test_update_commands_doc_splices_into_matching_section(tmp_path):
+    commands = tmp_path / "docs" / "COMMANDS.md"
+    commands.parent.mkdir()
+    commands.write_text(
+        "# Commands\n\n## 📁 **File Operations**\n\nold\n\n---\n\n## 🐚 **Shell Commands**\n\nls\n",
+        encoding="utf-8",
+    )
+    syncer = DocumentationSyncer(tmp_path)
+
+    assert syncer.update_commands_doc(
+        {"name": "touch", "description": "Create a file", "example": "touch a.txt", "category": "file"}
+    )
+    assert syncer.update_commands_doc({"name": "pwd", "category": "Shell Commands"})
+
+    assert commands.read_text(encoding="utf-8") == (
+        "# Commands\n\n## 📁 **File Operations**\n\nold\n\n"
+        "### **touch**\n\nCreate a file\n\n```bash\ntouch a.txt\n```"
+        "\n\n---\n\n## 🐚 **Shell Commands**\n\nls\n\n### **pwd**\n"
+    )
+    changelog = (tmp_path / "docs" / ".sync_changelog").read_text(encoding="utf-8")
+    assert [line.split("|", 1)[1] for line in changelog.splitlines()] == [
+        "docs/COMMANDS.md|file operations",
+        "docs/COMMANDS.md|shell commands",
+    ]
+
+    index = syncer._doc_index[commands]
+    assert index.sections == syncer._get_index(commands).sections
+    assert index.sections == type(index)(index.content).sections
+
+
+def test_end_of_file_splice_extends_the_last_section():
+    from gitvisioncli.core.doc_sync import _DocIndex
+
+    for content in (
+        "# Doc\n\n## A\n\na\n\n## B\n\nb\n",
+        "# Doc\n\n## A\n\na\n\n## B\n\nb\n\n---\n",
+        "# Doc\n\n## A\n\na\n\n## B\n\nb\n\n## A\n\nagain\n",
+        "# Doc\n\nno sections\n",
+    ):
+        index = _DocIndex(content)
+        index.splice(None, "### **tail**\n")
+        rebuilt = _DocIndex(index.content)
+        assert index.sections == rebuilt.sections
+        assert index.nodes == rebuilt.nodes
+
+
+def test_sync_reads_docs_on_the_pool_and_close_releases_it(tmp_path):
+    (tmp_path / "README.md").write_text("# Readme\n", encoding="utf-8")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "QUICKSTART.md").write_text("# Quickstart\n", encoding="utf-8")
+    syncer = DocumentationSyncer(tmp_path)
+
+    assert syncer.sync_documentation([Path("app.py")])
+    assert syncer._pool is not None
+    for doc in ("README.md", "docs/QUICKSTART.md"):
+        assert "Auto-synced" in (tmp_path / doc).read_text(encoding="utf-8")
+
+    syncer.close()
+    assert syncer._pool is None
+
+
+def test_update_features_doc_without_file_returns_false(tmp_path):
+    syncer = DocumentationSyncer(tmp_path)
+
+    assert syncer.update_features_doc({"name": "x"}) is False
+    assert not (tmp_path / "docs" / "FEATURES.md").exists()
+
+
+def test_doc_basenames_prefilter(tmp_path):
+    syncer = DocumentationSyncer(tmp_path)
+
+    assert syncer._DOC_BASENAMES == {"README.md", "COMMANDS.md", "QUICKSTART.md", "FEATURES.md"}
+    assert syncer._is_doc_file(Path("docs/COMMANDS.md"))
+    assert syncer._is_doc_file("README.md")
+    assert not syncer._is_doc_file(Path("notes/COMMANDS.md"))
+    assert not syncer._is_doc_file(Path("docs/INDEX.md"))
+
+
+def test_sync_compares_against_last_written_content_without_rereading(tmp_path, monkeypatch):
+    readme = tmp_path / "README.md"
+    readme.write_text("# Title\n", encoding="utf-8")
+    syncer = DocumentationSyncer(tmp_path)
+    syncer.sync_documentation([Path("app.py")])
+
+    reads = []
+    real_read_text = Path.read_text
+    monkeypatch.setattr(
+        Path, "read_text", lambda self, *a, **k: reads.append(self) or real_read_text(self, *a, **k)
+    )
+    syncer.sync_documentation([Path("app.py")])
+    assert reads == []
+
+
+def test_should_sync_is_memoized_per_path(tmp_path):
+    from gitvisioncli.core.doc_sync import _should_sync_path
+
+    syncer = DocumentationSyncer(tmp_path)
+    _should_sync_path.cache_clear()
+    assert syncer.should_sync(Path("src/app.py"))
+    assert syncer.should_sync("src/app.py")
+    assert _should_sync_path.cache_info().hits == 1
+
+
+def test_update_commands_doc_handles_crlf_docs_with_full_rewrite(tmp_path):
+    commands = tmp_path / "docs" / "COMMANDS.md"
+    commands.parent.mkdir()
+    commands.write_bytes("## Fichiers é\r\n\r\nold\r\n".encode("utf-8"))
+    syncer = DocumentationSyncer(tmp_path)
+
+    assert syncer.update_commands_doc({"name": "touch", "category": "fichiers"})
+    assert commands.read_text(encoding="utf-8") == "## Fichiers é\n\nold\n\n### **touch**\n"
+
+    commands.write_text("## Fichiers é\n\nold\n", encoding="utf-8")
+    assert syncer.update_commands_doc({"name": "ls", "category": "fichiers"})
+    assert commands.read_text(encoding="utf-8") == "## Fichiers é\n\nold\n\n### **ls**\n"
+
+
+def test_get_sections_keeps_unchanged_section_nodes(tmp_path):
+    features = tmp_path / "docs" / "FEATURES.md"
+    features.parent.mkdir()
+    features.write_text("## AI Editing\n\nai\n\n## File Operations\n\nfiles\n", encoding="utf-8")
+    syncer = DocumentationSyncer(tmp_path)
+    before = dict(syncer.get_sections(features))
+
+    assert syncer.update_features_doc({"name": "Fuzzy edits", "category": "ai editing"})
+    after = syncer.get_sections(features)
+    assert after["file operations"] is before["file operations"]
+    assert after["ai editing"] is not before["ai editing"]
+    assert after["ai editing"].text.endswith("### **Fuzzy edits**")
+
+    # An outside edit to one section re-indexes, but keeps the other node.
+    features.write_text(
+        features.read_text(encoding="utf-8").replace("files", "files and folders"),
+        encoding="utf-8",
+    )
+    reindexed = syncer.get_sections(features)
+    assert reindexed["ai editing"] is after["ai editing"]
+    assert reindexed["file operations"] is not after["file operations"]
@@ -1,3 +1,5 @@
+import pytest
+
 from gitvisioncli.core.editing_engine import EditingEngine, EditingError
 
 
@@ -61,3 +63,92 @@ def test_update_json_key_nested_path():
     r = engine.update_json_key(content, key_path="a.c", value=42)
     assert '"c": 42' in r.content
 
+
+
+def test_replace_by_fuzzy_match_picks_most_similar_line():
+    engine = EditingEngine()
+    content = "def load_config():\n    return read('settings.yml')\nprint('done')"
+
+    r = engine.replace_by_fuzzy_match(
+        content, target="return read('setings.yml')", replacement="    return {}"
+    )
+    assert r.content.split("\n")[1] == "    return {}"
+    assert r.details["line_number"] == 2
+    assert 0.6 <= r.details["similarity"] < 1.0
+
+    try:
+        engine.replace_by_fuzzy_match(content, target="zzzzzzzz", replacement="x")
+    except EditingError as e:
+        assert "No sufficiently similar line" in str(e)
+    else:
+        assert False, "Expected EditingError for a dissimilar target"
+
+
+def _indel_ratio(a, b):
+    """rapidfuzz.fuzz.ratio: 100 * 2 * LCS / (len(a) + len(b))."""
+    prev = [0] * (len(b) + 1)
+    for x in a:
+        cur = [0]
+        for j, y in enumerate(b):
+            cur.append(prev[j] + 1 if x == y else max(prev[j + 1], cur[j]))
+        prev = cur
+    return 100 * 2 * prev[-1] / (len(a) + len(b))
+
+
+class _FakeRapidfuzzProcess:
+    @staticmethod
+    def extract(query, choices, *, scorer, processor, score_cutoff, limit):
+        assert processor is None and limit is None
+        scored = [(c, scorer(query, c), i) for i, c in enumerate(choices)]
+        kept = [m for m in scored if m[1] >= score_cutoff]
+        return sorted(kept, key=lambda m: -m[1])
+
+
+def test_replace_by_fuzzy_match_rapidfuzz_only_prefilters(monkeypatch):
+    import types
+
+    from gitvisioncli.core import editing_engine
+
+    engine = EditingEngine()
+    # Indel ranks line 1 first (0.75 vs 0.625); difflib ranks line 2 first.
+    content = "abdadaac\nababbbab"
+    expected = engine.replace_by_fuzzy_match(content, target="abadabda", replacement="X")
+
+    monkeypatch.setattr(editing_engine, "_rf_fuzz", types.SimpleNamespace(ratio=_indel_ratio))
+    monkeypatch.setattr(editing_engine, "_rf_process", _FakeRapidfuzzProcess)
+    r = engine.replace_by_fuzzy_match(content, target="abadabda", replacement="X")
+
+    assert r.content == expected.content == "abdadaac\nX"
+    assert r.details == expected.details == {"line_number": 2, "similarity": 0.625}
+    with pytest.raises(EditingError, match="No sufficiently similar line"):
+        engine.replace_by_fuzzy_match(content, target="zzzzzzzz", replacement="x")
+
+
+def test_insert_into_function_and_class_reuse_cached_patterns():
+    from gitvisioncli.core.editing_engine import _class_def_res, _function_def_res
+
+    engine = EditingEngine()
+    content = "class Widget:\n    pass\n\ndef render(x):\n    return x"
+
+    r = engine.insert_into_function(content, function_name="render", block="print(x)")
+    assert "print(x)" in r.content
+    r = engine.insert_into_class(r.content, class_name="Widget", block="size = 1")
+    assert "size = 1" in r.content
+
+    engine.insert_into_function(content, function_name="render", block="y = 1")
+    assert _function_def_res.cache_info().hits >= 1
+    assert _class_def_res("Widget") is _class_def_res("Widget")
+
+
+def test_insert_after_import_section_skips_header_and_imports():
+    engine = EditingEngine()
+    content = "#!/usr/bin/env python\n# -*- coding: utf-8 -*-\nimport os\n  from x import y\n\nprint(os)"
+
+    r = engine.insert_after_import_section(content, block="import sys")
+    assert r.content.split("\n")[:5] == [
+        "#!/usr/bin/env python",
+        "# -*- coding: utf-8 -*-",
+        "import os",
+        "  from x import y",
+        "import sys",
+    ]
@@ -70,3 +70,12 @@ def test_ambiguous_instruction_requests_clarification():
     assert not res.error
     assert res.clarification is not None
     assert res.intents == []
+
+
+def test_map_to_live_edits_accepts_line_buffer():
+    mapper = NaturalLanguageEditMapper()
+    buffer = ["import os", "def foo():", "    return 1", "def bar():", "    pass"]
+    intents = mapper.map_to_live_edits("delete the function foo", buffer)
+    assert len(intents) == 1
+    assert intents[0].type == "delete_range"
+    assert (intents[0].start_line, intents[0].end_line) == (2, 3)
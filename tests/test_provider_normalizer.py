@@ -8,6 +8,12 @@ def test_normalize_fences_collapses_json_variants():
     assert "```json" in out
 
 
+def test_normalize_fences_returns_unfenced_text_unchanged():
+    norm = ProviderNormalizer()
+    text = "plain reply mentioning JSON and jsonc"
+    assert norm.normalize_fences(text) is text
+
+
 def test_extract_json_blocks_ignores_invalid():
     norm = ProviderNormalizer()
     text = """```json